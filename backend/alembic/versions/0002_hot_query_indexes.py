@@ -0,0 +1,28 @@
+"""add indexes for todo and refresh token hot queries
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (user_id, created_at, id) also serves plain user_id lookups and the keyset
+    # pagination order, so a separate single-column user_id index is not needed.
+    op.create_index("ix_todos_user_id_created_at", "todos", ["user_id", "created_at", "id"])
+    op.create_index("ix_todos_user_id_status", "todos", ["user_id", "status"])
+    op.create_index("ix_refresh_tokens_expires_at", "refresh_tokens", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_refresh_tokens_expires_at", table_name="refresh_tokens")
+    op.drop_index("ix_todos_user_id_status", table_name="todos")
+    op.drop_index("ix_todos_user_id_created_at", table_name="todos")
@@ -0,0 +1,42 @@
+"""add pomodoro session log and daily rollups
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "pomodoro_sessions",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("todo_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("todos.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=False),
+        sa.Column("ended_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_pomodoro_sessions_user_id_started_at", "pomodoro_sessions", ["user_id", "started_at"])
+    op.create_table(
+        "pomodoro_daily_rollups",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("status", postgresql.ENUM(name="status", create_type=False), primary_key=True),
+        sa.Column("session_count", sa.Integer(), nullable=False),
+        sa.Column("focus_seconds", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("pomodoro_daily_rollups")
+    op.drop_index("ix_pomodoro_sessions_user_id_started_at", table_name="pomodoro_sessions")
+    op.drop_table("pomodoro_sessions")
@@ -0,0 +1,38 @@
+"""add todos.updated_at and todo tombstones for delta sync
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Backfill existing rows from created_at, then let the application maintain it
+    op.add_column("todos", sa.Column("updated_at", sa.DateTime(), nullable=True))
+    op.execute("UPDATE todos SET updated_at = coalesce(completed_at, created_at)")
+    op.alter_column("todos", "updated_at", nullable=False)
+    op.create_index("ix_todos_user_id_updated_at", "todos", ["user_id", "updated_at"])
+    op.create_table(
+        "todo_tombstones",
+        sa.Column("todo_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_todo_tombstones_user_id_deleted_at", "todo_tombstones", ["user_id", "deleted_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_todo_tombstones_user_id_deleted_at", table_name="todo_tombstones")
+    op.drop_table("todo_tombstones")
+    op.drop_index("ix_todos_user_id_updated_at", table_name="todos")
+    op.drop_column("todos", "updated_at")
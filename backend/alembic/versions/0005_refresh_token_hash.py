@@ -0,0 +1,32 @@
+"""store refresh tokens as SHA-256 hashes
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Hash existing tokens in place so current sessions survive the migration
+    op.add_column("refresh_tokens", sa.Column("token_hash", sa.LargeBinary(), nullable=True))
+    op.execute("UPDATE refresh_tokens SET token_hash = sha256(convert_to(token, 'UTF8'))")
+    op.alter_column("refresh_tokens", "token_hash", nullable=False)
+    op.create_unique_constraint("refresh_tokens_token_hash_key", "refresh_tokens", ["token_hash"])
+    op.drop_column("refresh_tokens", "token")
+
+
+def downgrade() -> None:
+    # Hashes can't be reversed; every user has to log in again
+    op.execute("DELETE FROM refresh_tokens")
+    op.drop_constraint("refresh_tokens_token_hash_key", "refresh_tokens", type_="unique")
+    op.drop_column("refresh_tokens", "token_hash")
+    op.add_column("refresh_tokens", sa.Column("token", sa.String(), nullable=False, unique=True))
@@ -0,0 +1,37 @@
+"""add todos.rank for board ordering
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("todos", sa.Column("rank", sa.Numeric(), server_default="0", nullable=False))
+    # Number each column in its current display order, newest first
+    op.execute("""
+        UPDATE todos SET rank = ranked.position
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY user_id, status ORDER BY created_at DESC, id DESC) AS position
+            FROM todos
+        ) AS ranked
+        WHERE todos.id = ranked.id
+    """)
+    # The new index covers (user_id, status) lookups as its prefix
+    op.create_index("ix_todos_user_id_status_rank", "todos", ["user_id", "status", "rank"])
+    op.drop_index("ix_todos_user_id_status", table_name="todos")
+
+
+def downgrade() -> None:
+    op.create_index("ix_todos_user_id_status", "todos", ["user_id", "status"])
+    op.drop_index("ix_todos_user_id_status_rank", table_name="todos")
+    op.drop_column("todos", "rank")
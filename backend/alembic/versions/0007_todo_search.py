@@ -0,0 +1,31 @@
+"""add a full-text search vector on todos.description
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Stored generated column: computed once per write instead of on every search
+    op.add_column("todos", sa.Column(
+        "search_vector",
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('english', description)", persisted=True),
+    ))
+    op.create_index("ix_todos_search_vector", "todos", ["search_vector"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_todos_search_vector", table_name="todos")
+    op.drop_column("todos", "search_vector")
@@ -0,0 +1,48 @@
+"""add the partitioned todo_archive table for old completed todos
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Monthly partitions are created by the archiver before it moves rows into them
+    op.create_table(
+        "todo_archive",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("completed_at", sa.DateTime(), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("description", sa.String(), nullable=False),
+        sa.Column("due_date", sa.DateTime(), nullable=True),
+        sa.Column("is_completed", sa.Boolean(), nullable=False),
+        sa.Column("is_important", sa.Boolean(), nullable=False),
+        sa.Column("is_urgent", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("status", postgresql.ENUM(name="status", create_type=False), nullable=False),
+        sa.Column("pomodoro_count", sa.Integer(), nullable=False),
+        sa.Column("rank", sa.Numeric(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id", "completed_at"),
+        postgresql_partition_by="RANGE (completed_at)",
+    )
+    op.create_index("ix_todo_archive_user_id_completed_at", "todo_archive", ["user_id", "completed_at", "id"])
+    op.create_index("ix_todos_completed_at", "todos", ["completed_at"], postgresql_where=sa.text("is_completed"))
+
+
+def downgrade() -> None:
+    op.drop_index("ix_todos_completed_at", table_name="todos")
+    # Dropping the parent drops every partition with it
+    op.drop_index("ix_todo_archive_user_id_completed_at", table_name="todo_archive")
+    op.drop_table("todo_archive")
@@ -0,0 +1,22 @@
+"""index todo_tombstones.deleted_at for the retention sweeper
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_todo_tombstones_deleted_at", "todo_tombstones", ["deleted_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_todo_tombstones_deleted_at", table_name="todo_tombstones")
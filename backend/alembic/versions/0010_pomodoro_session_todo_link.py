@@ -0,0 +1,31 @@
+"""let pomodoro sessions keep pointing at todos once they are archived
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ON DELETE SET NULL cleared the link of every archived todo's sessions; the
+    # application now clears it only when a todo is deleted
+    op.drop_constraint("pomodoro_sessions_todo_id_fkey", "pomodoro_sessions", type_="foreignkey")
+    op.create_index("ix_pomodoro_sessions_todo_id", "pomodoro_sessions", ["todo_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_pomodoro_sessions_todo_id", table_name="pomodoro_sessions")
+    # Sessions of archived todos can't satisfy the foreign key again
+    op.execute("UPDATE pomodoro_sessions SET todo_id = NULL WHERE todo_id NOT IN (SELECT id FROM todos)")
+    op.create_foreign_key(
+        "pomodoro_sessions_todo_id_fkey", "pomodoro_sessions", "todos", ["todo_id"], ["id"], ondelete="SET NULL"
+    )
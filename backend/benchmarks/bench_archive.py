@@ -0,0 +1,114 @@
+"""
+Size and latency of the active todos table before and after archiving.
+Seeds N users x M todos where most are completed over the past two years
+(a long-lived board), times the hot read paths, runs the archiver, then
+times them again along with the archive endpoint's first page.
+
+Run against a scratch Postgres database, never production:
+
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_archive --users 20 --todos 20000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, text
+
+from benchmarks import _env  # noqa: F401
+from src import cache
+from src.auth.models import TokenData
+from src.database.core import AsyncSessionLocal, Base, engine
+from src.entities.todo import Status, Todo
+from src.entities.user import User
+from src.todos import models, service
+
+SEED_CHUNK = 10000
+
+
+def seed(n_users: int, n_todos: int, completed_share: float) -> uuid.UUID:
+    now = datetime.now(timezone.utc)
+    rng = random.Random(7)
+    user_ids = [uuid.uuid4() for _ in range(n_users)]
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": uid, "email": f"bench-{uid}@example.com", "first_name": "Bench", "last_name": "User", "password_hash": "x"}
+            for uid in user_ids
+        ])
+        for uid in user_ids:
+            for start in range(0, n_todos, SEED_CHUNK):
+                rows = []
+                for i in range(start, min(start + SEED_CHUNK, n_todos)):
+                    created_at = now - timedelta(minutes=rng.randint(0, 2 * 365 * 24 * 60))
+                    completed = rng.random() < completed_share
+                    rows.append({
+                        "id": uuid.uuid4(), "user_id": uid, "description": f"todo {i}", "is_important": True,
+                        "is_urgent": False, "is_completed": completed, "pomodoro_count": rng.randint(0, 8),
+                        "status": Status.completed if completed else Status.to_do, "rank": i,
+                        "created_at": created_at, "updated_at": created_at,
+                        "completed_at": min(created_at + timedelta(days=rng.randint(0, 30)), now) if completed else None,
+                    })
+                conn.execute(insert(Todo), rows)
+        conn.execute(text("ANALYZE todos"))
+    return user_ids[0]
+
+
+def table_size() -> str:
+    with engine.connect() as conn:
+        rows = conn.scalar(text("SELECT count(*) FROM todos"))
+        size = conn.scalar(text("SELECT pg_size_pretty(pg_total_relation_size('todos'))"))
+    return f"{rows} rows, {size} with indexes"
+
+
+async def timed(label: str, call, repeat: int) -> None:
+    timings = []
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            await call(db)
+            timings.append((time.perf_counter() - start) * 1000)
+    print(f"  {label:<22} p50={statistics.median(timings):8.2f}ms max={max(timings):8.2f}ms")
+
+
+async def measure(current_user: TokenData, repeat: int) -> None:
+    filters = models.TodoFilters()
+    await timed("GET /todos/", lambda db: service.get_todos(current_user, db, filters), repeat)
+    await timed("GET /todos/page", lambda db: service.get_todo_page(current_user, db, filters, 50), repeat)
+    await timed("collection ETag", lambda db: service.get_collection_etag(current_user, db), repeat)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--todos", type=int, default=20000, help="todos per user")
+    parser.add_argument("--completed", type=float, default=0.8, help="share of todos completed")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    current_user = TokenData(user_id=seed(args.users, args.todos, args.completed))
+    # Measure the database, not the read-through cache
+    cache._cache = cache.InMemoryCache(max_entries=0)
+
+    print(f"before: {table_size()}")
+    await measure(current_user, args.repeat)
+
+    start = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        archived = await service.archive_completed_todos(db)
+    print(f"archived {archived} todos in {time.perf_counter() - start:.1f}s "
+          f"({service.ARCHIVE_BATCH_SIZE} per transaction, older than {service.ARCHIVE_AFTER_DAYS} days)")
+    # Compact so the size shows what archiving frees; in production the space is reused instead
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM FULL ANALYZE todos"))
+
+    print(f"after: {table_size()}")
+    await measure(current_user, args.repeat)
+    await timed("GET /todos/archive", lambda db: service.get_archived_todos(current_user, db, 50), args.repeat)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
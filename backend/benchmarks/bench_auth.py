@@ -0,0 +1,57 @@
+"""
+Per-request auth overhead of verify_token (what get_current_user runs) with and without the verified
+token cache, driven by a thread-pool load generator.
+
+    python -m benchmarks.bench_auth --users 200 --requests 200000 --concurrency 16
+"""
+import argparse
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from benchmarks import _env  # noqa: F401
+from src.auth import service
+
+
+def run(tokens: list[str], n_requests: int, concurrency: int) -> list[float]:
+    def request(i: int) -> float:
+        start = time.perf_counter()
+        current_user = service.verify_token(tokens[i % len(tokens)])
+        current_user.get_uuid()
+        current_user.get_uuid()
+        return (time.perf_counter() - start) * 1_000_000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(request, range(n_requests), chunksize=256))
+
+
+def report(label: str, timings: list[float], elapsed: float) -> None:
+    quantiles = statistics.quantiles(timings, n=100)
+    print(f"{label:>10}: {len(timings) / elapsed:>10.0f} req/s  "
+          f"p50={quantiles[49]:.1f}us p99={quantiles[98]:.1f}us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=100000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    tokens = [
+        service.create_access_token(f"user{i}@example.com", uuid.uuid4(), timedelta(minutes=30))
+        for i in range(args.users)
+    ]
+    cache_size = service.TOKEN_CACHE_SIZE
+    for label, size in (("no cache", 0), ("cache", cache_size)):
+        service.TOKEN_CACHE_SIZE = size
+        service._token_cache.clear()
+        start = time.perf_counter()
+        timings = run(tokens, args.requests, args.concurrency)
+        report(label, timings, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
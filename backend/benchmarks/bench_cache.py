@@ -0,0 +1,77 @@
+"""
+/users/me and GET /todos latency with the read-through cache cold (entry
+invalidated before every request) versus warm, served in-process through
+httpx's ASGI transport. --backend redis uses CACHE_URL, --backend fakeredis
+an in-process Redis stand-in (pip install fakeredis).
+
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_cache --requests 2000 --backend memory
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import timedelta
+
+import httpx
+from sqlalchemy import select
+
+from benchmarks import _env  # noqa: F401
+from src import cache
+from src.auth.service import create_access_token
+from src.database.core import AsyncSessionLocal
+from src.entities.user import User
+from src.main import app
+from src.metrics import CACHE_LOOKUPS
+from src.redis_client import redis_client
+
+
+def use_backend(backend: str) -> None:
+    if backend == "redis":
+        cache._cache = cache.RedisCache(redis_client(cache.CACHE_URL or "redis://localhost:6379/0"))
+    elif backend == "fakeredis":
+        import fakeredis
+        cache._cache = cache.RedisCache(fakeredis.FakeAsyncRedis())
+    else:
+        cache._cache = cache.InMemoryCache()
+
+
+async def measure(client: httpx.AsyncClient, path: str, users: list[tuple[str, str]], requests: int, cold: bool) -> list[float]:
+    timings = []
+    for i in range(requests):
+        user_id, token = users[i % len(users)]
+        if cold:
+            await cache.invalidate(f"user:{user_id}", f"todos:{user_id}")
+        start = time.perf_counter()
+        response = await client.get(path, headers={"Authorization": f"Bearer {token}"})
+        timings.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    return timings
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--backend", choices=("memory", "redis", "fakeredis"), default="memory")
+    args = parser.parse_args()
+    use_backend(args.backend)
+
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(select(User.id, User.email).limit(args.users))).all()
+    if not rows:
+        raise SystemExit("No users found, seed the database first (e.g. benchmarks.bench_indexes)")
+    users = [(str(row.id), create_access_token(row.email, row.id, timedelta(hours=1))) for row in rows]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in ("/users/me", "/todos/"):
+            for label, cold in (("cold", True), ("warm", False)):
+                timings = await measure(client, path, users, args.requests, cold)
+                quantiles = statistics.quantiles(timings, n=100)
+                print(f"{path:>10} {label}: p50={quantiles[49]:.2f}ms p99={quantiles[98]:.2f}ms")
+    print("\n".join(line for line in CACHE_LOOKUPS.render() if not line.startswith("#")))
+    await cache.get_cache().close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""
+Sync engine on a 40-thread pool (Starlette's default threadpool size) versus
+the async engine, each serving the same per-user todo query to N concurrent
+clients. Reports throughput and p50/p99 latency including queueing time.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_db_async --clients 500 --requests 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import select
+
+from benchmarks import _env  # noqa: F401
+from src.database.core import AsyncSessionLocal, SessionLocal
+from src.entities.todo import Todo
+from src.entities.user import User
+
+STARLETTE_THREADPOOL_SIZE = 40
+
+
+def todos_query(user_id):
+    return select(Todo).where(Todo.user_id == user_id).order_by(Todo.created_at.desc()).limit(50)
+
+
+def sync_request(user_id) -> None:
+    with SessionLocal() as db:
+        db.scalars(todos_query(user_id)).all()
+
+
+async def async_request(user_id) -> None:
+    async with AsyncSessionLocal() as db:
+        (await db.scalars(todos_query(user_id))).all()
+
+
+async def run_sync(user_ids, clients: int, requests: int) -> list[float]:
+    loop = asyncio.get_running_loop()
+    pool = ThreadPoolExecutor(max_workers=STARLETTE_THREADPOOL_SIZE)
+
+    async def client(i: int) -> list[float]:
+        timings = []
+        for j in range(requests):
+            start = time.perf_counter()
+            await loop.run_in_executor(pool, sync_request, user_ids[(i + j) % len(user_ids)])
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    results = await asyncio.gather(*(client(i) for i in range(clients)))
+    pool.shutdown()
+    return [t for timings in results for t in timings]
+
+
+async def run_async(user_ids, clients: int, requests: int) -> list[float]:
+    async def client(i: int) -> list[float]:
+        timings = []
+        for j in range(requests):
+            start = time.perf_counter()
+            await async_request(user_ids[(i + j) % len(user_ids)])
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    results = await asyncio.gather(*(client(i) for i in range(clients)))
+    return [t for timings in results for t in timings]
+
+
+def report(label: str, timings: list[float], elapsed: float) -> None:
+    quantiles = statistics.quantiles(timings, n=100)
+    print(f"{label:>6}: {len(timings) / elapsed:8.0f} req/s  p50={quantiles[49]:.1f}ms p99={quantiles[98]:.1f}ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    args = parser.parse_args()
+
+    async with AsyncSessionLocal() as db:
+        user_ids = (await db.scalars(select(User.id).limit(100))).all()
+    if not user_ids:
+        raise SystemExit("No users found, seed the database first (e.g. benchmarks.bench_indexes)")
+
+    for label, runner in (("sync", run_sync), ("async", run_async)):
+        start = time.perf_counter()
+        timings = await runner(user_ids, args.clients, args.requests)
+        report(label, timings, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,133 @@
+"""
+Streamed board import and export at 10k and 100k rows. Generates CSV and
+NDJSON uploads on the fly in 64KB chunks, as a request body arrives, and
+feeds them to service.import_todos (COPY on asyncpg), then drains
+service.stream_todos in both formats. Reports rows/sec and the Python heap
+peak under tracemalloc, which should stay flat as the row count grows. For
+scale, also times the per-card path clients use today, one create_todo
+commit per row, on a smaller sample.
+
+Run against a scratch Postgres database, never production:
+
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_import_export --rows 10000 100000
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert
+
+from benchmarks import _env  # noqa: F401
+from src.auth.models import TokenData
+from src.database.core import AsyncSessionLocal, Base, engine
+from src.entities.todo import Status, Todo
+from src.entities.user import User
+from src.todos import models, service
+
+CHUNK_BYTES = 64 * 1024
+STATUSES = [status.value for status in Status]
+
+
+def create_user() -> TokenData:
+    user_id = uuid.uuid4()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": user_id, "email": f"bench-{user_id}@example.com", "first_name": "Bench",
+                                     "last_name": "User", "password_hash": "x"}])
+    return TokenData(user_id=str(user_id))
+
+
+def clear_board(current_user: TokenData) -> None:
+    with engine.begin() as conn:
+        conn.execute(delete(Todo).where(Todo.user_id == current_user.get_uuid()))
+
+
+def record(i: int, due: datetime) -> dict:
+    return {"description": f'card {i}, imported from "elsewhere"', "due_date": (due + timedelta(hours=i)).isoformat(),
+            "status": STATUSES[i % len(STATUSES)], "is_important": i % 2 == 0, "is_urgent": i % 3 == 0}
+
+
+async def upload(fmt: str, rows: int):
+    """Yield a generated file in CHUNK_BYTES pieces without ever building it whole."""
+    due = datetime.now(timezone.utc)
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=list(record(0, due)))
+    if fmt == "csv":
+        writer.writeheader()
+    for i in range(rows):
+        if fmt == "csv":
+            writer.writerow(record(i, due))
+        else:
+            out.write(json.dumps(record(i, due)) + "\n")
+        if out.tell() >= CHUNK_BYTES:
+            yield out.getvalue().encode()
+            out.seek(0)
+            out.truncate()
+    yield out.getvalue().encode()
+
+
+async def run_import(current_user: TokenData, fmt: str, rows: int) -> models.ImportResult:
+    async with AsyncSessionLocal() as db:
+        return await service.import_todos(current_user, db, upload(fmt, rows), fmt)
+
+
+async def run_export(current_user: TokenData, fmt: str) -> int:
+    size = 0
+    async for chunk in service.stream_todos(current_user, models.TodoFilters(), fmt):
+        size += len(chunk)
+    return size
+
+
+async def measure(label: str, rows: int, call) -> object:
+    """Time one run, then trace a second to report the heap peak without the tracing overhead in the timing."""
+    start = time.perf_counter()
+    result = await call()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    await call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<16} {rows:>7} rows  {elapsed:6.2f}s  {rows / elapsed:8.0f} rows/s  heap peak {peak / 2**20:6.1f}MB")
+    return result
+
+
+async def per_row_baseline(current_user: TokenData, rows: int) -> None:
+    due = datetime.now(timezone.utc)
+    start = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        for i in range(rows):
+            await service.create_todo(current_user, models.TodoCreate(**record(i, due)), db)
+    elapsed = time.perf_counter() - start
+    print(f"  {'create_todo x N':<16} {rows:>7} rows  {elapsed:6.2f}s  {rows / elapsed:8.0f} rows/s")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="*", default=[10000, 100000])
+    parser.add_argument("--baseline-rows", type=int, default=2000, help="rows for the one-commit-per-card comparison")
+    args = parser.parse_args()
+    service.IMPORT_MAX_ROWS = max(args.rows)
+
+    Base.metadata.create_all(engine)
+    current_user = create_user()
+    for rows in args.rows:
+        print(f"{rows} rows:")
+        for fmt in ("csv", "ndjson"):
+            async def imported(fmt=fmt):
+                clear_board(current_user)
+                return await run_import(current_user, fmt, rows)
+            result = await measure(f"import {fmt}", rows, imported)
+            assert result.imported == rows and not result.failed_rows, result
+        for fmt in ("csv", "ndjson"):
+            await measure(f"export {fmt}", rows, lambda fmt=fmt: run_export(current_user, fmt))
+    clear_board(current_user)
+    await per_row_baseline(current_user, args.baseline_rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""
+Seed N users x M todos and compare query plans and latencies of the hot
+todo/refresh-token queries without and with the indexes from migration 0002.
+
+Run against a scratch Postgres database, never production:
+
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_indexes --users 50 --todos 20000
+"""
+import argparse
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, text
+
+from benchmarks import _env  # noqa: F401
+from src.database.core import Base, engine
+from src.entities.todo import Status, Todo
+from src.entities.user import RefreshToken, User
+
+INDEXES = [idx for idx in Todo.__table__.indexes] + [idx for idx in RefreshToken.__table__.indexes]
+
+QUERIES = {
+    "list todos": (
+        "SELECT * FROM todos WHERE user_id = :user_id ORDER BY created_at DESC, id DESC"
+    ),
+    "first page": (
+        "SELECT * FROM todos WHERE user_id = :user_id ORDER BY created_at DESC, id DESC LIMIT 50"
+    ),
+    "todos by status": (
+        "SELECT * FROM todos WHERE user_id = :user_id AND status = 'in_progress'"
+    ),
+    "expired refresh tokens": (
+        "SELECT id FROM refresh_tokens WHERE expires_at < now() LIMIT 1000"
+    ),
+}
+
+
+def seed(n_users: int, n_todos: int) -> list[uuid.UUID]:
+    now = datetime.now(timezone.utc)
+    user_ids = [uuid.uuid4() for _ in range(n_users)]
+    statuses = list(Status)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": uid, "email": f"bench-{uid}@example.com", "first_name": "Bench",
+             "last_name": "User", "password_hash": "x"}
+            for uid in user_ids
+        ])
+        conn.execute(insert(RefreshToken), [
+            {"id": uuid.uuid4(), "user_id": uid, "token_hash": uuid.uuid4().bytes,
+             "created_at": now, "expires_at": now + timedelta(days=(i % 60) - 30)}
+            for i, uid in enumerate(user_ids)
+        ])
+        for uid in user_ids:
+            conn.execute(insert(Todo), [
+                {"id": uuid.uuid4(), "user_id": uid, "description": f"todo {i}",
+                 "is_completed": False, "is_important": True, "is_urgent": False,
+                 "created_at": now - timedelta(minutes=i), "status": statuses[i % len(statuses)],
+                 "pomodoro_count": 0}
+                for i in range(n_todos)
+            ])
+        conn.execute(text("ANALYZE todos"))
+        conn.execute(text("ANALYZE refresh_tokens"))
+    return user_ids
+
+
+def measure(label: str, user_id: uuid.UUID, repeat: int) -> None:
+    print(f"\n=== {label} ===")
+    with engine.connect() as conn:
+        for name, sql in QUERIES.items():
+            plan = conn.execute(text(f"EXPLAIN ANALYZE {sql}"), {"user_id": user_id}).scalars().all()
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                conn.execute(text(sql), {"user_id": user_id}).fetchall()
+                timings.append((time.perf_counter() - start) * 1000)
+            print(f"\n-- {name}: p50={statistics.median(timings):.2f}ms max={max(timings):.2f}ms")
+            print("\n".join(plan))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--todos", type=int, default=10000, help="todos per user")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    for index in INDEXES:
+        index.drop(engine, checkfirst=True)
+
+    user_ids = seed(args.users, args.todos)
+    measure("without indexes", user_ids[0], args.repeat)
+
+    for index in INDEXES:
+        index.create(engine, checkfirst=True)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE todos"))
+        conn.execute(text("ANALYZE refresh_tokens"))
+    measure("with indexes", user_ids[0], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
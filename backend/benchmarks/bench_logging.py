@@ -0,0 +1,55 @@
+"""
+Throughput cost of request-path logging: service-style INFO calls per
+second with logging off, a synchronous stderr handler (the old
+basicConfig setup), the queue-based handler, and the queue-based JSON
+handler with 10% INFO sampling. Run with stderr redirected to a file or
+/dev/null to keep the terminal out of the measurement.
+
+    python -m benchmarks.bench_logging --calls 200000 2>/dev/null
+"""
+import argparse
+import logging
+import sys
+import time
+import uuid
+
+from src.logging import configure_logging, _stop_listener
+
+
+def service_like_calls(n: int) -> float:
+    user_id = uuid.uuid4()
+    start = time.perf_counter()
+    for i in range(n):
+        logging.info("Retrieved todo %s for user %s", i, user_id)
+        logging.info("Successfully patched todo %s for user %s", i, user_id)
+    return 2 * n / (time.perf_counter() - start)
+
+
+def configure_sync() -> None:
+    _stop_listener()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    logging.basicConfig(level=logging.INFO)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=100000)
+    args = parser.parse_args()
+
+    setups = [
+        ("off", lambda: configure_logging("ERROR")),
+        ("sync stderr", configure_sync),
+        ("queue", lambda: configure_logging("INFO")),
+        ("queue json 10%", lambda: configure_logging("INFO", json_format=True, sample_rate=0.1)),
+    ]
+    for label, setup in setups:
+        setup()
+        rate = service_like_calls(args.calls)
+        print(f"{label:>15}: {rate:>10.0f} log calls/s", file=sys.stdout, flush=True)
+    _stop_listener()
+
+
+if __name__ == "__main__":
+    main()
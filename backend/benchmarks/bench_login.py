@@ -0,0 +1,65 @@
+"""
+Concurrent-login benchmark: N simultaneous bcrypt verifications, either run
+inline on the event loop (the old async handlers) or through the dedicated
+password hash pool. Reports logins/s, rejected logins and the worst event
+loop stall seen by a 10ms heartbeat.
+
+    BCRYPT_ROUNDS=12 python -m benchmarks.bench_login --logins 64
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks import _env  # noqa: F401
+from src.auth import service
+from src.exceptions import ServiceBusyError
+
+PASSWORD = "correct horse battery staple"
+
+
+async def heartbeat(stop: asyncio.Event) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        worst = max(worst, time.perf_counter() - start - 0.01)
+    return worst * 1000
+
+
+async def login_inline(hashed: str) -> bool:
+    return service.bcrypt_context.verify(PASSWORD, hashed)
+
+
+async def login_pooled(hashed: str) -> bool:
+    try:
+        return await service.verify_password(PASSWORD, hashed)
+    except ServiceBusyError:
+        return False
+
+
+async def run(label: str, login, hashed: str, n_logins: int) -> None:
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(stop))
+    start = time.perf_counter()
+    results = await asyncio.gather(*(login(hashed) for _ in range(n_logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    worst_stall = await beat
+    print(f"{label:>7}: {sum(results) / elapsed:7.1f} logins/s  rejected={results.count(False)}  "
+          f"worst loop stall={worst_stall:.0f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64)
+    args = parser.parse_args()
+
+    hashed = service.bcrypt_context.hash(PASSWORD)
+    print(f"bcrypt rounds={service.BCRYPT_ROUNDS} workers={service.PASSWORD_HASH_WORKERS} "
+          f"max pending={service.PASSWORD_HASH_MAX_PENDING}")
+    asyncio.run(run("inline", login_inline, hashed, args.logins))
+    asyncio.run(run("pooled", login_pooled, hashed, args.logins))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Compare 90-day focus statistics computed by scanning raw pomodoro sessions
+against reading the daily rollup rows, on a generated session log
+(10M sessions by default, spread over --users users and one year).
+
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_pomodoro_stats --sessions 10000000
+"""
+import argparse
+import statistics
+import time
+import uuid
+
+from sqlalchemy import text
+
+from benchmarks import _env  # noqa: F401
+from src.database.core import Base, engine
+from src.entities import pomodoro  # noqa: F401 - register tables on Base.metadata
+
+SEED_SQL = """
+INSERT INTO users (id, email, first_name, last_name, password_hash)
+SELECT gen_random_uuid(), 'stats-bench-' || g || '-' || :run || '@example.com', 'Bench', 'User', 'x'
+FROM generate_series(1, :users) g;
+
+INSERT INTO todos (id, user_id, description, is_completed, is_important, is_urgent, created_at, status, pomodoro_count)
+SELECT gen_random_uuid(), u.id, 'todo ' || g, false, true, false, now(),
+       (ARRAY['to_do', 'in_progress', 'completed'])[1 + g % 3]::status, 0
+FROM users u, generate_series(1, 20) g
+WHERE u.email LIKE 'stats-bench-%-' || :run || '@example.com';
+
+INSERT INTO pomodoro_sessions (id, user_id, todo_id, started_at, ended_at)
+SELECT gen_random_uuid(), t.user_id, t.id, s.started_at, s.started_at + interval '25 minutes'
+FROM (
+    SELECT row_number() OVER () AS n, id, user_id FROM todos
+    WHERE user_id IN (SELECT id FROM users WHERE email LIKE 'stats-bench-%-' || :run || '@example.com')
+) t
+JOIN LATERAL (
+    SELECT now() - (random() * interval '365 days') AS started_at
+    FROM generate_series(1, :per_todo)
+) s ON true;
+
+INSERT INTO pomodoro_daily_rollups (user_id, day, status, session_count, focus_seconds)
+SELECT s.user_id, s.started_at::date, t.status, count(*), sum(extract(epoch FROM s.ended_at - s.started_at))::int
+FROM pomodoro_sessions s JOIN todos t ON t.id = s.todo_id
+WHERE s.user_id IN (SELECT id FROM users WHERE email LIKE 'stats-bench-%-' || :run || '@example.com')
+GROUP BY 1, 2, 3
+ON CONFLICT (user_id, day, status) DO UPDATE
+SET session_count = pomodoro_daily_rollups.session_count + excluded.session_count,
+    focus_seconds = pomodoro_daily_rollups.focus_seconds + excluded.focus_seconds;
+
+ANALYZE pomodoro_sessions;
+ANALYZE pomodoro_daily_rollups;
+"""
+
+RAW_SQL = """
+SELECT s.started_at::date AS day, t.status, count(*), sum(extract(epoch FROM s.ended_at - s.started_at))
+FROM pomodoro_sessions s JOIN todos t ON t.id = s.todo_id
+WHERE s.user_id = :user_id AND s.started_at >= now() - interval '90 days'
+GROUP BY 1, 2
+"""
+
+ROLLUP_SQL = """
+SELECT day, status, session_count, focus_seconds
+FROM pomodoro_daily_rollups
+WHERE user_id = :user_id AND day >= current_date - 89
+ORDER BY day
+"""
+
+
+def time_query(sql: str, user_id, repeat: int) -> list[float]:
+    timings = []
+    with engine.connect() as conn:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(text(sql), {"user_id": user_id}).fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    run = uuid.uuid4().hex[:8]
+    per_todo = max(1, args.sessions // (args.users * 20))
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        for statement in SEED_SQL.split(";"):
+            if statement.strip():
+                conn.execute(text(statement), {"users": args.users, "per_todo": per_todo, "run": run})
+    print(f"seeded {args.users * 20 * per_todo} sessions in {time.perf_counter() - start:.0f}s")
+
+    with engine.connect() as conn:
+        user_id = conn.execute(
+            text("SELECT id FROM users WHERE email LIKE :pattern LIMIT 1"),
+            {"pattern": f"stats-bench-%-{run}@example.com"},
+        ).scalar_one()
+
+    for label, sql in (("raw sessions", RAW_SQL), ("rollups", ROLLUP_SQL)):
+        timings = time_query(sql, user_id, args.repeat)
+        print(f"{label:>12}: p50={statistics.median(timings):.2f}ms max={max(timings):.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+CPU spent on an attack-shaped burst against POST /auth/token with the rate
+limiter off versus on. Two shapes: credential stuffing (one real account,
+wrong passwords from many IPs) and a spray (one IP, many emails). Uses the
+load-test users seeded by benchmarks.load.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_rate_limit --attempts 500 --ips 25
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+
+from benchmarks import _env  # noqa: F401
+from benchmarks.load import EMAIL_DOMAIN, seed
+from src.main import app
+from src.rate_limiter import InMemoryCounterStore, limiter
+
+
+async def attack(attempts: int, ips: int, spray: bool) -> Counter:
+    clients = [
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=app, client=(f"203.0.113.{i % 254 + 1}", 40000 + i)),
+                          base_url="http://bench")
+        for i in range(1 if spray else ips)
+    ]
+    statuses: Counter = Counter()
+    slots = asyncio.Semaphore(16)
+
+    async def attempt(i: int) -> None:
+        email = f"user{i}@{EMAIL_DOMAIN}" if spray else f"user0@{EMAIL_DOMAIN}"
+        async with slots:
+            response = await clients[i % len(clients)].post(
+                "/auth/token", data={"username": email, "password": f"guess-{i}"}
+            )
+        statuses[response.status_code] += 1
+
+    try:
+        await asyncio.gather(*(attempt(i) for i in range(attempts)))
+    finally:
+        for client in clients:
+            await client.aclose()
+    return statuses
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attempts", type=int, default=500)
+    parser.add_argument("--ips", type=int, default=25, help="source addresses for credential stuffing")
+    args = parser.parse_args()
+    seed(args.attempts, 0)
+
+    for shape, spray in (("stuffing", False), ("spray", True)):
+        for enabled in (False, True):
+            limiter.enabled = enabled
+            limiter.store = InMemoryCounterStore()
+            cpu, wall = time.process_time(), time.perf_counter()
+            statuses = await attack(args.attempts, args.ips, spray)
+            cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+            label = "limiter on" if enabled else "limiter off"
+            print(f"{shape:>8} {label:>11}: cpu={cpu:6.2f}s wall={wall:6.2f}s "
+                  f"({cpu / args.attempts * 1000:.1f}ms cpu/attempt)  statuses={dict(statuses)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,122 @@
+"""
+Cost of reordering a 10k-card board column. Seeds one user with N cards in
+the to_do column, then times random drag-and-drop moves through
+service.move_todo (fractional ranks, one row rewritten) against the
+integer-position alternative that shifts every card below the drop point.
+Finally drives moves into one gap until the ranks need rebalancing and
+times renumbering the column.
+
+Run against a scratch Postgres database, never production:
+
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_reorder --cards 10000 --moves 200
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, select, text, update
+
+from benchmarks import _env  # noqa: F401
+from src.auth.models import TokenData
+from src.database.core import AsyncSessionLocal, Base, engine
+from src.entities.todo import Status, Todo
+from src.entities.user import User
+from src.todos import models, service
+
+
+def seed(n_cards: int) -> tuple[uuid.UUID, list[uuid.UUID]]:
+    now = datetime.now(timezone.utc)
+    user_id = uuid.uuid4()
+    todo_ids = [uuid.uuid4() for _ in range(n_cards)]
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": user_id, "email": f"bench-{user_id}@example.com", "first_name": "Bench",
+                                     "last_name": "User", "password_hash": "x"}])
+        conn.execute(insert(Todo), [
+            {"id": todo_id, "user_id": user_id, "description": f"card {i}", "is_completed": False,
+             "is_important": True, "is_urgent": False, "created_at": now - timedelta(seconds=i),
+             "status": Status.to_do, "pomodoro_count": 0, "rank": i + 1}
+            for i, todo_id in enumerate(todo_ids)
+        ])
+        conn.execute(text("ANALYZE todos"))
+    return user_id, todo_ids
+
+
+def report(label: str, timings: list[float], rows: list[int]) -> None:
+    quantiles = statistics.quantiles(timings, n=100)
+    print(f"{label:<28} p50={quantiles[49]:.2f}ms p99={quantiles[98]:.2f}ms  rows written/move: "
+          f"avg={statistics.mean(rows):.0f} max={max(rows)}")
+
+
+async def fractional_moves(current_user: TokenData, todo_ids: list[uuid.UUID], moves: int) -> None:
+    timings, rows = [], []
+    async with AsyncSessionLocal() as db:
+        for _ in range(moves):
+            card, after = random.sample(todo_ids, 2)
+            start = time.perf_counter()
+            await service.move_todo(current_user, db, card, models.TodoMove(status=Status.to_do, after_id=after))
+            timings.append((time.perf_counter() - start) * 1000)
+            rows.append(1)
+    report("fractional rank", timings, rows)
+
+
+async def shifting_moves(user_id: uuid.UUID, todo_ids: list[uuid.UUID], moves: int) -> None:
+    """What an integer position column costs: open a slot by shifting everything below it."""
+    timings, rows = [], []
+    async with AsyncSessionLocal() as db:
+        for _ in range(moves):
+            card, after = random.sample(todo_ids, 2)
+            start = time.perf_counter()
+            position = await db.scalar(select(Todo.rank).where(Todo.id == after))
+            shifted = await db.execute(
+                update(Todo)
+                .where(Todo.user_id == user_id)
+                .where(Todo.status == Status.to_do)
+                .where(Todo.rank > position)
+                .values(rank=Todo.rank + 1)
+                .execution_options(synchronize_session=False)
+            )
+            await db.execute(update(Todo).where(Todo.id == card).values(rank=position + 1))
+            await db.commit()
+            timings.append((time.perf_counter() - start) * 1000)
+            rows.append(shifted.rowcount + 1)
+    report("integer positions (shift)", timings, rows)
+
+
+async def rebalancing(current_user: TokenData, todo_ids: list[uuid.UUID]) -> None:
+    # Keep dropping a card into the same gap, the worst case for rank length
+    top, card = todo_ids[0], todo_ids[1]
+    drops = 0
+    service._rebalance_pending.clear()
+    async with AsyncSessionLocal() as db:
+        while not service._rebalance_pending:
+            card, top = top, card
+            await service.move_todo(current_user, db, card, models.TodoMove(status=Status.to_do, after_id=top))
+            drops += 1
+        start = time.perf_counter()
+        renumbered = await service.rebalance_column(db, current_user.get_uuid(), Status.to_do)
+    print(f"rebalance after {drops} drops into one gap: {renumbered} cards renumbered in "
+          f"{(time.perf_counter() - start) * 1000:.0f}ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=10000)
+    parser.add_argument("--moves", type=int, default=200)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    user_id, todo_ids = seed(args.cards)
+    current_user = TokenData(user_id=str(user_id))
+
+    await fractional_moves(current_user, todo_ids, args.moves)
+    await rebalancing(current_user, todo_ids)
+    # Last: shifting needs whole-number ranks, which the rebalance just restored
+    await shifting_moves(user_id, todo_ids, args.moves)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
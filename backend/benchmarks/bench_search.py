@@ -0,0 +1,95 @@
+"""
+/todos/search latency against the scan-and-filter approach it replaces
+(load the whole board as GET /todos does, then filter descriptions in
+Python as the browser did). Seeds N users x M todos with descriptions drawn
+from a small vocabulary, 1M todos by default, and searches one user's board.
+
+Run against a scratch Postgres database, never production:
+
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_search --users 10 --todos 100000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, text
+
+from benchmarks import _env  # noqa: F401
+from src.auth.models import TokenData
+from src.database.core import AsyncSessionLocal, Base, engine
+from src.entities.todo import Status, Todo
+from src.entities.user import User
+from src.todos import models, service
+
+WORDS = (
+    "buy milk call mom review pull request write report book flights pay invoice clean garage plan sprint "
+    "fix login bug update resume water plants order groceries renew passport prepare slides email landlord"
+).split()
+QUERIES = ("invoice", "gro", "fix login", "prepare slides email", "passport renew flights")
+SEED_CHUNK = 10000
+
+
+def seed(n_users: int, n_todos: int) -> uuid.UUID:
+    now = datetime.now(timezone.utc)
+    rng = random.Random(42)
+    statuses = list(Status)
+    user_ids = [uuid.uuid4() for _ in range(n_users)]
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": uid, "email": f"bench-{uid}@example.com", "first_name": "Bench", "last_name": "User", "password_hash": "x"}
+            for uid in user_ids
+        ])
+        for uid in user_ids:
+            for start in range(0, n_todos, SEED_CHUNK):
+                conn.execute(insert(Todo), [
+                    {"id": uuid.uuid4(), "user_id": uid, "description": " ".join(rng.choices(WORDS, k=rng.randint(2, 8))),
+                     "is_completed": False, "is_important": True, "is_urgent": False,
+                     "created_at": now - timedelta(seconds=i), "status": statuses[i % len(statuses)],
+                     "pomodoro_count": 0, "rank": i}
+                    for i in range(start, min(start + SEED_CHUNK, n_todos))
+                ])
+        conn.execute(text("ANALYZE todos"))
+    print(f"seeded {n_users} users x {n_todos} todos")
+    return user_ids[0]
+
+
+async def indexed_search(current_user: TokenData, q: str, limit: int) -> int:
+    async with AsyncSessionLocal() as db:
+        page = await service.search_todos(current_user, db, q, models.TodoFilters(), limit)
+    return len(page.items)
+
+
+async def scan_and_filter(current_user: TokenData, q: str, limit: int) -> int:
+    terms = q.lower().split()
+    async with AsyncSessionLocal() as db:
+        todos = await service.get_todos(current_user, db)
+    return len([todo for todo in todos if all(term in todo.description.lower() for term in terms)][:limit])
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--todos", type=int, default=100000, help="todos per user")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    current_user = TokenData(user_id=seed(args.users, args.todos))
+
+    for q in QUERIES:
+        for label, search in (("search", indexed_search), ("scan+filter", scan_and_filter)):
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                found = await search(current_user, q, args.limit)
+                timings.append((time.perf_counter() - start) * 1000)
+            print(f"{q!r:<26} {label:<12} p50={statistics.median(timings):8.1f}ms max={max(timings):8.1f}ms  {found} results")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+"""
+CPU cost of serializing a todo list: the response_model path (ORM objects
+validated attribute by attribute, dumped to Python, then json.dumps) versus
+the column-row path (plain dicts validated once by the cached TypeAdapter
+and dumped straight to bytes). No database needed.
+
+    python -m benchmarks.bench_serialization --sizes 1000 10000
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from benchmarks import _env  # noqa: F401
+from src.entities.todo import Todo, Status
+from src.todos import models
+from src.todos.service import TODO_RESPONSE_COLUMNS
+
+
+def make_todos(n: int) -> list[Todo]:
+    now = datetime.now(timezone.utc)
+    user_id = uuid.uuid4()
+    return [
+        Todo(
+            id=uuid.uuid4(), user_id=user_id, description=f"Todo {i}", due_date=now + timedelta(days=i % 30),
+            status=Status.to_do, is_important=bool(i % 2), is_urgent=bool(i % 3), pomodoro_count=i % 8,
+            is_completed=False, completed_at=None, created_at=now, updated_at=now,
+        )
+        for i in range(n)
+    ]
+
+
+def response_model_path(todos: list[Todo]) -> bytes:
+    items = models.TodoResponseList.validate_python(todos, from_attributes=True)
+    return json.dumps(models.TodoResponseList.dump_python(items, mode="json")).encode()
+
+
+def column_row_path(rows: list[dict]) -> bytes:
+    return models.TodoResponseList.dump_json(models.TodoResponseList.validate_python(rows))
+
+
+def best_of(fn, arg, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    names = [column.key for column in TODO_RESPONSE_COLUMNS]
+    for n in args.sizes:
+        todos = make_todos(n)
+        # What the column select hands back, as dicts
+        rows = [{name: getattr(todo, name) for name in names} for todo in todos]
+        assert json.loads(response_model_path(todos)) == json.loads(column_row_path(rows))
+        old = best_of(response_model_path, todos, args.repeat)
+        new = best_of(column_row_path, rows, args.repeat)
+        print(f"{n:>6} todos: response_model {old:8.2f}ms  column rows {new:8.2f}ms  ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
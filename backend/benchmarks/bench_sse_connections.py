@@ -0,0 +1,93 @@
+"""
+Memory per idle realtime connection: start one uvicorn worker, open N
+GET /todos/events streams and compare the worker's resident memory before
+and after. Linux only (reads /proc).
+
+    python -m benchmarks.bench_sse_connections --connections 5000
+"""
+import argparse
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import time
+import uuid
+from datetime import timedelta
+
+import httpx
+
+from benchmarks import _env  # noqa: F401
+from src.auth.service import create_access_token
+
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError("VmRSS not found")
+
+
+async def open_streams(url: str, tokens: list[str], n: int, stop: asyncio.Event, ready: asyncio.Event) -> None:
+    opened = 0
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(timeout=None, limits=limits) as client:
+        async def stream(i: int) -> None:
+            nonlocal opened
+            params = {"access_token": tokens[i % len(tokens)]}
+            async with client.stream("GET", url, params=params) as response:
+                await response.aiter_raw().__anext__()  # ": connected"
+                opened += 1
+                if opened == n:
+                    ready.set()
+                await stop.wait()
+
+        tasks = [asyncio.create_task(stream(i)) for i in range(n)]
+        await asyncio.gather(*tasks)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(args.port), "--log-level", "warning",
+         "--backlog", "4096"],
+        env=os.environ.copy(),
+    )
+    try:
+        url = f"http://127.0.0.1:{args.port}/todos/events"
+        async with httpx.AsyncClient() as client:
+            for _ in range(50):
+                try:
+                    await client.get(f"http://127.0.0.1:{args.port}/")
+                    break
+                except httpx.ConnectError:
+                    await asyncio.sleep(0.2)
+        baseline = rss_mb(server.pid)
+
+        tokens = [create_access_token(f"u{i}@example.com", uuid.uuid4(), timedelta(hours=1)) for i in range(args.users)]
+        stop, ready = asyncio.Event(), asyncio.Event()
+        start = time.perf_counter()
+        clients = asyncio.create_task(open_streams(url, tokens, args.connections, stop, ready))
+        await ready.wait()
+        await asyncio.sleep(2)
+        loaded = rss_mb(server.pid)
+        print(f"opened {args.connections} streams in {time.perf_counter() - start:.1f}s")
+        print(f"worker RSS: {baseline:.1f}MB idle -> {loaded:.1f}MB "
+              f"({(loaded - baseline) * 1024 / args.connections:.1f}KB per connection)")
+        stop.set()
+        await clients
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
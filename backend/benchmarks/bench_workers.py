@@ -0,0 +1,55 @@
+"""
+Throughput scaling of the production server mode from 1 to N worker
+processes. Starts `python -m src.server` once per worker count (pool sizes
+are derived from WEB_CONCURRENCY as in a deployment), drives a few read
+endpoints with the load-test users from benchmarks.load and reports RPS
+and the speed-up over a single worker. More than one worker needs the
+cache, event bus and rate limiter on Redis, or src.server refuses to start.
+
+Run against a scratch Postgres database, never production:
+
+    DATABASE_URL=postgresql://... CACHE_URL=redis://localhost EVENT_BUS_URL=redis://localhost \
+        RATE_LIMIT_URL=redis://localhost python -m benchmarks.bench_workers --max-workers 4
+"""
+import argparse
+import asyncio
+import os
+
+from benchmarks import _env  # noqa: F401
+from benchmarks.load import SCENARIOS, login_all, run_scenario, run_uvicorn, seed
+
+ENDPOINTS = ("GET /users/me", "GET /todos/", "GET /todos/{id}")
+
+
+async def measure(args, workers: int) -> dict[str, float]:
+    args.workers = workers
+
+    async def run(client, args, label):
+        sessions = await login_all(client, args.users)
+        return {name: (await run_scenario(client, sessions, SCENARIOS[name], args.requests, args.concurrency))["rps"]
+                for name in ENDPOINTS}
+
+    return await run_uvicorn(args, run)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--todos", type=int, default=200, help="todos per user")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per endpoint and worker count")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    seed(args.users, args.todos)
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        rps = await measure(args, workers)
+        baseline = baseline or rps
+        for name in ENDPOINTS:
+            print(f"workers={workers:<3} {name:<18} {rps[name]:>9.1f} rps  x{rps[name] / baseline[name]:.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
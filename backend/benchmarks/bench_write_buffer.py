@@ -0,0 +1,97 @@
+"""
+Sustained pomodoro increments and patches per second with the write-behind
+buffer off, in group mode and in async mode. Each simulated client hammers
+its own todos through the service functions with a fresh session per
+call, as a request would, for a fixed time. Reports updates/sec, p50/p99
+latency and the database transactions they cost. Uses the load-test users
+seeded by benchmarks.load.
+
+Run against a scratch Postgres database, never production:
+
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_write_buffer --clients 200 --seconds 10
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import event, select
+
+from benchmarks import _env  # noqa: F401
+from benchmarks.load import EMAIL_DOMAIN, seed
+from src.auth.models import TokenData
+from src.database.core import AsyncSessionLocal, get_async_engine
+from src.entities.todo import Todo
+from src.entities.user import User
+from src.todos import models, service
+from src.todos.service import write_buffer
+
+commits = 0
+
+
+@event.listens_for(get_async_engine().sync_engine, "commit")
+def _count(conn):
+    global commits
+    commits += 1
+
+
+async def load_boards(n_users: int) -> list[tuple[TokenData, list]]:
+    async with AsyncSessionLocal() as db:
+        users = (await db.scalars(
+            select(User.id).where(User.email.like(f"%@{EMAIL_DOMAIN}")).order_by(User.email).limit(n_users)
+        )).all()
+        return [
+            (TokenData(user_id=user_id), (await db.scalars(select(Todo.id).where(Todo.user_id == user_id).limit(5))).all())
+            for user_id in users
+        ]
+
+
+async def run(mode: str, boards, clients: int, seconds: float) -> None:
+    global commits
+    write_buffer.mode = mode
+    flusher = asyncio.create_task(write_buffer.run()) if write_buffer.enabled else None
+    timings: list[float] = []
+    deadline = time.perf_counter() + seconds
+    commits = 0
+
+    async def client(i: int) -> None:
+        current_user, todo_ids = boards[i % len(boards)]
+        j = 0
+        while time.perf_counter() < deadline:
+            todo_id = todo_ids[(i + j) % len(todo_ids)]
+            start = time.perf_counter()
+            async with AsyncSessionLocal() as db:
+                if j % 4:
+                    await service.increment_pomodoro_count(current_user, db, todo_id)
+                else:
+                    await service.patch_todo(current_user, db, todo_id, models.TodoUpdate(is_urgent=j % 8 == 0))
+            timings.append((time.perf_counter() - start) * 1000)
+            j += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    if flusher is not None:
+        flusher.cancel()
+    await write_buffer.close()
+    elapsed = time.perf_counter() - start
+    quantiles = statistics.quantiles(timings, n=100)
+    print(f"{mode:>5}: {len(timings) / elapsed:8.0f} updates/s  p50={quantiles[49]:.1f}ms p99={quantiles[98]:.1f}ms  "
+          f"{commits} transactions for {len(timings)} updates")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--modes", nargs="*", default=["off", "group", "async"])
+    args = parser.parse_args()
+
+    seed(args.users, 20)
+    boards = await load_boards(args.users)
+    for mode in args.modes:
+        await run(mode, boards, args.clients, args.seconds)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
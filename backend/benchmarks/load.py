@@ -0,0 +1,288 @@
+"""
+Load-test the auth, users and todos routers end to end. Seeds load-test
+users and todos into the configured database, logs every user in, then
+drives each endpoint with a fixed number of concurrent clients. It runs
+both in-process through httpx's ASGI transport (app overhead only) and
+against a real uvicorn process (adds HTTP parsing and sockets). Reports
+RPS and p50/p95/p99 per endpoint and writes JSON results keyed by the
+current commit, so runs can be diffed with --compare.
+
+Run against a scratch Postgres database, never production:
+
+    DATABASE_URL=postgresql://... python -m benchmarks.load --users 20 --todos 200 --requests 500
+    python -m benchmarks.load --compare benchmarks/results/<old>.json benchmarks/results/<new>.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import httpx
+from sqlalchemy import func, insert, select
+
+from benchmarks import _env  # noqa: F401
+from src.auth.service import bcrypt_context
+from src.database.core import Base, engine
+from src.entities import pomodoro  # noqa: F401  (registers the tables for create_all)
+from src.entities.todo import Status, Todo
+from src.entities.user import User
+
+EMAIL_DOMAIN = "load.example.com"
+PASSWORD = "load-test-password"
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+@dataclass
+class Session:
+    user_id: str
+    email: str
+    access_token: str
+    refresh_token: str
+    todo_ids: list[str]
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+
+def seed(n_users: int, n_todos: int) -> None:
+    """Top up the load-test users to n_users, each with n_todos todos. Idempotent."""
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        existing = conn.scalar(select(func.count()).select_from(User).where(User.email.like(f"%@{EMAIL_DOMAIN}")))
+        if existing >= n_users:
+            return
+        password_hash = bcrypt_context.hash(PASSWORD)
+        now = datetime.now(timezone.utc)
+        statuses = list(Status)
+        for i in range(existing, n_users):
+            user_id = uuid.uuid4()
+            conn.execute(insert(User), [{
+                "id": user_id, "email": f"user{i}@{EMAIL_DOMAIN}", "first_name": "Load",
+                "last_name": f"User {i}", "password_hash": password_hash,
+            }])
+            if not n_todos:
+                continue
+            conn.execute(insert(Todo), [
+                {"id": uuid.uuid4(), "user_id": user_id, "description": f"Load todo {j}",
+                 "is_completed": False, "is_important": j % 2 == 0, "is_urgent": j % 3 == 0,
+                 "status": statuses[j % len(statuses)], "pomodoro_count": 0,
+                 "created_at": now - timedelta(minutes=j), "updated_at": now - timedelta(minutes=j)}
+                for j in range(n_todos)
+            ])
+    print(f"seeded {n_users - existing} users with {n_todos} todos each")
+
+
+async def login_all(client: httpx.AsyncClient, n_users: int) -> list[Session]:
+    with engine.connect() as conn:
+        users = conn.execute(
+            select(User.id, User.email).where(User.email.like(f"%@{EMAIL_DOMAIN}")).order_by(User.email).limit(n_users)
+        ).all()
+        todo_ids = {user.id: [] for user in users}
+        for user_id, todo_id in conn.execute(select(Todo.user_id, Todo.id).where(Todo.user_id.in_(list(todo_ids)))):
+            todo_ids[user_id].append(str(todo_id))
+
+    # Stay under the password hash pool's queue limit, which answers 503 beyond it
+    slots = asyncio.Semaphore(8)
+
+    async def login(user) -> Session:
+        async with slots:
+            response = await client.post("/auth/token", data={"username": user.email, "password": PASSWORD})
+        response.raise_for_status()
+        tokens = response.json()
+        return Session(str(user.id), user.email, tokens["access_token"], tokens["refresh_token"], todo_ids[user.id])
+
+    return await asyncio.gather(*(login(user) for user in users))
+
+
+# name -> async fn(client, session, i) returning the response. Writes only
+# touch the user's own seeded todos, so reruns keep the data set stable.
+async def _login(client, s, i):
+    return await client.post("/auth/token", data={"username": s.email, "password": PASSWORD})
+
+async def _refresh(client, s, i):
+    # Rotation invalidates the old token, so one user's refreshes must not overlap
+    async with s.lock:
+        response = await client.post("/auth/refresh", json={"refresh_token": s.refresh_token})
+        if response.status_code == 200:
+            tokens = response.json()
+            s.access_token, s.refresh_token = tokens["access_token"], tokens["refresh_token"]
+        return response
+
+async def _me(client, s, i):
+    return await client.get("/users/me", headers=s.headers)
+
+async def _list(client, s, i):
+    return await client.get("/todos/", headers=s.headers)
+
+async def _page(client, s, i):
+    return await client.get("/todos/page", params={"limit": 50}, headers=s.headers)
+
+async def _get(client, s, i):
+    return await client.get(f"/todos/{s.todo_ids[i % len(s.todo_ids)]}", headers=s.headers)
+
+async def _patch(client, s, i):
+    return await client.patch(f"/todos/{s.todo_ids[i % len(s.todo_ids)]}", json={"is_urgent": i % 2 == 0}, headers=s.headers)
+
+async def _increment(client, s, i):
+    return await client.put(f"/todos/{s.todo_ids[i % len(s.todo_ids)]}/increment-pomodoro", headers=s.headers)
+
+SCENARIOS = {
+    "POST /auth/token": _login,
+    "POST /auth/refresh": _refresh,
+    "GET /users/me": _me,
+    "GET /todos/": _list,
+    "GET /todos/page": _page,
+    "GET /todos/{id}": _get,
+    "PATCH /todos/{id}": _patch,
+    "PUT /todos/{id}/increment-pomodoro": _increment,
+}
+
+
+async def run_scenario(client: httpx.AsyncClient, sessions: list[Session], fn, requests: int, concurrency: int) -> dict:
+    timings: list[float] = []
+    errors = 0
+    next_request = 0
+
+    async def worker() -> None:
+        nonlocal errors, next_request
+        while next_request < requests:
+            i = next_request
+            next_request += 1
+            start = time.perf_counter()
+            try:
+                response = await fn(client, sessions[i % len(sessions)], i)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            timings.append((time.perf_counter() - start) * 1000)
+            errors += not ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    quantiles = statistics.quantiles(timings, n=100) if len(timings) > 1 else timings * 99
+    return {
+        "requests": len(timings),
+        "errors": errors,
+        "rps": round(len(timings) / elapsed, 1),
+        "p50_ms": round(quantiles[49], 2),
+        "p95_ms": round(quantiles[94], 2),
+        "p99_ms": round(quantiles[98], 2),
+    }
+
+
+async def run_all(client: httpx.AsyncClient, args, label: str) -> dict:
+    sessions = await login_all(client, args.users)
+    results = {}
+    for name, fn in SCENARIOS.items():
+        if args.only and not any(part in name for part in args.only):
+            continue
+        # bcrypt dominates logins; a tenth of the requests is plenty
+        requests = max(args.requests // 10, args.concurrency) if fn is _login else args.requests
+        stats = await run_scenario(client, sessions, fn, requests, args.concurrency)
+        results[name] = stats
+        print(f"[{label}] {name:<36} {stats['rps']:>8.1f} rps  p50={stats['p50_ms']:.1f} "
+              f"p95={stats['p95_ms']:.1f} p99={stats['p99_ms']:.1f}ms  errors={stats['errors']}")
+    return results
+
+
+async def run_asgi(args) -> dict:
+    from src.main import app
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load") as client:
+        return await run_all(client, args, "asgi")
+
+
+async def run_uvicorn(args, run=run_all) -> dict:
+    # The production server mode, so worker count and pool sizing match a deployment
+    server = subprocess.Popen(
+        [sys.executable, "-m", "src.server"],
+        env={**os.environ, "HOST": "127.0.0.1", "PORT": str(args.port), "WEB_CONCURRENCY": str(args.workers)},
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            for _ in range(100):
+                try:
+                    await client.get("/")
+                    break
+                except httpx.ConnectError:
+                    await asyncio.sleep(0.2)
+            else:
+                raise SystemExit("uvicorn did not start")
+            return await run(client, args, "uvicorn")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(old_path: str, new_path: str) -> None:
+    old, new = json.loads(Path(old_path).read_text()), json.loads(Path(new_path).read_text())
+    print(f"{old['commit']} -> {new['commit']}")
+    for mode, endpoints in new["results"].items():
+        for name, stats in endpoints.items():
+            before = old["results"].get(mode, {}).get(name)
+            if before is None:
+                continue
+            change = (stats["p99_ms"] - before["p99_ms"]) / before["p99_ms"] * 100 if before["p99_ms"] else 0
+            print(f"[{mode}] {name:<36} rps {before['rps']:>8.1f} -> {stats['rps']:<8.1f} "
+                  f"p99 {before['p99_ms']:.1f} -> {stats['p99_ms']:.1f}ms ({change:+.0f}%)")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--todos", type=int, default=200, help="todos per user")
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--mode", choices=("asgi", "uvicorn", "both"), default="both")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes; more than 1 needs CACHE_URL, EVENT_BUS_URL and RATE_LIMIT_URL")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--only", nargs="*", help="run endpoints whose name contains any of these")
+    parser.add_argument("--output", help=f"results file (default {RESULTS_DIR.name}/<commit>-<time>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="diff two results files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    seed(args.users, args.todos)
+    results = {}
+    if args.mode in ("asgi", "both"):
+        results["asgi"] = await run_asgi(args)
+    if args.mode in ("uvicorn", "both"):
+        results["uvicorn"] = await run_uvicorn(args)
+
+    commit = git_commit()
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit}-{datetime.now():%Y%m%d%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    config = {key: value for key, value in vars(args).items() if key not in ("compare", "output")}
+    output.write_text(json.dumps({
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": config,
+        "results": results,
+    }, indent=2))
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,8 +2,10 @@ from fastapi import FastAPI
 from src.auth.controller import router as auth_router
 from src.users.controller import router as users_router
 from src.todos.controller import router as todos_router
+from src.pomodoro.controller import router as pomodoro_router
 
 def register_routes(app: FastAPI):
     app.include_router(auth_router)
     app.include_router(users_router)
-    app.include_router(todos_router)
\ No newline at end of file
+    app.include_router(todos_router)
+    app.include_router(pomodoro_router)
\ No newline at end of file
@@ -4,26 +4,28 @@ from starlette import status
 from . import models
 from . import service
 from fastapi.security import OAuth2PasswordRequestForm
-from ..database.core import DbSession
-# from ..rate_limiter import limiter
+from ..database.core import AsyncDbSession
+from ..rate_limiter import limiter, LOGIN_EMAIL_LIMIT, LOGIN_IP_LIMIT, REFRESH_IP_LIMIT, REGISTER_IP_LIMIT
 
 router = APIRouter(
     prefix='/auth',
     tags=['auth']
 )
 
-@router.post("/", status_code=status.HTTP_201_CREATED)
-async def register_user(request: Request, db: DbSession, register_user_request: models.RegisterUserRequest):
-    service.register_user(db, register_user_request)
+@router.post("/", status_code=status.HTTP_201_CREATED, dependencies=[Depends(limiter.limit("auth.register", REGISTER_IP_LIMIT))])
+async def register_user(request: Request, db: AsyncDbSession, register_user_request: models.RegisterUserRequest):
+    await service.register_user(db, register_user_request)
 
-@router.post("/token", response_model=models.Token)
-async def login_for_access_token(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: DbSession):
-    return service.login_for_access_token(form_data, db)
+@router.post("/token", response_model=models.Token, dependencies=[Depends(limiter.limit("auth.token.ip", LOGIN_IP_LIMIT))])
+async def login_for_access_token(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: AsyncDbSession):
+    # Checked before authenticate_user so rejected attempts never reach bcrypt
+    await limiter.hit("auth.token.email", form_data.username.strip().lower(), LOGIN_EMAIL_LIMIT)
+    return await service.login_for_access_token(form_data, db)
 
-@router.post("/refresh", response_model=models.Token)
-def refresh_token_endpoint(refresh_request: models.RefreshTokenRequest, db: DbSession):
-    return service.refresh_access_token(refresh_request.refresh_token, db)
+@router.post("/refresh", response_model=models.Token, dependencies=[Depends(limiter.limit("auth.refresh", REFRESH_IP_LIMIT))])
+async def refresh_token_endpoint(refresh_request: models.RefreshTokenRequest, db: AsyncDbSession):
+    return await service.refresh_access_token(refresh_request.refresh_token, db)
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
-def logout(current_user: service.CurrentUser, db: DbSession):
-    service.logout_user(current_user, db)
\ No newline at end of file
+async def logout(current_user: service.CurrentUser, db: AsyncDbSession):
+    await service.logout_user(current_user, db)
\ No newline at end of file
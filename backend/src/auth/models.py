@@ -16,9 +16,7 @@ class Token(BaseModel):
     refresh_token: str | None = None
 
 class TokenData(BaseModel):
-    user_id: str | None = None
+    user_id: UUID | None = None
 
     def get_uuid(self) -> UUID | None:
-        if self.user_id:
-            return UUID(self.user_id)
-        return None
\ No newline at end of file
+        return self.user_id
\ No newline at end of file
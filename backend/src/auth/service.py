@@ -1,30 +1,55 @@
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta, datetime, timezone
+import hashlib
 import logging
+import threading
+import time
 from typing import Annotated
 from uuid import UUID, uuid4
 from fastapi import Depends
 from passlib.context import CryptContext
 import jwt
 from jwt import PyJWTError
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
 from src.entities.user import User, RefreshToken
+from ..database.core import AsyncSessionLocal
 from . import models
-from ..exceptions import AuthenticationError
-import os
-from dotenv import load_dotenv
+from ..exceptions import AuthenticationError, RefreshTokenError, ServiceBusyError
+import secrets
+from ..config import settings
 
-load_dotenv()
-
-SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = os.getenv("ALGORITHM")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
-REFRESH_TOKEN_EXPIRE_MINUTES = int(os.getenv("REFRESH_TOKEN_EXPIRE_MINUTES", "43200"))  # Default 30 days
+SECRET_KEY = settings.secret_key
+ALGORITHM = settings.algorithm
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
+REFRESH_TOKEN_EXPIRE_MINUTES = settings.refresh_token_expire_minutes
+TOKEN_CACHE_SIZE = settings.token_cache_size
+BCRYPT_ROUNDS = settings.bcrypt_rounds
+PASSWORD_HASH_WORKERS = settings.password_hash_workers
+PASSWORD_HASH_MAX_PENDING = settings.password_hash_max_pending
+REFRESH_TOKEN_SWEEP_INTERVAL = settings.refresh_token_sweep_interval
+REFRESH_TOKEN_SWEEP_BATCH = 1000
 
 
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl='auth/token')
-bcrypt_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
+oauth2_bearer_optional = OAuth2PasswordBearer(tokenUrl='auth/token', auto_error=False)
+# Hashes below the configured cost are reported as needing an update and get rehashed on login
+bcrypt_context = CryptContext(
+    schemes=['bcrypt'],
+    deprecated='auto',
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL, so a bounded thread pool keeps hashing off the event loop
+# and caps CPU spent on it; the semaphore rejects work once the queue is full.
+_password_hash_pool = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_password_hash_slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_PENDING)
 
 def create_access_token(email: str, user_id: UUID, expires_delta: timedelta) -> str:
     encode = {
@@ -34,70 +59,138 @@ def create_access_token(email: str, user_id: UUID, expires_delta: timedelta) ->
     }
     return jwt.encode(encode, SECRET_KEY, algorithm=ALGORITHM)
 
+# Verified access tokens keyed by SHA-256 digest -> (exp timestamp, claims), in LRU order
+_token_cache: OrderedDict[bytes, tuple[float, models.TokenData]] = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+def _get_cached_token(digest: bytes) -> models.TokenData | None:
+    with _token_cache_lock:
+        entry = _token_cache.get(digest)
+        if entry is None:
+            return None
+        expires_at, token_data = entry
+        if expires_at <= time.time():
+            del _token_cache[digest]
+            return None
+        _token_cache.move_to_end(digest)
+        return token_data
+
+def _cache_token(digest: bytes, expires_at: float, token_data: models.TokenData) -> None:
+    with _token_cache_lock:
+        _token_cache[digest] = (expires_at, token_data)
+        _token_cache.move_to_end(digest)
+        while len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+
 def verify_token(token: str) -> models.TokenData:
+    """
+    Decode and verify an access token. Verified claims are cached until the
+    token's own expiry, so repeat requests skip the signature check.
+    """
+    digest = hashlib.sha256(token.encode()).digest() if TOKEN_CACHE_SIZE > 0 else None
+    if digest is not None:
+        cached = _get_cached_token(digest)
+        if cached is not None:
+            return cached
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get('id')
-        return models.TokenData(user_id=user_id)
-    except PyJWTError as e:
-        logging.warning(f"Token verification failed: {str(e)}")
+        token_data = models.TokenData(user_id=payload.get('id'))
+    except (PyJWTError, ValueError) as e:
+        logging.warning("Token verification failed: %s", e)
         raise AuthenticationError()
+    if digest is not None and 'exp' in payload:
+        _cache_token(digest, float(payload['exp']), token_data)
+    return token_data
     
-def register_user(db: Session, register_user_request: models.RegisterUserRequest) -> None:
+async def register_user(db: AsyncSession, register_user_request: models.RegisterUserRequest) -> None:
     try:
         create_user_model = User(
             id = uuid4(),
             email = register_user_request.email,
             first_name=register_user_request.first_name,
             last_name=register_user_request.last_name,
-            password_hash=get_password_hash(register_user_request.password)
+            password_hash=await get_password_hash(register_user_request.password)
         )
         db.add(create_user_model)
-        db.commit()
+        await db.commit()
     except Exception as e:
-        logging.error(f"Failed to register user: {register_user_request.email}. Error: {str(e)}")
+        logging.error("Failed to register user: %s. Error: %s", register_user_request.email, e)
+        raise
+
+async def _run_password_hash(fn, *args):
+    if not _password_hash_slots.acquire(blocking=False):
+        logging.warning("Password hash pool is saturated, rejecting request")
+        raise ServiceBusyError()
+    try:
+        future = _password_hash_pool.submit(fn, *args)
+    except Exception:
+        _password_hash_slots.release()
         raise
+    future.add_done_callback(lambda _: _password_hash_slots.release())
+    return await asyncio.wrap_future(future)
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    return await _run_password_hash(bcrypt_context.verify, password, hashed_password)
 
-def verify_password(password: str, hashed_password: str) -> bool:
-    return bcrypt_context.verify(password, hashed_password)
+async def verify_and_update_password(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return await _run_password_hash(bcrypt_context.verify_and_update, password, hashed_password)
 
-def get_password_hash(password: str) -> str:
-    return bcrypt_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    return await _run_password_hash(bcrypt_context.hash, password)
 
-def authenticate_user(email:str, password:str, db:Session) -> User | bool:
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, user.password_hash):
-        logging.warning(f"Failed authentication attempt for email: {email}")
+async def authenticate_user(email:str, password:str, db:AsyncSession) -> User | bool:
+    user = await db.scalar(select(User).where(User.email == email))
+    if not user:
+        logging.warning("Failed authentication attempt for email: %s", email)
         return False
+    valid, new_hash = await verify_and_update_password(password, user.password_hash)
+    if not valid:
+        logging.warning("Failed authentication attempt for email: %s", email)
+        return False
+    if new_hash:
+        # Left pending on the session; login commits it together with the refresh token
+        user.password_hash = new_hash
+        logging.info("Rehashed password with current bcrypt cost for user: %s", user.id)
     return user
 
-def get_current_user(token: Annotated[str, Depends(oauth2_bearer)]) -> models.TokenData:
+async def get_current_user(token: Annotated[str, Depends(oauth2_bearer)]) -> models.TokenData:
     return verify_token(token)
 
 CurrentUser = Annotated[models.TokenData, Depends(get_current_user)]
 
-def create_refresh_token_db(db: Session, user: User) -> str:
+async def get_stream_user(token: Annotated[str | None, Depends(oauth2_bearer_optional)], access_token: str | None = None) -> models.TokenData:
+    """Browsers' EventSource can't send headers, so streams also accept ?access_token=."""
+    token = token or access_token
+    if not token:
+        raise AuthenticationError("Not authenticated")
+    return verify_token(token)
+
+StreamUser = Annotated[models.TokenData, Depends(get_stream_user)]
+
+def _hash_refresh_token(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+def _new_refresh_token() -> tuple[str, bytes, datetime]:
+    # A secure random token string (not a JWT); only its hash is stored
+    token = secrets.token_urlsafe(64)
+    return token, _hash_refresh_token(token), datetime.now(timezone.utc) + timedelta(minutes=REFRESH_TOKEN_EXPIRE_MINUTES)
+
+async def create_refresh_token_db(db: AsyncSession, user: User) -> str:
     """
-    Create a new refresh token, store it in DB, and remove any previous token for this user (single session).
+    Issue a refresh token for the user, replacing any previous one (single session)
+    with one upsert on the unique user_id. The commit also flushes changes already
+    pending on the session, e.g. a password rehash from authenticate_user.
     """
-    from uuid import uuid4
-    import secrets
-    # Generate a secure random token string (not a JWT)
-    token = secrets.token_urlsafe(64)
-    expires_at = datetime.now(timezone.utc) + timedelta(minutes=REFRESH_TOKEN_EXPIRE_MINUTES)
-    # Remove any existing refresh token for this user
-    db.query(RefreshToken).filter(RefreshToken.user_id == user.id).delete()
-    db.commit()
-    # Store new token
-    refresh_token = RefreshToken(
-        id=uuid4(),
-        user_id=user.id,
-        token=token,
-        created_at=datetime.now(timezone.utc),
-        expires_at=expires_at
+    token, token_hash, expires_at = _new_refresh_token()
+    now = datetime.now(timezone.utc)
+    stmt = pg_insert(RefreshToken).values(
+        id=uuid4(), user_id=user.id, token_hash=token_hash, created_at=now, expires_at=expires_at
     )
-    db.add(refresh_token)
-    db.commit()
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[RefreshToken.user_id],
+        set_={"token_hash": token_hash, "created_at": now, "expires_at": expires_at},
+    ))
+    await db.commit()
     return token
 
 def _is_token_expired(expires_at: datetime) -> bool:
@@ -113,52 +206,98 @@ def _is_token_expired(expires_at: datetime) -> bool:
     return expires_at < current_time
 
 
-def verify_refresh_token_db(db: Session, token: str) -> User:
+async def verify_refresh_token_db(db: AsyncSession, token: str) -> User:
     """
     Verify the refresh token exists, is not expired, and return the associated user.
     """
-    refresh_token = db.query(RefreshToken).filter(RefreshToken.token == token).first()
-    if not refresh_token:
-        from src.exceptions import RefreshTokenError
+    row = (await db.execute(
+        select(RefreshToken.expires_at, User)
+        .outerjoin(User, User.id == RefreshToken.user_id)
+        .where(RefreshToken.token_hash == _hash_refresh_token(token))
+    )).first()
+    if not row:
         raise RefreshTokenError()
-    if _is_token_expired(refresh_token.expires_at):
-        db.delete(refresh_token)
-        db.commit()
-        from src.exceptions import RefreshTokenError
+    expires_at, user = row
+    if _is_token_expired(expires_at):
         raise RefreshTokenError("Refresh token expired")
-    user = db.query(User).filter(User.id == refresh_token.user_id).first()
     if not user:
-        from src.exceptions import RefreshTokenError
         raise RefreshTokenError("User not found for refresh token")
     return user
 
-def login_for_access_token(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: Session) -> models.Token:
-    user = authenticate_user(form_data.username, form_data.password, db)
+async def login_for_access_token(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: AsyncSession) -> models.Token:
+    user = await authenticate_user(form_data.username, form_data.password, db)
     if not user:
         raise AuthenticationError()
     access_token = create_access_token(user.email, user.id, timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    refresh_token = create_refresh_token_db(db, user)
+    refresh_token = await create_refresh_token_db(db, user)
     return models.Token(access_token=access_token, token_type='bearer', refresh_token=refresh_token)
 
-def refresh_access_token(refresh_token: str, db: Session) -> models.Token:
+async def refresh_access_token(refresh_token: str, db: AsyncSession) -> models.Token:
+    """
+    Rotate the refresh token in one statement: the UPDATE only matches an
+    unexpired token, swaps in the new hash and returns the owner's email, so a
+    token can't be redeemed twice and there is a single round trip and commit.
+    """
     try:
-        user = verify_refresh_token_db(db, refresh_token)
-        # Remove the old refresh token (single session)
-        db.query(RefreshToken).filter(RefreshToken.user_id == user.id).delete()
-        db.commit()
-        access_token = create_access_token(user.email, user.id, timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-        new_refresh_token = create_refresh_token_db(db, user)
-        logging.info(f"Successfully refreshed token for user: {user.email}")
+        new_refresh_token, new_hash, expires_at = _new_refresh_token()
+        now = datetime.now(timezone.utc)
+        row = (await db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == _hash_refresh_token(refresh_token),
+                RefreshToken.expires_at > now,
+                RefreshToken.user_id == User.id,
+            )
+            .values(token_hash=new_hash, created_at=now, expires_at=expires_at)
+            .returning(User.id, User.email)
+            .execution_options(synchronize_session=False)
+        )).first()
+        if row is None:
+            # Failure path only: tell an expired token apart from an unknown one
+            await verify_refresh_token_db(db, refresh_token)
+            raise RefreshTokenError()
+        await db.commit()
+        access_token = create_access_token(row.email, row.id, timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+        logging.info("Successfully refreshed token for user: %s", row.email)
         return models.Token(access_token=access_token, token_type='bearer', refresh_token=new_refresh_token)
     except Exception as e:
-        logging.error(f"Failed to refresh access token: {str(e)}")
-        db.rollback()
+        logging.error("Failed to refresh access token: %s", e)
+        await db.rollback()
         raise
 
-def logout_user(current_user: models.TokenData, db: Session):
+async def logout_user(current_user: models.TokenData, db: AsyncSession):
     user_id = current_user.get_uuid()
     if user_id:
-        db.query(RefreshToken).filter(RefreshToken.user_id == user_id).delete()
-        db.commit()
+        await db.execute(delete(RefreshToken).where(RefreshToken.user_id == user_id))
+        await db.commit()
 
+async def sweep_expired_refresh_tokens(db: AsyncSession) -> int:
+    """Delete expired refresh tokens in batches of REFRESH_TOKEN_SWEEP_BATCH, committing each batch."""
+    deleted = 0
+    while True:
+        expired = (
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at < datetime.now(timezone.utc))
+            .limit(REFRESH_TOKEN_SWEEP_BATCH)
+        )
+        result = await db.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.id.in_(expired.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        deleted += result.rowcount
+        if result.rowcount < REFRESH_TOKEN_SWEEP_BATCH:
+            return deleted
 
+async def run_refresh_token_sweeper() -> None:
+    """Sweep expired refresh tokens every REFRESH_TOKEN_SWEEP_INTERVAL seconds until cancelled."""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                deleted = await sweep_expired_refresh_tokens(db)
+            if deleted:
+                logging.info("Swept %s expired refresh tokens", deleted)
+        except Exception as e:
+            logging.error("Refresh token sweep failed: %s", e)
+        await asyncio.sleep(REFRESH_TOKEN_SWEEP_INTERVAL)
@@ -0,0 +1,198 @@
+import itertools
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Awaitable, Callable
+from redis.exceptions import WatchError
+from .config import settings
+from .metrics import CACHE_LOOKUPS
+from .redis_client import redis_client
+
+CACHE_URL = settings.cache_url
+CACHE_TTL = settings.cache_ttl
+CACHE_MAX_ENTRIES = settings.cache_max_entries
+
+
+class Cache(ABC):
+    """
+    Byte values stored under `key` and an optional `field`, so every variant
+    of one entity (e.g. each filtered todo list of a user) is dropped by a
+    single delete(key).
+
+    Every delete bumps the key's generation. A reader records the generation
+    before loading from the database and passes it to set, which stores
+    nothing if a write invalidated the key in between; otherwise a load that
+    read the old rows could re-cache them after the invalidation.
+    """
+
+    @abstractmethod
+    async def get(self, key: str, field: str = "") -> bytes | None:
+        ...
+
+    @abstractmethod
+    async def generation(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, field: str = "", ttl: int = CACHE_TTL, generation: int | None = None) -> None:
+        """Store `value`; with `generation`, only if the key hasn't been deleted since it was read."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryCache(Cache):
+    """Per-process LRU with a TTL per key; entries are evicted least recently used first."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self._max_entries = max_entries
+        # key -> (expires at, {field: value}), in LRU order
+        self._entries: OrderedDict[str, tuple[float, dict[str, bytes]]] = OrderedDict()
+        # key -> generation of its last delete, in LRU order and capped like the entries. Values
+        # come from one counter, so a key forgotten and deleted again never reuses a generation
+        self._generations: OrderedDict[str, int] = OrderedDict()
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    async def get(self, key: str, field: str = "") -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, fields = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return fields.get(field)
+
+    async def generation(self, key: str) -> int:
+        with self._lock:
+            return self._generations.get(key, 0)
+
+    async def set(self, key: str, value: bytes, field: str = "", ttl: int = CACHE_TTL, generation: int | None = None) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            if generation is not None and self._generations.get(key, 0) != generation:
+                return
+            entry = self._entries.get(key)
+            fields = entry[1] if entry is not None and entry[0] > time.monotonic() else {}
+            fields[field] = value
+            self._entries[key] = (time.monotonic() + ttl, fields)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+                self._generations[key] = next(self._counter)
+                self._generations.move_to_end(key)
+            while len(self._generations) > max(self._max_entries, 1):
+                # A load still in flight for a forgotten key sees 0 and skips its set
+                self._generations.popitem(last=False)
+
+
+class RedisCache(Cache):
+    """Entries are Redis hashes (one field per variant) with a key-level TTL."""
+    KEY_PREFIX = "pomokan:cache:"
+    GENERATION_PREFIX = "pomokan:cache-generation:"
+    GENERATION_TTL = 86400  # Far longer than any load, so an expired generation never matches a stale one
+
+    def __init__(self, client):
+        self._client = client
+
+    async def get(self, key: str, field: str = "") -> bytes | None:
+        return await self._client.hget(self.KEY_PREFIX + key, field)
+
+    async def generation(self, key: str) -> int:
+        return int(await self._client.get(self.GENERATION_PREFIX + key) or 0)
+
+    async def set(self, key: str, value: bytes, field: str = "", ttl: int = CACHE_TTL, generation: int | None = None) -> None:
+        if generation is None:
+            async with self._client.pipeline(transaction=False) as pipe:
+                pipe.hset(self.KEY_PREFIX + key, field, value)
+                pipe.expire(self.KEY_PREFIX + key, ttl)
+                await pipe.execute()
+            return
+        # WATCH the generation: a delete landing between the check and EXEC aborts the write
+        async with self._client.pipeline(transaction=True) as pipe:
+            await pipe.watch(self.GENERATION_PREFIX + key)
+            if int(await pipe.get(self.GENERATION_PREFIX + key) or 0) != generation:
+                return
+            pipe.multi()
+            pipe.hset(self.KEY_PREFIX + key, field, value)
+            pipe.expire(self.KEY_PREFIX + key, ttl)
+            try:
+                await pipe.execute()
+            except WatchError:
+                pass
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.delete(*(self.KEY_PREFIX + key for key in keys))
+            for key in keys:
+                pipe.incr(self.GENERATION_PREFIX + key)
+                pipe.expire(self.GENERATION_PREFIX + key, self.GENERATION_TTL)
+            await pipe.execute()
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+_cache: Cache | None = None
+
+def get_cache() -> Cache:
+    global _cache
+    if _cache is None:
+        _cache = RedisCache(redis_client(CACHE_URL)) if CACHE_URL else InMemoryCache()
+    return _cache
+
+
+async def cached(key: str, load: Callable[[], Awaitable[bytes]], field: str = "") -> bytes:
+    """
+    Read-through lookup. Hits and misses are counted per key namespace (the
+    part before the first ':'). A failing cache backend is treated as a miss
+    and never fails the request.
+    """
+    namespace = key.split(":", 1)[0]
+    cache = get_cache()
+    try:
+        value = await cache.get(key, field)
+    except Exception as e:
+        logging.warning("Cache get failed for %s: %s", key, e)
+        value = None
+    if value is not None:
+        CACHE_LOOKUPS.inc(1, namespace, "hit")
+        return value
+    CACHE_LOOKUPS.inc(1, namespace, "miss")
+    try:
+        generation = await cache.generation(key)
+    except Exception as e:
+        logging.warning("Cache get failed for %s: %s", key, e)
+        return await load()
+    value = await load()
+    try:
+        # Skipped if a write invalidated the key while this load read the old rows
+        await cache.set(key, value, field, generation=generation)
+    except Exception as e:
+        logging.warning("Cache set failed for %s: %s", key, e)
+    return value
+
+
+async def invalidate(*keys: str) -> None:
+    """Drop `keys` with all their fields; called by services after every committed write."""
+    try:
+        await get_cache().delete(*keys)
+    except Exception as e:
+        logging.error("Cache invalidation failed for %s: %s", keys, e)
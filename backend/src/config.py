@@ -0,0 +1,147 @@
+import os
+from dataclasses import dataclass
+from dotenv import load_dotenv
+
+
+def _bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() == "true"
+
+
+def _int(name: str, default: int | None) -> int | None:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Every environment setting, read once at import (after loading .env)."""
+
+    # Server
+    cors_origin: str | None
+    host: str
+    port: int
+    web_concurrency: int  # Worker processes in server mode; more than 1 needs the shared Redis backends
+    forwarded_allow_ips: str  # Proxies trusted to set X-Forwarded-For (the client IP used by rate limits)
+    graceful_shutdown_seconds: int
+
+    # Database
+    database_url: str
+    async_database_url: str
+    db_max_connections: int  # Server-side connection limit shared by every worker
+    db_reserved_connections: int  # Kept free for migrations, scripts and admin sessions
+    async_pool_size: int
+    async_max_overflow: int
+    health_check_ttl: float  # Seconds a probe result is served from memory
+    pool_warmup_enabled: bool
+
+    # Auth
+    secret_key: str | None
+    algorithm: str | None
+    access_token_expire_minutes: int
+    refresh_token_expire_minutes: int
+    token_cache_size: int  # 0 disables the verified token cache
+    bcrypt_rounds: int
+    password_hash_workers: int
+    password_hash_max_pending: int  # Queued hashes before rejecting with 503
+    refresh_token_sweep_interval: int  # Seconds between expired token sweeps
+
+    # Rate limiting
+    rate_limit_enabled: bool
+    rate_limit_url: str  # Empty for in-process, redis://... to share counters across workers
+    rate_limit_login_ip: str
+    rate_limit_login_email: str
+    rate_limit_register_ip: str
+    rate_limit_refresh_ip: str
+    rate_limit_change_password_user: str
+
+    # Todos, realtime and caching
+    tombstone_retention_days: int  # Delta sync cursors older than this get 410; older tombstones are swept
+    tombstone_sweep_interval: int  # Seconds between tombstone sweeps
+    rank_rebalance_digits: int  # Fractional digits a board rank may reach before its column is renumbered
+    rank_rebalance_interval: int  # Seconds between rebalancing passes
+    import_max_rows: int  # Rows accepted by one POST /todos/import
+    archive_after_days: int  # Completed todos older than this move to todo_archive; 0 disables
+    archive_batch_size: int  # Todos moved per transaction
+    archive_interval: int  # Seconds between archiver runs
+    write_behind_mode: str  # off, group (ack after the batch commits) or async (ack from memory)
+    write_behind_interval_ms: int  # Flush period; in async mode, the window of writes a crash can lose
+    write_behind_max_pending: int  # Buffered todos that trigger an early flush
+    write_behind_state_ttl: float  # Seconds a buffered todo's last known row is reused without a re-read
+    event_bus_url: str  # Empty for in-process, redis://... to fan out across workers
+    subscriber_queue_size: int
+    cache_url: str  # Empty for in-process, redis://... to share across workers
+    cache_ttl: int  # Seconds; a safety net, writes invalidate explicitly
+    cache_max_entries: int  # In-process backend only; 0 disables caching
+
+    # Observability
+    slow_request_ms: float  # 0 disables the slow request log
+    log_json: bool
+    log_sample_rate: float  # Fraction of INFO records kept
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        load_dotenv()
+        database_url = os.getenv("DATABASE_URL", "")
+        web_concurrency = max(1, _int("WEB_CONCURRENCY", 1))  # 0 means a single worker, not none
+        db_max_connections = _int("DB_MAX_CONNECTIONS", 100)
+        db_reserved_connections = _int("DB_RESERVED_CONNECTIONS", 10)
+        # Split what the database allows evenly across workers, capped at the
+        # single-worker default of 5 pooled + 10 overflow
+        per_worker = max(2, min(15, (db_max_connections - db_reserved_connections) // web_concurrency))
+        async_pool_size = _int("ASYNC_POOL_SIZE", max(1, per_worker // 3))
+        return cls(
+            cors_origin=os.getenv("CORS_ORIGIN"),
+            host=os.getenv("HOST", "0.0.0.0"),
+            port=_int("PORT", 8000),
+            web_concurrency=web_concurrency,
+            forwarded_allow_ips=os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+            graceful_shutdown_seconds=_int("GRACEFUL_SHUTDOWN_SECONDS", 20),
+            database_url=database_url,
+            # Same database through asyncpg unless overridden, e.g. postgresql+asyncpg://...
+            async_database_url=os.getenv("ASYNC_DATABASE_URL") or database_url.replace("postgresql://", "postgresql+asyncpg://", 1),
+            db_max_connections=db_max_connections,
+            db_reserved_connections=db_reserved_connections,
+            async_pool_size=async_pool_size,
+            async_max_overflow=_int("ASYNC_MAX_OVERFLOW", max(0, per_worker - async_pool_size)),
+            health_check_ttl=float(os.getenv("HEALTH_CHECK_TTL", "10")),
+            pool_warmup_enabled=_bool("POOL_WARMUP_ENABLED", True),
+            secret_key=os.getenv("SECRET_KEY"),
+            algorithm=os.getenv("ALGORITHM"),
+            access_token_expire_minutes=_int("ACCESS_TOKEN_EXPIRE_MINUTES", 30),
+            refresh_token_expire_minutes=_int("REFRESH_TOKEN_EXPIRE_MINUTES", 43200),  # 30 days
+            token_cache_size=_int("TOKEN_CACHE_SIZE", 10000),
+            bcrypt_rounds=_int("BCRYPT_ROUNDS", 12),
+            password_hash_workers=_int("PASSWORD_HASH_WORKERS", os.cpu_count() or 1),
+            password_hash_max_pending=_int("PASSWORD_HASH_MAX_PENDING", 32),
+            refresh_token_sweep_interval=_int("REFRESH_TOKEN_SWEEP_INTERVAL", 3600),
+            rate_limit_enabled=_bool("RATE_LIMIT_ENABLED", True),
+            rate_limit_url=os.getenv("RATE_LIMIT_URL", ""),
+            rate_limit_login_ip=os.getenv("RATE_LIMIT_LOGIN_IP", "20/minute"),
+            rate_limit_login_email=os.getenv("RATE_LIMIT_LOGIN_EMAIL", "10/minute"),
+            rate_limit_register_ip=os.getenv("RATE_LIMIT_REGISTER_IP", "5/minute"),
+            rate_limit_refresh_ip=os.getenv("RATE_LIMIT_REFRESH_IP", "60/minute"),
+            rate_limit_change_password_user=os.getenv("RATE_LIMIT_CHANGE_PASSWORD_USER", "5/minute"),
+            tombstone_retention_days=_int("TOMBSTONE_RETENTION_DAYS", 30),
+            tombstone_sweep_interval=_int("TOMBSTONE_SWEEP_INTERVAL", 3600),
+            rank_rebalance_digits=_int("RANK_REBALANCE_DIGITS", 24),
+            rank_rebalance_interval=_int("RANK_REBALANCE_INTERVAL", 60),
+            import_max_rows=_int("IMPORT_MAX_ROWS", 100000),
+            archive_after_days=_int("ARCHIVE_AFTER_DAYS", 90),
+            archive_batch_size=_int("ARCHIVE_BATCH_SIZE", 1000),
+            archive_interval=_int("ARCHIVE_INTERVAL", 3600),
+            write_behind_mode=os.getenv("WRITE_BEHIND_MODE", "off").lower(),
+            write_behind_interval_ms=_int("WRITE_BEHIND_INTERVAL_MS", 250),
+            write_behind_max_pending=_int("WRITE_BEHIND_MAX_PENDING", 1000),
+            write_behind_state_ttl=float(os.getenv("WRITE_BEHIND_STATE_TTL", "30")),
+            event_bus_url=os.getenv("EVENT_BUS_URL", ""),
+            subscriber_queue_size=_int("SUBSCRIBER_QUEUE_SIZE", 100),
+            cache_url=os.getenv("CACHE_URL", ""),
+            cache_ttl=_int("CACHE_TTL", 60),
+            cache_max_entries=_int("CACHE_MAX_ENTRIES", 10000),
+            slow_request_ms=float(os.getenv("SLOW_REQUEST_MS", "0")),
+            log_json=_bool("LOG_JSON", False),
+            log_sample_rate=float(os.getenv("LOG_SAMPLE_RATE", "1.0")),
+        )
+
+
+settings = Settings.from_env()
@@ -1,29 +1,113 @@
 from typing import Annotated
 from fastapi import Depends
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
-import os
-from dotenv import load_dotenv
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from ..config import settings
+from ..metrics import instrument_engine, timed_pool_class
 
-load_dotenv()
+DATABASE_URL = settings.database_url
+ASYNC_DATABASE_URL = settings.async_database_url
+# Derived from WEB_CONCURRENCY and DB_MAX_CONNECTIONS unless set explicitly
+ASYNC_POOL_SIZE = settings.async_pool_size
+ASYNC_MAX_OVERFLOW = settings.async_max_overflow
+POOL_RECYCLE_SECONDS = 240  # Recycle connections every 4 minutes - before Neon auto-pause
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+# Engines are created on first use rather than at import, so each server
+# worker opens its own pool after it starts and never inherits connections
+# from a parent process; importing the app stays cheap for tooling too.
+_engine: Engine | None = None
+_async_engine: AsyncEngine | None = None
 
-engine = create_engine(DATABASE_URL,
+
+def get_engine() -> Engine:
+    global _engine
+    if _engine is None:
+        _engine = create_engine(DATABASE_URL,
                         pool_pre_ping=True,      # Test connections before using them
-                        pool_recycle=240,        # Recycle connections every 4 minutes (240 seconds) - before Neon auto-pause
+                        pool_recycle=POOL_RECYCLE_SECONDS,
                         pool_timeout=30,         # Timeout for getting connection from pool
                         max_overflow=10,         # Allow more overflow connections for better handling
                         pool_size=3,             # Smaller base pool size for serverless
                         echo=False,              # Set to True for debugging SQL queries
+                        poolclass=timed_pool_class(QueuePool, "sync"),  # Records checkout waits for /metrics
                         connect_args={
                             "sslmode": "require",  # Ensure SSL connection to Neon
                             "connect_timeout": 10,  # Connection timeout
                             "application_name": "pomokan_backend",  # For monitoring
                         }
                         )
+        instrument_engine(_engine)
+    return _engine
+
+
+# Request handlers use the async engine, so DB waits no longer hold one of
+# Starlette's threadpool workers. The sync engine above is kept for Alembic,
+# scripts and benchmarks.
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(ASYNC_DATABASE_URL,
+                        pool_pre_ping=True,
+                        pool_recycle=POOL_RECYCLE_SECONDS,
+                        pool_timeout=30,
+                        max_overflow=ASYNC_MAX_OVERFLOW,
+                        pool_size=ASYNC_POOL_SIZE,
+                        echo=False,
+                        poolclass=timed_pool_class(AsyncAdaptedQueuePool, "async"),
+                        connect_args={
+                            "ssl": "require",
+                            "timeout": 10,
+                            "server_settings": {"application_name": "pomokan_backend"},
+                        }
+                        )
+        instrument_engine(_async_engine.sync_engine)
+    return _async_engine
+
+
+def created_engines() -> dict[str, Engine]:
+    """Engines this process has opened so far, labelled for /metrics."""
+    engines = {}
+    if _engine is not None:
+        engines["sync"] = _engine
+    if _async_engine is not None:
+        engines["async"] = _async_engine.sync_engine
+    return engines
+
+
+async def dispose_engines() -> None:
+    """Close pooled connections on shutdown so the database sees clean disconnects."""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
 
-SessionLocal = sessionmaker(autocommit = False, autoflush=False, bind=engine)
+
+def __getattr__(name: str):
+    # `engine` and `async_engine` stay importable for scripts and benchmarks
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _SyncSession(Session):
+    def get_bind(self, mapper=None, clause=None, **kw):
+        return get_engine()
+
+
+class _AsyncBoundSession(Session):
+    def get_bind(self, mapper=None, clause=None, **kw):
+        return get_async_engine().sync_engine
+
+
+SessionLocal = sessionmaker(class_=_SyncSession, autocommit = False, autoflush=False)
+
+# expire_on_commit=False: async sessions cannot lazy-load attributes after commit
+AsyncSessionLocal = async_sessionmaker(sync_session_class=_AsyncBoundSession, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
@@ -36,3 +120,8 @@ def get_db():
 
 DbSession = Annotated[Session, Depends(get_db)]
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+AsyncDbSession = Annotated[AsyncSession, Depends(get_async_db)]
@@ -0,0 +1,74 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from sqlalchemy import text
+from ..config import settings
+from .core import get_async_engine, ASYNC_POOL_SIZE, POOL_RECYCLE_SECONDS
+
+HEALTH_CHECK_TTL = settings.health_check_ttl
+POOL_WARMUP_ENABLED = settings.pool_warmup_enabled
+# Re-warm well inside pool_recycle so expired connections are replaced by this
+# task instead of by the first request that checks them out
+POOL_WARMUP_INTERVAL = POOL_RECYCLE_SECONDS * 0.75
+
+
+@dataclass
+class HealthStatus:
+    ok: bool
+    checked_at: float
+    error: str | None = None
+
+
+_status: HealthStatus | None = None
+_check_lock = asyncio.Lock()
+
+
+async def _ping() -> HealthStatus:
+    try:
+        async with get_async_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return HealthStatus(ok=True, checked_at=time.monotonic())
+    except Exception as e:
+        logging.warning("Database health check failed: %s", e)
+        return HealthStatus(ok=False, checked_at=time.monotonic(), error=str(e))
+
+
+async def check_database() -> HealthStatus:
+    """
+    Database health, served from memory for HEALTH_CHECK_TTL seconds. Concurrent
+    probes after expiry share one round trip, so a load balancer polling every
+    second costs at most one pooled connection per TTL.
+    """
+    global _status
+    if _status is not None and time.monotonic() - _status.checked_at < HEALTH_CHECK_TTL:
+        return _status
+    async with _check_lock:
+        if _status is None or time.monotonic() - _status.checked_at >= HEALTH_CHECK_TTL:
+            _status = await _ping()
+        return _status
+
+
+async def warm_pool() -> None:
+    """Open ASYNC_POOL_SIZE connections at once so the pool is full before traffic arrives."""
+    global _status
+
+    async def touch():
+        async with get_async_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(touch() for _ in range(ASYNC_POOL_SIZE)), return_exceptions=True)
+    errors = [r for r in results if isinstance(r, Exception)]
+    _status = HealthStatus(ok=not errors, checked_at=time.monotonic(), error=str(errors[0]) if errors else None)
+    if errors:
+        logging.warning("Pool warm-up opened %s/%s connections: %s", len(results) - len(errors), len(results), errors[0])
+    else:
+        logging.info("Pool warm-up opened %s connections in %.0fms", len(results), (time.perf_counter() - start) * 1000)
+
+
+async def keep_pool_warm() -> None:
+    """Warm the pool at startup, then every POOL_WARMUP_INTERVAL seconds until cancelled."""
+    while True:
+        await warm_pool()
+        await asyncio.sleep(POOL_WARMUP_INTERVAL)
@@ -0,0 +1,24 @@
+from datetime import datetime, timezone
+from sqlalchemy import DateTime
+from sqlalchemy.types import TypeDecorator
+
+
+class UTCDateTime(TypeDecorator):
+    """
+    Naive UTC ``TIMESTAMP WITHOUT TIME ZONE``. asyncpg rejects tz-aware values
+    for these columns, so aware datetimes are converted to UTC and stripped.
+    Values read back are UTC-aware, the same as the Python-side defaults, so a
+    row serializes alike whether it was just inserted or loaded.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value: datetime | None, dialect) -> datetime | None:
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value: datetime | None, dialect) -> datetime | None:
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
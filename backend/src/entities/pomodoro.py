@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey, Enum, Index
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from ..database.core import Base
+from ..database.types import UTCDateTime
+from .todo import Status
+
+
+class PomodoroSession(Base):
+    """Append-only log of completed focus sessions."""
+    __tablename__ = 'pomodoro_sessions'
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
+    # A todo in `todos` or, once archived, in `todo_archive`. No foreign key: the archive is
+    # partitioned and keyed by (id, completed_at). Deleting a todo clears the link explicitly
+    todo_id = Column(UUID(as_uuid=True), nullable=True)
+    started_at = Column(UTCDateTime, nullable=False)
+    ended_at = Column(UTCDateTime, nullable=False)
+
+    __table_args__ = (
+        Index('ix_pomodoro_sessions_user_id_started_at', 'user_id', 'started_at'),
+        Index('ix_pomodoro_sessions_todo_id', 'todo_id'),
+    )
+
+    def __repr__(self):
+        return f"<PomodoroSession(todo_id='{self.todo_id}', started_at='{self.started_at}', ended_at='{self.ended_at}')>"
+
+
+class PomodoroDailyRollup(Base):
+    """Per user, UTC day and todo status totals, maintained on every session insert."""
+    __tablename__ = 'pomodoro_daily_rollups'
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), primary_key=True)
+    day = Column(Date, primary_key=True)
+    status = Column(Enum(Status), primary_key=True)
+    session_count = Column(Integer, nullable=False, default=0)
+    focus_seconds = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<PomodoroDailyRollup(day='{self.day}', status='{self.status}', session_count={self.session_count})>"
@@ -1,9 +1,11 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Enum
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy import Column, Computed, String, Integer, Boolean, ForeignKey, Enum, Index, Numeric, text
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, TSVECTOR
+from sqlalchemy.orm import deferred
 import uuid
 from datetime import datetime, timezone
 import enum
-from ..database.core import Base 
+from ..database.core import Base
+from ..database.types import UTCDateTime
 
 class Status(enum.Enum):
     to_do = "to_do"
@@ -16,15 +18,82 @@ class Todo(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     description = Column(String, nullable=False)
-    due_date = Column(DateTime, nullable=True)
+    due_date = Column(UTCDateTime, nullable=True)
     is_completed = Column(Boolean, nullable=False, default=False)
     is_important = Column(Boolean, nullable=False, default=True)
     is_urgent = Column(Boolean, nullable=False, default=False)
-    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
-    completed_at = Column(DateTime, nullable=True)
+    created_at = Column(UTCDateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    completed_at = Column(UTCDateTime, nullable=True)
     status = Column(Enum(Status), nullable=False, default=Status.to_do)
     pomodoro_count = Column(Integer, nullable=False, default=0)
+    # Board position within the status column, ascending from the top. Unbounded
+    # NUMERIC, so a card always fits between two neighbours and a move rewrites one row
+    rank = Column(Numeric, nullable=False, server_default="0")
+    # Maintained by Postgres for /todos/search; deferred so regular loads never fetch it
+    search_vector = deferred(Column(TSVECTOR, Computed("to_tsvector('english', description)", persisted=True)))
+    # Bumped by every ORM flush and update() statement; drives ETags and delta sync
+    updated_at = Column(UTCDateTime, nullable=False, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
+    __table_args__ = (
+        Index('ix_todos_user_id_created_at', 'user_id', 'created_at', 'id'),
+        Index('ix_todos_user_id_status_rank', 'user_id', 'status', 'rank'),
+        Index('ix_todos_user_id_updated_at', 'user_id', 'updated_at'),
+        Index('ix_todos_search_vector', 'search_vector', postgresql_using='gin'),
+        # Small: only completed todos, which the archiver picks oldest first
+        Index('ix_todos_completed_at', 'completed_at', postgresql_where=text('is_completed')),
+    )
+
+
+    def __repr__(self):
+        return f"<Todo(description='{self.description}', due_date='{self.due_date}', is_completed={self.is_completed})>"
+
+
+class TodoTombstone(Base):
+    """Record of a deleted todo so delta sync clients can drop it."""
+    __tablename__ = 'todo_tombstones'
+
+    todo_id = Column(UUID(as_uuid=True), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
+    deleted_at = Column(UTCDateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index('ix_todo_tombstones_user_id_deleted_at', 'user_id', 'deleted_at'),
+        # For the retention sweeper, which deletes the oldest across all users
+        Index('ix_todo_tombstones_deleted_at', 'deleted_at'),
+    )
+
+    def __repr__(self):
+        return f"<TodoTombstone(todo_id='{self.todo_id}', deleted_at='{self.deleted_at}')>"
+
+
+class ArchivedTodo(Base):
+    """
+    Completed todo moved out of `todos` by the archiver. Range-partitioned by
+    month of completed_at (partitions are created by the archiver as needed),
+    so old months can be detached or dropped without touching live data.
+    """
+    __tablename__ = 'todo_archive'
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    # Part of the key because Postgres requires the partition key in every unique index
+    completed_at = Column(UTCDateTime, primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
+    description = Column(String, nullable=False)
+    due_date = Column(UTCDateTime, nullable=True)
+    is_completed = Column(Boolean, nullable=False, default=True)
+    is_important = Column(Boolean, nullable=False)
+    is_urgent = Column(Boolean, nullable=False)
+    created_at = Column(UTCDateTime, nullable=False)
+    status = Column(Enum(Status), nullable=False)
+    pomodoro_count = Column(Integer, nullable=False)
+    rank = Column(Numeric, nullable=False)
+    updated_at = Column(UTCDateTime, nullable=False)
+    archived_at = Column(UTCDateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index('ix_todo_archive_user_id_completed_at', 'user_id', 'completed_at', 'id'),
+        {'postgresql_partition_by': 'RANGE (completed_at)'},
+    )
 
     def __repr__(self):
-        return f"<Todo(description='{self.description}', due_date='{self.due_date}', is_completed={self.is_completed})>"
\ No newline at end of file
+        return f"<ArchivedTodo(description='{self.description}', completed_at='{self.completed_at}')>"
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, ForeignKey, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from uuid import uuid4
 from datetime import datetime, timezone
 from ..database.core import Base
+from ..database.types import UTCDateTime
 
 
 class User(Base):
@@ -22,6 +23,6 @@ class RefreshToken(Base):
     __tablename__ = 'refresh_tokens'
     id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid4)
     user_id = Column(PG_UUID(as_uuid=True), ForeignKey('users.id'), nullable=False, unique=True)  # single session per user
-    token = Column(String, nullable=False, unique=True)
-    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
-    expires_at = Column(DateTime, nullable=False)
+    token_hash = Column(LargeBinary, nullable=False, unique=True)  # SHA-256 of the token; the raw value is never stored
+    created_at = Column(UTCDateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    expires_at = Column(UTCDateTime, nullable=False, index=True)
@@ -20,6 +20,14 @@ class AuthenticationError(HTTPException):
     def __init__(self, message: str = "Invalid Email or Password"):
         super().__init__(status_code=401, detail=message)
 
+class ServiceBusyError(HTTPException):
+    def __init__(self, message: str = "Server is busy, please retry shortly"):
+        super().__init__(status_code=503, detail=message, headers={"Retry-After": "1"})
+
+class RateLimitExceededError(HTTPException):
+    def __init__(self, retry_after: int, message: str = "Too many requests, please retry later"):
+        super().__init__(status_code=429, detail=message, headers={"Retry-After": str(retry_after)})
+
 class TodoError(HTTPException):
     pass
 
@@ -35,4 +43,24 @@ class TodoCreationError(TodoError):
 
 class RefreshTokenError(HTTPException):
     def __init__(self, message: str = "Invalid or expired refresh token"):
-        super().__init__(status_code=401, detail=message)
\ No newline at end of file
+        super().__init__(status_code=401, detail=message)
+
+class InvalidCursorError(TodoError):
+    def __init__(self):
+        super().__init__(status_code=400, detail="Invalid pagination cursor")
+
+class SyncCursorExpiredError(TodoError):
+    def __init__(self):
+        super().__init__(status_code=410, detail="Sync cursor expired, reload all todos")
+
+class InvalidMoveError(TodoError):
+    def __init__(self, message: str = "Neighbouring todos must exist in the target column, in board order"):
+        super().__init__(status_code=400, detail=message)
+
+class InvalidImportError(TodoError):
+    def __init__(self, message: str):
+        super().__init__(status_code=400, detail=message)
+
+class ImportTooLargeError(TodoError):
+    def __init__(self, max_rows: int):
+        super().__init__(status_code=413, detail=f"Imports are limited to {max_rows} todos")
@@ -1,7 +1,25 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
+import random
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
 from enum import StrEnum
+from .config import settings
 
 LOG_FORMAT_DEBUG = "%(levelname)s:%(message)s:%(pathname)s:%(funcName)s:%(lineno)d"
+LOG_JSON = settings.log_json
+LOG_SAMPLE_RATE = settings.log_sample_rate
+LOG_QUEUE_SIZE = 10000
+
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "request_id"}
+_listener: logging.handlers.QueueListener | None = None
 
 
 class LogLevels(StrEnum):
@@ -10,16 +28,123 @@ class LogLevels(StrEnum):
     error = "ERROR"
     debug = "DEBUG"
 
-def configure_logging(log_level: str = LogLevels.error):
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class InfoSamplingFilter(logging.Filter):
+    """Keep a fraction of INFO (and DEBUG) records; warnings and errors always pass."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.INFO or random.random() < self.rate
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueue records without formatting them. The stock QueueHandler renders
+    the message in the calling thread; here %-style args are merged by the
+    listener thread, so the request path only pays for the enqueue. The
+    request ID is captured now because context vars don't cross threads.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.request_id = request_id_var.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+class RequestIdMiddleware:
+    """Tag every log record of a request with X-Request-ID (generated if absent) and echo it back."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = dict(scope["headers"]).get(b"x-request-id", b"").decode()[:64] or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", []).append((b"x-request-id", request_id.encode()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def configure_logging(log_level: str = LogLevels.error, json_format: bool | None = None, sample_rate: float | None = None):
+    """
+    Route the root logger through a bounded queue to a listener thread, so
+    request handlers never block on stderr. Records beyond LOG_QUEUE_SIZE are
+    dropped rather than stalling the event loop.
+    """
     log_level = str(log_level).upper()
     log_levels = [level.value for level in LogLevels]
+    json_format = LOG_JSON if json_format is None else json_format
+    sample_rate = LOG_SAMPLE_RATE if sample_rate is None else sample_rate
 
     if log_level not in log_levels:
-        logging.basicConfig(level=LogLevels.error)
-        return
+        log_level = LogLevels.error
+
+    output = logging.StreamHandler()
+    if json_format:
+        output.setFormatter(JsonFormatter())
+    elif log_level == LogLevels.debug:
+        output.setFormatter(logging.Formatter(LOG_FORMAT_DEBUG))
+    else:
+        output.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+
+    handler = LazyQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    if sample_rate < 1.0:
+        handler.addFilter(InfoSamplingFilter(sample_rate))
+
+    _stop_listener()
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(log_level)
+
+    global _listener
+    _listener = logging.handlers.QueueListener(handler.queue, output, respect_handler_level=True)
+    _listener.start()
 
-    if log_level == LogLevels.debug:
-        logging.basicConfig(level=log_level, format=LOG_FORMAT_DEBUG)
-        return
 
-    logging.basicConfig(level=log_level)
\ No newline at end of file
+atexit.register(_stop_listener)
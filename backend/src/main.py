@@ -1,19 +1,52 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from .database.core import engine, Base, get_db
+from fastapi.responses import PlainTextResponse
+from .config import settings
+from .database.core import Base, created_engines, dispose_engines
+from .database.health import check_database, keep_pool_warm, POOL_WARMUP_ENABLED
 from .entities.todo import Todo
 from .entities.user import User
+from .entities.pomodoro import PomodoroSession
 from .api import register_routes
-from .logging import configure_logging, LogLevels
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
+from .logging import configure_logging, LogLevels, RequestIdMiddleware
+from .metrics import MetricsMiddleware, render_metrics
+from .realtime.bus import get_event_bus
+from .cache import get_cache
+from .rate_limiter import limiter
+from .auth.service import run_refresh_token_sweeper
+from .todos.service import ARCHIVE_AFTER_DAYS, run_rank_rebalancer, run_todo_archiver, run_tombstone_sweeper, write_buffer
 configure_logging(LogLevels.info)
 
-CORS_ORIGIN = os.getenv("CORS_ORIGIN")
+CORS_ORIGIN = settings.cors_origin
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = [
+        asyncio.create_task(run_refresh_token_sweeper()),
+        asyncio.create_task(run_tombstone_sweeper()),
+        asyncio.create_task(run_rank_rebalancer()),
+    ]
+    if POOL_WARMUP_ENABLED:
+        tasks.append(asyncio.create_task(keep_pool_warm()))
+    if ARCHIVE_AFTER_DAYS > 0:
+        tasks.append(asyncio.create_task(run_todo_archiver()))
+    if write_buffer.enabled:
+        tasks.append(asyncio.create_task(write_buffer.run()))
+    yield
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    # Buffered writes land before the cache and pools they need are closed
+    await write_buffer.close()
+    await get_event_bus().close()
+    await get_cache().close()
+    await limiter.close()
+    await dispose_engines()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware first
 app.add_middleware(
@@ -23,22 +56,30 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"]
 )
+# Added last so it wraps CORS too and times the whole request
+app.add_middleware(MetricsMiddleware)
+# Outermost, so every log line of the request (including the slow request log) carries its ID
+app.add_middleware(RequestIdMiddleware)
 
 @app.get("/")
 def health_check():
     return {"status": "ok"}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus text exposition; restrict to the scraper at the proxy."""
+    return PlainTextResponse(
+        render_metrics(created_engines()),
+        media_type="text/plain; version=0.0.4"
+    )
+
 @app.get("/health/db")
-def database_health_check():
-    """Check database connectivity - useful for warming up Neon DB"""
-    try:
-        db = next(get_db())
-        # Simple query to test connection
-        db.execute("SELECT 1")
-        db.close()
-        return {"status": "ok", "database": "connected"}
-    except Exception as e:
-        raise HTTPException(status_code=503, detail=f"Database unavailable: {str(e)}")
+async def database_health_check():
+    """Database connectivity, cached for HEALTH_CHECK_TTL so probes don't hold pool slots"""
+    status = await check_database()
+    if not status.ok:
+        raise HTTPException(status_code=503, detail=f"Database unavailable: {status.error}")
+    return {"status": "ok", "database": "connected"}
 
 
 register_routes(app)
\ No newline at end of file
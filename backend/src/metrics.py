@@ -0,0 +1,195 @@
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .config import settings
+
+SLOW_REQUEST_MS = settings.slow_request_ms
+SLOW_REQUEST_MAX_STATEMENTS = 50  # SQL statements kept per request for the slow log
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34)
+
+
+class _Metric:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...]):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _labels(self, values: tuple, extra: str = "") -> str:
+        pairs = [f'{name}="{value}"' for name, value in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter(_Metric):
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, *labels) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in self._values.items():
+                lines.append(f"{self.name}{self._labels(labels)} {value}")
+        return lines
+
+
+class Histogram(_Metric):
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = buckets
+        # labels -> [count per bucket..., +Inf count, sum]
+        self._values: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        with self._lock:
+            data = self._values.get(labels)
+            if data is None:
+                data = self._values[labels] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data[i] += 1
+                    break
+            else:
+                data[len(self.buckets)] += 1
+            data[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, data in self._values.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets + ("+Inf",), data[:-1]):
+                    cumulative += count
+                    le = f'le="{bound}"'
+                    lines.append(f"{self.name}_bucket{self._labels(labels, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{self._labels(labels)} {data[-1]}")
+                lines.append(f"{self.name}_count{self._labels(labels)} {cumulative}")
+        return lines
+
+
+REQUEST_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency", ("method", "route", "status"))
+DB_STATEMENTS = Histogram("db_statements_per_request", "SQL statements executed per request", ("route",), COUNT_BUCKETS)
+DB_TIME = Histogram("db_time_per_request_seconds", "Time spent executing SQL per request", ("route",))
+POOL_CHECKOUT_WAIT = Histogram("db_pool_checkout_wait_seconds", "Time waiting for a pooled connection", ("pool",))
+POOL_CHECKOUT_TIMEOUTS = Counter("db_pool_checkout_timeouts_total", "Pool checkouts that timed out", ("pool",))
+CACHE_LOOKUPS = Counter("cache_lookups_total", "Read-through cache lookups by key namespace", ("namespace", "result"))
+RATE_LIMITED = Counter("rate_limited_requests_total", "Requests rejected by the rate limiter", ("scope",))
+
+METRICS = [REQUEST_LATENCY, DB_STATEMENTS, DB_TIME, POOL_CHECKOUT_WAIT, POOL_CHECKOUT_TIMEOUTS, CACHE_LOOKUPS, RATE_LIMITED]
+
+
+@dataclass
+class RequestStats:
+    statements: int = 0
+    db_time: float = 0.0
+    sql: list[str] = field(default_factory=list)
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # On the execution context, not the connection: a statement that raises never
+    # reaches after_cursor_execute, and its start is dropped along with the context
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    start = getattr(context, "_query_start", None)
+    if stats is None or start is None:
+        return
+    elapsed = time.perf_counter() - start
+    stats.statements += 1
+    stats.db_time += elapsed
+    if SLOW_REQUEST_MS and len(stats.sql) < SLOW_REQUEST_MAX_STATEMENTS:
+        stats.sql.append(f"[{elapsed * 1000:.1f}ms] {statement}")
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count and time every statement on `engine` against the current request."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def timed_pool_class(pool_class: type, label: str) -> type:
+    """Subclass of `pool_class` that records how long checkouts wait for a connection."""
+    class TimedPool(pool_class):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            except Exception:
+                POOL_CHECKOUT_TIMEOUTS.inc(1, label)
+                raise
+            finally:
+                POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start, label)
+
+    TimedPool.__name__ = f"Timed{pool_class.__name__}"
+    return TimedPool
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware) so streaming responses are
+    untouched. Routes are labelled by their path template to bound cardinality.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_stats.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_LATENCY.observe(elapsed, scope["method"], route, status_code)
+            DB_STATEMENTS.observe(stats.statements, route)
+            DB_TIME.observe(stats.db_time, route)
+            if SLOW_REQUEST_MS and elapsed * 1000 >= SLOW_REQUEST_MS:
+                logging.warning(
+                    "Slow request %s %s took %.0fms (%s statements, %.0fms in SQL):\n%s",
+                    scope["method"], route, elapsed * 1000, stats.statements, stats.db_time * 1000, "\n".join(stats.sql)
+                )
+
+
+def render_metrics(pool_gauges: dict[str, Engine] | None = None) -> str:
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    if pool_gauges:
+        lines.append("# HELP db_pool_checked_out Connections currently checked out")
+        lines.append("# TYPE db_pool_checked_out gauge")
+        for label, engine in pool_gauges.items():
+            lines.append(f'db_pool_checked_out{{pool="{label}"}} {engine.pool.checkedout()}')
+    return "\n".join(lines) + "\n"
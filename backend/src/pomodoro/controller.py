@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Query, status
+from typing import Annotated
+
+from ..database.core import AsyncDbSession
+from . import models
+from . import service
+from ..auth.service import CurrentUser
+
+router = APIRouter(
+    prefix="/pomodoro",
+    tags=["Pomodoro"]
+)
+
+@router.post("/sessions", response_model=models.PomodoroSessionBatchResponse, status_code=status.HTTP_201_CREATED)
+async def log_sessions(db: AsyncDbSession, request: models.PomodoroSessionBatch, current_user: CurrentUser):
+    return await service.log_sessions(current_user, db, request)
+
+@router.get("/stats", response_model=models.PomodoroStats)
+async def get_stats(db: AsyncDbSession, current_user: CurrentUser, days: Annotated[int, Query(ge=1, le=366)] = 90):
+    return await service.get_stats(current_user, db, days)
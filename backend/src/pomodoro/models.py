@@ -0,0 +1,52 @@
+from datetime import date, datetime, timezone
+from typing import List
+from uuid import UUID
+from pydantic import BaseModel, Field, field_validator, model_validator
+from src.entities.todo import Status
+
+class PomodoroSessionCreate(BaseModel):
+    todo_id: UUID
+    started_at: datetime
+    ended_at: datetime
+
+    @field_validator('started_at', 'ended_at')
+    @classmethod
+    def to_utc(cls, value: datetime) -> datetime:
+        # Naive times are taken as UTC, so a mix of naive and aware ones still compares
+        return value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+    @model_validator(mode='after')
+    def check_order(self):
+        if self.ended_at <= self.started_at:
+            raise ValueError("ended_at must be after started_at")
+        return self
+
+# Request model for appending sessions, e.g. replayed by an offline client
+class PomodoroSessionBatch(BaseModel):
+    sessions: List[PomodoroSessionCreate] = Field(min_length=1, max_length=1000)
+
+# Response model for appending sessions
+class PomodoroSessionBatchResponse(BaseModel):
+    inserted_count: int
+    failed_sessions: List[dict] = []  # Sessions whose todo doesn't exist for this user
+
+class DailyStat(BaseModel):
+    day: date
+    session_count: int
+    focus_minutes: float
+
+class WeeklyStat(BaseModel):
+    week_start: date
+    session_count: int
+    focus_minutes: float
+
+class StatusStat(BaseModel):
+    status: Status
+    session_count: int
+    focus_minutes: float
+
+class PomodoroStats(BaseModel):
+    days: int
+    daily: List[DailyStat]
+    weekly: List[WeeklyStat]
+    by_status: List[StatusStat]
@@ -0,0 +1,106 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+from . import models
+from src.auth.models import TokenData
+from src.entities.pomodoro import PomodoroSession, PomodoroDailyRollup
+from src.entities.todo import Todo, Status
+import logging
+
+def _utc_day(value: datetime) -> date:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+def _focus_minutes(seconds: int) -> float:
+    return round(seconds / 60, 1)
+
+async def log_sessions(current_user: TokenData, db: AsyncSession, request: models.PomodoroSessionBatch) -> models.PomodoroSessionBatchResponse:
+    """
+    Append sessions with one multi-row insert and fold them into the daily
+    rollups with one upsert, all in a single transaction.
+    """
+    user_id = current_user.get_uuid()
+    todo_ids = list({session.todo_id for session in request.sessions})
+    statuses = dict((await db.execute(
+        select(Todo.id, Todo.status).where(Todo.id.in_(todo_ids)).where(Todo.user_id == user_id)
+    )).all())
+
+    rows = []
+    failed = []
+    rollups: dict[tuple[date, Status], list[int]] = defaultdict(lambda: [0, 0])
+    for session in request.sessions:
+        status = statuses.get(session.todo_id)
+        if status is None:
+            failed.append({"todo_id": str(session.todo_id), "error": "Todo not found"})
+            continue
+        rows.append({
+            "user_id": user_id,
+            "todo_id": session.todo_id,
+            "started_at": session.started_at,
+            "ended_at": session.ended_at,
+        })
+        totals = rollups[(_utc_day(session.started_at), status)]
+        totals[0] += 1
+        totals[1] += int((session.ended_at - session.started_at).total_seconds())
+
+    if rows:
+        # Sorted so concurrent inserts lock rollup rows in the same order
+        upsert = pg_insert(PomodoroDailyRollup).values([
+            {"user_id": user_id, "day": day, "status": status, "session_count": count, "focus_seconds": seconds}
+            for (day, status), (count, seconds) in sorted(rollups.items(), key=lambda item: (item[0][0], item[0][1].value))
+        ])
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[PomodoroDailyRollup.user_id, PomodoroDailyRollup.day, PomodoroDailyRollup.status],
+            set_={
+                "session_count": PomodoroDailyRollup.session_count + upsert.excluded.session_count,
+                "focus_seconds": PomodoroDailyRollup.focus_seconds + upsert.excluded.focus_seconds,
+            },
+        )
+        try:
+            await db.execute(insert(PomodoroSession), rows)
+            await db.execute(upsert)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logging.error("Failed to log pomodoro sessions for user %s. Error: %s", user_id, e)
+            raise HTTPException(status_code=500, detail="Failed to log pomodoro sessions")
+
+    logging.info("Logged %s pomodoro sessions for user %s", len(rows), user_id)
+    return models.PomodoroSessionBatchResponse(inserted_count=len(rows), failed_sessions=failed)
+
+async def get_stats(current_user: TokenData, db: AsyncSession, days: int) -> models.PomodoroStats:
+    """
+    Serve daily, weekly and per-status focus totals from the rollup rows, so
+    the cost is bounded by the number of days and never scans raw sessions.
+    """
+    user_id = current_user.get_uuid()
+    since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+    rollups = (await db.execute(
+        select(PomodoroDailyRollup.day, PomodoroDailyRollup.status, PomodoroDailyRollup.session_count, PomodoroDailyRollup.focus_seconds)
+        .where(PomodoroDailyRollup.user_id == user_id)
+        .where(PomodoroDailyRollup.day >= since)
+        .order_by(PomodoroDailyRollup.day)
+    )).all()
+
+    daily: dict[date, list[int]] = defaultdict(lambda: [0, 0])
+    weekly: dict[date, list[int]] = defaultdict(lambda: [0, 0])
+    by_status: dict[Status, list[int]] = defaultdict(lambda: [0, 0])
+    for day, status, session_count, focus_seconds in rollups:
+        for totals in (daily[day], weekly[day - timedelta(days=day.weekday())], by_status[status]):
+            totals[0] += session_count
+            totals[1] += focus_seconds
+
+    logging.info("Retrieved %s-day pomodoro stats for user %s", days, user_id)
+    return models.PomodoroStats(
+        days=days,
+        daily=[models.DailyStat(day=day, session_count=count, focus_minutes=_focus_minutes(seconds))
+               for day, (count, seconds) in daily.items()],
+        weekly=[models.WeeklyStat(week_start=week, session_count=count, focus_minutes=_focus_minutes(seconds))
+                for week, (count, seconds) in weekly.items()],
+        by_status=[models.StatusStat(status=status, session_count=count, focus_minutes=_focus_minutes(seconds))
+                   for status, (count, seconds) in by_status.items()],
+    )
@@ -0,0 +1,155 @@
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from fastapi import Request
+from .config import settings
+from .exceptions import RateLimitExceededError
+from .metrics import RATE_LIMITED
+from .redis_client import redis_client
+
+RATE_LIMIT_ENABLED = settings.rate_limit_enabled
+RATE_LIMIT_URL = settings.rate_limit_url
+RATE_LIMIT_MAX_KEYS = 100000  # In-process store only; stale windows are swept past this size
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    requests: int
+    window: int  # seconds
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """'10/minute', '100/hour' or '5/30' (requests per seconds)."""
+        count, _, per = value.partition("/")
+        seconds = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}.get(per.strip().lower())
+        return cls(int(count), seconds if seconds is not None else int(per))
+
+
+# Per-route limits; client IP limits stop bursts from one source, the email
+# limit stops credential stuffing spread over many sources.
+LOGIN_IP_LIMIT = RateLimit.parse(settings.rate_limit_login_ip)
+LOGIN_EMAIL_LIMIT = RateLimit.parse(settings.rate_limit_login_email)
+REGISTER_IP_LIMIT = RateLimit.parse(settings.rate_limit_register_ip)
+REFRESH_IP_LIMIT = RateLimit.parse(settings.rate_limit_refresh_ip)
+CHANGE_PASSWORD_USER_LIMIT = RateLimit.parse(settings.rate_limit_change_password_user)
+
+
+class CounterStore(ABC):
+    """Fixed-window counters; the limiter weights two adjacent windows into a sliding one."""
+
+    @abstractmethod
+    async def hit(self, key: str, window: int, index: int) -> tuple[int, int]:
+        """Count a request in window `index` and return (current window count, previous window count)."""
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryCounterStore(CounterStore):
+    """
+    Per-process counters. With several workers each would allow the full
+    limit, so src.server refuses to start more than one without RATE_LIMIT_URL.
+    """
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self._max_keys = max_keys
+        # key -> [window index, current count, previous count]
+        self._counters: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+
+    async def hit(self, key: str, window: int, index: int) -> tuple[int, int]:
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                if len(self._counters) >= self._max_keys:
+                    self._sweep()
+                counter = self._counters[key] = [index, 0, 0]
+            elif counter[0] != index:
+                # Roll forward; the old count only carries over into the very next window
+                counter[2] = counter[1] if counter[0] == index - 1 else 0
+                counter[0], counter[1] = index, 0
+            counter[1] += 1
+            return counter[1], counter[2]
+
+    def _sweep(self) -> None:
+        # Keys end in their window length; a counter two windows old no longer affects any decision
+        now = time.time()
+        self._counters = {
+            key: counter for key, counter in self._counters.items()
+            if (counter[0] + 2) * int(key.rsplit(":", 1)[1]) > now
+        }
+        if len(self._counters) >= self._max_keys:
+            # Still full of live keys (e.g. a spray from many IPs): drop the oldest quarter
+            for key in list(self._counters)[:self._max_keys // 4]:
+                del self._counters[key]
+
+
+class RedisCounterStore(CounterStore):
+    """
+    One INCR per request plus a GET of the previous window, pipelined into a
+    single round trip.
+    """
+    KEY_PREFIX = "pomokan:ratelimit:"
+
+    def __init__(self, client):
+        self._client = client
+
+    async def hit(self, key: str, window: int, index: int) -> tuple[int, int]:
+        current_key = f"{self.KEY_PREFIX}{key}:{index}"
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.incr(current_key)
+            pipe.expire(current_key, window * 2)
+            pipe.get(f"{self.KEY_PREFIX}{key}:{index - 1}")
+            current, _, previous = await pipe.execute()
+        return int(current), int(previous or 0)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class RateLimiter:
+    """Sliding-window limiter: the previous window's count is weighted by how much of it still overlaps."""
+
+    def __init__(self, store: CounterStore, enabled: bool = RATE_LIMIT_ENABLED):
+        self.store = store
+        self.enabled = enabled
+
+    async def hit(self, scope: str, key: str, limit: RateLimit) -> None:
+        """Count a request for `key` under `scope`; raises RateLimitExceededError once over the limit."""
+        if not self.enabled:
+            return
+        now = time.time()
+        index = int(now // limit.window)
+        elapsed = now - index * limit.window
+        try:
+            current, previous = await self.store.hit(f"{scope}:{key}:{limit.window}", limit.window, index)
+        except Exception as e:
+            # Fail open: an unavailable counter store must not lock everyone out
+            logging.error("Rate limit store failed for %s: %s", scope, e)
+            return
+        estimated = previous * (limit.window - elapsed) / limit.window + current
+        if estimated > limit.requests:
+            RATE_LIMITED.inc(1, scope)
+            logging.warning("Rate limit exceeded for %s by %s", scope, key)
+            raise RateLimitExceededError(retry_after=math.ceil(limit.window - elapsed))
+
+    def limit(self, scope: str, limit: RateLimit):
+        """FastAPI dependency limiting a route per client IP; runs before the handler body."""
+        async def dependency(request: Request) -> None:
+            await self.hit(scope, client_ip(request), limit)
+        return dependency
+
+    async def close(self) -> None:
+        await self.store.close()
+
+
+def client_ip(request: Request) -> str:
+    # The X-Forwarded-For client only when the peer is in FORWARDED_ALLOW_IPS; otherwise
+    # the proxy's own address, which would put every client behind it in one bucket
+    return request.client.host if request.client else "unknown"
+
+
+limiter = RateLimiter(RedisCounterStore(redis_client(RATE_LIMIT_URL)) if RATE_LIMIT_URL else InMemoryCounterStore())
@@ -0,0 +1,157 @@
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, suppress
+from typing import AsyncIterator
+from uuid import UUID
+from ..config import settings
+from ..redis_client import redis_client
+
+EVENT_BUS_URL = settings.event_bus_url
+SUBSCRIBER_QUEUE_SIZE = settings.subscriber_queue_size
+
+# Sent instead of further events once a subscriber falls behind; the client
+# should reload through GET /todos/changes.
+RESYNC_EVENT = {"type": "resync"}
+
+
+class EventBus(ABC):
+    """Per-user publish/subscribe of board events."""
+
+    def has_subscribers(self, user_id: UUID) -> bool:
+        # Subscribers may live in other workers unless the bus knows better
+        return True
+
+    @abstractmethod
+    async def publish(self, user_id: UUID, event: dict) -> None:
+        ...
+
+    @abstractmethod
+    def subscribe(self, user_id: UUID) -> AbstractAsyncContextManager[asyncio.Queue]:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryEventBus(EventBus):
+    """
+    Fans events out to subscribers of this process only. Each subscriber has
+    a bounded queue so one slow connection can't grow memory without limit.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self._queue_size = queue_size
+        self._subscribers: dict[UUID, set[asyncio.Queue]] = {}
+
+    def has_subscribers(self, user_id: UUID) -> bool:
+        return user_id in self._subscribers
+
+    def deliver_all(self, event: dict) -> None:
+        for user_id in list(self._subscribers):
+            self.deliver(user_id, event)
+
+    def deliver(self, user_id: UUID, event: dict) -> None:
+        for queue in self._subscribers.get(user_id, ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logging.warning("Event subscriber for user %s is lagging, requesting resync", user_id)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC_EVENT)
+
+    async def publish(self, user_id: UUID, event: dict) -> None:
+        self.deliver(user_id, event)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: UUID) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(user_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[user_id]
+
+
+class RedisEventBus(EventBus):
+    """
+    Publishes through Redis pub/sub so every worker sees every event. Each
+    worker holds one pattern subscription and fans out locally, so the Redis
+    connection count doesn't grow with the number of clients.
+    """
+    CHANNEL_PREFIX = "pomokan:todos:"
+    RECONNECT_DELAY = 1  # seconds, doubled after every failed attempt up to RECONNECT_DELAY_MAX
+    RECONNECT_DELAY_MAX = 30
+
+    def __init__(self, client):
+        self._client = client
+        self._local = InMemoryEventBus()
+        self._listener: asyncio.Task | None = None
+
+    async def publish(self, user_id: UUID, event: dict) -> None:
+        await self._client.publish(f"{self.CHANNEL_PREFIX}{user_id}", json.dumps(event))
+
+    async def _listen(self) -> None:
+        """
+        Relay the pattern subscription to local subscribers until cancelled.
+        A lost connection is retried with backoff; events published while it
+        was down are gone, so every local subscriber is told to resync.
+        """
+        delay = self.RECONNECT_DELAY
+        resync = False
+        while True:
+            pubsub = self._client.pubsub()
+            try:
+                await pubsub.psubscribe(f"{self.CHANNEL_PREFIX}*")
+                if resync:
+                    self._local.deliver_all(RESYNC_EVENT)
+                delay = self.RECONNECT_DELAY
+                async for message in pubsub.listen():
+                    if message["type"] == "pmessage":
+                        self._relay(message)
+            except Exception as e:
+                logging.error("Event bus subscription lost, reconnecting in %ss: %s", delay, e)
+            finally:
+                with suppress(Exception):
+                    await pubsub.aclose()
+            resync = True
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.RECONNECT_DELAY_MAX)
+
+    def _relay(self, message: dict) -> None:
+        channel = message["channel"]
+        if isinstance(channel, bytes):
+            channel = channel.decode(errors="replace")
+        try:
+            user_id = UUID(channel.removeprefix(self.CHANNEL_PREFIX))
+            if self._local.has_subscribers(user_id):
+                self._local.deliver(user_id, json.loads(message["data"]))
+        except ValueError as e:  # Covers JSONDecodeError and UnicodeDecodeError
+            logging.warning("Skipping malformed event on channel %s: %s", channel, e)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: UUID) -> AsyncIterator[asyncio.Queue]:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        async with self._local.subscribe(user_id) as queue:
+            yield queue
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+        await self._client.aclose()
+
+
+_event_bus: EventBus | None = None
+
+def get_event_bus() -> EventBus:
+    global _event_bus
+    if _event_bus is None:
+        _event_bus = RedisEventBus(redis_client(EVENT_BUS_URL)) if EVENT_BUS_URL else InMemoryEventBus()
+    return _event_bus
@@ -0,0 +1,25 @@
+import asyncio
+import json
+import logging
+from typing import AsyncIterator
+from uuid import UUID
+from .bus import get_event_bus
+
+HEARTBEAT_SECONDS = 15  # Keeps idle connections open through proxies
+
+async def event_stream(user_id: UUID) -> AsyncIterator[str]:
+    """
+    Server-sent events for one connection. Idle connections cost one queue
+    and one suspended generator; Starlette cancels the generator when the
+    client disconnects, which unsubscribes it.
+    """
+    async with get_event_bus().subscribe(user_id) as queue:
+        logging.debug("Event stream opened for user %s", user_id)
+        yield ": connected\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
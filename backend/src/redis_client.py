@@ -0,0 +1,9 @@
+import redis.asyncio as redis
+
+
+def redis_client(url: str) -> redis.Redis:
+    """
+    Client for CACHE_URL, EVENT_BUS_URL or RATE_LIMIT_URL. The Redis backends
+    take any client exposing the redis.asyncio API, e.g. a fakeredis stand-in.
+    """
+    return redis.from_url(url)
@@ -0,0 +1,54 @@
+"""
+Production entry point: `python -m src.server`.
+
+Runs WEB_CONCURRENCY uvicorn workers under uvicorn's process manager, which
+restarts crashed workers and drains in-flight requests on SIGTERM. Workers
+are separate interpreters that import the app themselves; this supervisor
+never imports it, so no engine, pool or event loop crosses a fork.
+
+The cache, event bus, rate limiter and write-behind buffer keep their state
+in process unless pointed at Redis. Several workers would then serve stale
+cached boards, miss each other's SSE events and multiply every rate limit,
+so more than one worker is refused until those are shared.
+"""
+import uvicorn
+
+from .config import settings
+
+
+def _unshared_state() -> list[str]:
+    """Settings that must change before several workers can run side by side."""
+    problems = []
+    if not settings.cache_url:
+        problems.append("CACHE_URL (each worker would serve its own stale cache)")
+    if not settings.event_bus_url:
+        problems.append("EVENT_BUS_URL (SSE clients would miss events published by other workers)")
+    if settings.rate_limit_enabled and not settings.rate_limit_url:
+        problems.append("RATE_LIMIT_URL (every limit would be multiplied by the worker count)")
+    if settings.write_behind_mode == "async":
+        problems.append("WRITE_BEHIND_MODE=group or off (async buffers are invisible to other workers)")
+    return problems
+
+
+def main() -> None:
+    problems = _unshared_state() if settings.web_concurrency > 1 else []
+    if problems:
+        raise SystemExit(
+            f"WEB_CONCURRENCY={settings.web_concurrency} needs shared state; set "
+            + "; ".join(problems)
+            + ", or run a single worker."
+        )
+    uvicorn.run(
+        "src.main:app",
+        host=settings.host,
+        port=settings.port,
+        workers=settings.web_concurrency,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.forwarded_allow_ips,
+        timeout_graceful_shutdown=settings.graceful_shutdown_seconds,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,49 +1,157 @@
-from fastapi import APIRouter, status
-from typing import List
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import Annotated, List, Literal, Optional
 from uuid import UUID
 
-from ..database.core import DbSession
+from ..database.core import AsyncDbSession
 from . import models
 from . import service
-from ..auth.service import CurrentUser
+from ..auth.service import CurrentUser, StreamUser
+from ..realtime.service import event_stream
 
 router = APIRouter(
     prefix="/todos",
     tags=["Todos"]
 )
 
+def _not_modified(request: Request, etag: str) -> bool:
+    """Weak If-None-Match comparison, as RFC 9110 requires for GET."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
 @router.post("/", response_model=models.TodoResponse, status_code=status.HTTP_201_CREATED)
-def create_todo(db: DbSession, todo: models.TodoCreate, current_user: CurrentUser):
-    return service.create_todo(current_user, todo, db)
+async def create_todo(db: AsyncDbSession, todo: models.TodoCreate, current_user: CurrentUser):
+    return await service.create_todo(current_user, todo, db)
 
 @router.get("/", response_model=List[models.TodoResponse])
-def get_todos(db: DbSession, current_user: CurrentUser):
-    return service.get_todos(current_user, db)
+async def get_todos(
+    request: Request,
+    db: AsyncDbSession,
+    current_user: CurrentUser,
+    filters: Annotated[models.TodoFilters, Depends()]
+):
+    etag = await service.get_collection_etag(current_user, db, request.url.query)
+    if _not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    body = await service.get_todos_json(current_user, db, filters, request.url.query)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+@router.get("/changes", response_model=models.TodoChanges)
+async def get_changes(db: AsyncDbSession, current_user: CurrentUser, since: Optional[str] = None):
+    return await service.get_changes(current_user, db, since)
+
+@router.get("/page", response_model=models.TodoPage)
+async def get_todo_page(
+    db: AsyncDbSession,
+    current_user: CurrentUser,
+    filters: Annotated[models.TodoFilters, Depends()],
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+    cursor: Optional[str] = None
+):
+    page = await service.get_todo_page(current_user, db, filters, limit, cursor)
+    return Response(content=page.model_dump_json(), media_type="application/json")
+
+@router.get("/export")
+async def export_todos(
+    current_user: CurrentUser,
+    filters: Annotated[models.TodoFilters, Depends()],
+    format: Literal["ndjson", "csv"] = "ndjson"
+):
+    if format == "csv":
+        return StreamingResponse(
+            service.stream_todos(current_user, filters, format),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="todos.csv"'}
+        )
+    return StreamingResponse(service.stream_todos(current_user, filters), media_type="application/x-ndjson")
+
+@router.post("/import", response_model=models.ImportResult, status_code=status.HTTP_201_CREATED)
+async def import_todos(request: Request, db: AsyncDbSession, current_user: CurrentUser, format: Literal["csv", "ndjson"] = "csv"):
+    # The raw body is streamed, never read into memory whole
+    return await service.import_todos(current_user, db, request.stream(), format)
+
+@router.get("/archive", response_model=models.TodoPage)
+async def get_archived_todos(
+    db: AsyncDbSession,
+    current_user: CurrentUser,
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+    cursor: Optional[str] = None
+):
+    page = await service.get_archived_todos(current_user, db, limit, cursor)
+    return Response(content=page.model_dump_json(), media_type="application/json")
+
+@router.get("/search", response_model=models.TodoPage)
+async def search_todos(
+    db: AsyncDbSession,
+    current_user: CurrentUser,
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    filters: Annotated[models.TodoFilters, Depends()],
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: Optional[str] = None
+):
+    page = await service.search_todos(current_user, db, q, filters, limit, cursor)
+    return Response(content=page.model_dump_json(), media_type="application/json")
+
+@router.get("/events")
+async def stream_events(current_user: StreamUser):
+    return StreamingResponse(
+        event_stream(current_user.get_uuid()),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.delete("/delete-batch", status_code=status.HTTP_204_NO_CONTENT)
-def delete_todo(db: DbSession, request: models.BatchDeleteRequest, current_user: CurrentUser):
-    service.batch_delete_todos(current_user, db, request)
+async def delete_todo(db: AsyncDbSession, request: models.BatchDeleteRequest, current_user: CurrentUser):
+    await service.batch_delete_todos(current_user, db, request)
+
+@router.post("/bulk", response_model=models.BulkTodoResponse, status_code=status.HTTP_201_CREATED)
+async def bulk_create_todos(db: AsyncDbSession, request: models.BulkCreateRequest, current_user: CurrentUser):
+    return await service.bulk_create_todos(current_user, db, request)
+
+@router.patch("/bulk", response_model=models.BulkTodoResponse)
+async def bulk_update_todos(db: AsyncDbSession, request: models.BulkUpdateRequest, current_user: CurrentUser):
+    return await service.bulk_update_todos(current_user, db, request)
+
+@router.put("/bulk/complete", response_model=models.BulkTodoResponse)
+async def bulk_complete_todos(db: AsyncDbSession, request: models.BulkCompleteRequest, current_user: CurrentUser):
+    return await service.bulk_complete_todos(current_user, db, request)
+
+@router.post("/increment-pomodoro-batch", response_model=models.BatchIncrementResponse)
+async def batch_increment_pomodoro_counts(db: AsyncDbSession, request: models.BatchIncrementRequest, current_user: CurrentUser):
+    return await service.batch_increment_pomodoro_counts(current_user, db, request)
 
 @router.get("/{todo_id}", response_model=models.TodoResponse)
-def get_todo_by_id(db: DbSession, todo_id: UUID, current_user: CurrentUser):
-    return service.get_todo_by_id(current_user, todo_id, db)
+async def get_todo_by_id(request: Request, response: Response, db: AsyncDbSession, todo_id: UUID, current_user: CurrentUser):
+    todo = await service.get_todo_by_id(current_user, todo_id, db)
+    etag = service.get_todo_etag(todo)
+    if _not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return todo
 
 @router.put("/{todo_id}", response_model=models.TodoResponse)
-def update_todo(db: DbSession, todo_id: UUID, todo_update: models.TodoCreate, current_user: CurrentUser):
-    return service.update_todo(current_user, db, todo_id, todo_update)
+async def update_todo(db: AsyncDbSession, todo_id: UUID, todo_update: models.TodoCreate, current_user: CurrentUser):
+    return await service.update_todo(current_user, db, todo_id, todo_update)
 
 @router.put("/{todo_id}/complete", response_model=models.TodoResponse)
-def complete_todo(db: DbSession, todo_id: UUID, current_user: CurrentUser):
-    return service.complete_todo(current_user, db, todo_id)
+async def complete_todo(db: AsyncDbSession, todo_id: UUID, current_user: CurrentUser):
+    return await service.complete_todo(current_user, db, todo_id)
+
+@router.put("/{todo_id}/move", response_model=models.TodoResponse)
+async def move_todo(db: AsyncDbSession, todo_id: UUID, move: models.TodoMove, current_user: CurrentUser):
+    return await service.move_todo(current_user, db, todo_id, move)
 
 @router.put("/{todo_id}/increment-pomodoro", response_model=models.TodoResponse)
-def increment_pomodoro_count(db: DbSession, todo_id: UUID, current_user: CurrentUser):
-    return service.increment_pomodoro_count(current_user, db, todo_id)
+async def increment_pomodoro_count(db: AsyncDbSession, todo_id: UUID, current_user: CurrentUser):
+    return await service.increment_pomodoro_count(current_user, db, todo_id)
 
 @router.delete("/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_todo(db: DbSession, todo_id: UUID, current_user: CurrentUser):
-    service.delete_todo(current_user, db, todo_id)
+async def delete_todo(db: AsyncDbSession, todo_id: UUID, current_user: CurrentUser):
+    await service.delete_todo(current_user, db, todo_id)
 
 @router.patch("/{todo_id}", response_model=models.TodoResponse)
-def patch_todo(db: DbSession, todo_id: UUID, todo_update: models.TodoUpdate, current_user: CurrentUser):
-    return service.patch_todo(current_user, db, todo_id, todo_update)
\ No newline at end of file
+async def patch_todo(db: AsyncDbSession, todo_id: UUID, todo_update: models.TodoUpdate, current_user: CurrentUser):
+    return await service.patch_todo(current_user, db, todo_id, todo_update)
\ No newline at end of file
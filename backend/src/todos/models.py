@@ -1,7 +1,8 @@
 from datetime import datetime
+from decimal import Decimal
 from typing import List, Optional
 from uuid import UUID
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from src.entities.todo import Status
 
 class TodoBase(BaseModel):
@@ -19,9 +20,14 @@ class TodoResponse(TodoBase):
     pomodoro_count: int = 0
     is_completed: bool
     completed_at: Optional[datetime] | None
+    updated_at: Optional[datetime] = None
+    rank: Optional[Decimal] = None
 
     model_config = ConfigDict(from_attributes=True)
 
+# Built once: validates a whole list of column rows in one call and dumps it straight to JSON bytes
+TodoResponseList = TypeAdapter(List[TodoResponse])
+
 class TodoUpdate(BaseModel):
     description: Optional[str] = None
     due_date: Optional[datetime] = None
@@ -29,6 +35,55 @@ class TodoUpdate(BaseModel):
     is_important: Optional[bool] = None
     is_urgent: Optional[bool] = None
 
+# Request model for moving a card on the board: `after_id` is the card it is
+# dropped directly below, or None for the top of the `status` column
+class TodoMove(BaseModel):
+    status: Status
+    after_id: Optional[UUID] = None
+
+# Query filters shared by the list, page and export endpoints
+class TodoFilters(BaseModel):
+    status: Optional[Status] = None
+    is_completed: Optional[bool] = None
+    is_important: Optional[bool] = None
+    is_urgent: Optional[bool] = None
+    due_after: Optional[datetime] = None
+    due_before: Optional[datetime] = None
+
+# Response model for keyset pagination: by (created_at, id) desc for /page, by relevance for /search
+class TodoPage(BaseModel):
+    items: List[TodoResponse]
+    next_cursor: Optional[str] = None
+
+# Response model for delta sync: pass `cursor` back as `since` on the next poll
+class TodoChanges(BaseModel):
+    changed: List[TodoResponse]
+    deleted: List[UUID]
+    cursor: str
+
+# Bulk request/response models: one transaction per request, errors reported per item
+class BulkCreateRequest(BaseModel):
+    todos: List[TodoCreate] = Field(min_length=1, max_length=500)
+
+class TodoBulkUpdateItem(TodoUpdate):
+    id: UUID
+
+class BulkUpdateRequest(BaseModel):
+    updates: List[TodoBulkUpdateItem] = Field(min_length=1, max_length=500)
+
+class BulkCompleteRequest(BaseModel):
+    todo_ids: List[UUID] = Field(min_length=1, max_length=500)
+
+class BulkTodoResponse(BaseModel):
+    todos: List[TodoResponse]
+    failed_items: List[dict] = []  # {"todo_id"/"index": ..., "error": ...} per rejected item
+
+# Response model for a streamed import; `errors` lists the first rejected rows
+class ImportResult(BaseModel):
+    imported: int
+    failed_rows: int = 0
+    errors: List[dict] = []  # {"row": 1-based record number, "error": ...}
+
 # Request model for batch delete
 class BatchDeleteRequest(BaseModel):
     todo_ids: List[UUID]
@@ -37,4 +92,17 @@ class BatchDeleteRequest(BaseModel):
 class BatchDeleteResponse(BaseModel):
     deleted_count: int
     failed_deletions: List[dict] = []  # For IDs that couldn't be deleted
-    message: str
\ No newline at end of file
+    message: str
+
+# Request model for batch pomodoro increments, e.g. replayed by an offline client
+class PomodoroIncrement(BaseModel):
+    todo_id: UUID
+    count: int = Field(default=1, ge=1)
+
+class BatchIncrementRequest(BaseModel):
+    increments: List[PomodoroIncrement] = Field(min_length=1, max_length=500)
+
+# Response model for batch pomodoro increments
+class BatchIncrementResponse(BaseModel):
+    todos: List[TodoResponse]
+    failed_increments: List[dict] = []  # For IDs that are missing or already completed
\ No newline at end of file
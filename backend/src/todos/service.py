@@ -1,128 +1,1158 @@
-from datetime import datetime, timezone
+import asyncio
+import base64
+import codecs
+import csv
+import hashlib
+import io
+import json
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import AsyncIterator, Literal
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, case, delete, func, insert, literal, select, text, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 from sqlalchemy.exc import OperationalError
 from fastapi import HTTPException
+from pydantic import ValidationError
 from . import models
+from .write_buffer import PendingWrite, WriteBuffer
 from src.auth.models import TokenData
-from src.entities.todo import Todo
-from src.exceptions import TodoCreationError, TodoNotFoundError
+from src.cache import cached, invalidate
+from src.config import settings
+from src.database.core import AsyncSessionLocal
+from src.database.types import UTCDateTime
+from src.entities.pomodoro import PomodoroSession
+from src.entities.todo import ArchivedTodo, Todo, TodoTombstone, Status
+from src.entities.user import User
+from src.realtime.bus import get_event_bus
+from src.exceptions import TodoCreationError, TodoNotFoundError, InvalidCursorError, InvalidMoveError, SyncCursorExpiredError, InvalidImportError, ImportTooLargeError
 import logging
 
-def create_todo(current_user: TokenData, todo:models.TodoCreate, db: Session) -> Todo:
-    try: 
+EXPORT_BATCH_SIZE = 500
+EXPORT_CHUNK_BYTES = 64 * 1024  # Export lines are sent in chunks of about this size
+IMPORT_MAX_ROWS = settings.import_max_rows
+IMPORT_CHUNK_SIZE = 1000  # Rows validated and written per COPY / INSERT
+IMPORT_MAX_ERRORS = 100  # Rejected rows reported back in ImportResult.errors
+IMPORT_MAX_RECORD_CHARS = 1024 * 1024
+SEARCH_MAX_TERMS = 10
+TOMBSTONE_RETENTION_DAYS = settings.tombstone_retention_days
+TOMBSTONE_SWEEP_INTERVAL = settings.tombstone_sweep_interval
+TOMBSTONE_SWEEP_BATCH = 1000
+ARCHIVE_AFTER_DAYS = settings.archive_after_days
+ARCHIVE_BATCH_SIZE = settings.archive_batch_size
+ARCHIVE_INTERVAL = settings.archive_interval
+RANK_REBALANCE_DIGITS = settings.rank_rebalance_digits
+RANK_REBALANCE_INTERVAL = settings.rank_rebalance_interval
+# Re-send changes this close to the cursor so commits racing the previous poll aren't missed
+SYNC_OVERLAP = timedelta(seconds=1)
+
+# Exactly what TodoResponse needs, selected as plain rows so list endpoints skip
+# ORM identity-map bookkeeping and attribute-by-attribute validation
+TODO_RESPONSE_COLUMNS = tuple(getattr(Todo, name) for name in models.TodoResponse.model_fields)
+ARCHIVE_RESPONSE_COLUMNS = tuple(getattr(ArchivedTodo, name) for name in models.TodoResponse.model_fields)
+# Columns copied from todos into todo_archive; archived_at is stamped by the archiver
+ARCHIVE_COLUMNS = tuple(column.name for column in ArchivedTodo.__table__.columns if column.name != "archived_at")
+# Every stored column but the generated search_vector, in COPY order
+IMPORT_COLUMNS = tuple(column.name for column in Todo.__table__.columns if column.computed is None)
+
+# Board columns (user_id, status) whose ranks moves have made too long; drained by run_rank_rebalancer
+_rebalance_pending: set[tuple[UUID, Status]] = set()
+
+def _todos_cache_key(user_id: UUID) -> str:
+    return f"todos:{user_id}"
+
+async def _invalidate_todos(user_id: UUID) -> None:
+    """Drop every cached list and ETag of the user; call after each committed write."""
+    await invalidate(_todos_cache_key(user_id))
+
+async def _flush_buffered_writes(writes: list[PendingWrite]) -> None:
+    """
+    Apply a batch of coalesced writes in one transaction: every increment in a
+    single UPDATE ... CASE, every patch in one executemany UPDATE by id.
+    """
+    increments = {write.todo_id: write.increments for write in writes if write.increments}
+    patches = [{"id": write.todo_id, **write.changes} for write in writes if write.changes]
+    async with AsyncSessionLocal() as db:
+        if increments:
+            await db.execute(
+                update(Todo)
+                .where(Todo.id.in_(list(increments)))
+                .where(Todo.is_completed.is_(False))
+                .values(pomodoro_count=Todo.pomodoro_count + case(increments, value=Todo.id, else_=0))
+                .execution_options(synchronize_session=False)
+            )
+        if patches:
+            await db.execute(update(Todo), patches)
+        await db.commit()
+    logging.info("Flushed %s increments and %s patches", len(increments), len(patches))
+    for user_id in {write.user_id for write in writes}:
+        await _invalidate_todos(user_id)
+
+# Buffers increments and patches unless WRITE_BEHIND_MODE is off. Every other
+# operation on a user's todos calls flush_user first, so reads see the writes.
+write_buffer = WriteBuffer(_flush_buffered_writes)
+
+def _todo_state_loader(current_user: TokenData, todo_id: UUID, db: AsyncSession):
+    """Reads the row the write buffer starts from; raises for todos the user doesn't own."""
+    async def load() -> dict:
+        row = (await db.execute(
+            select(*TODO_RESPONSE_COLUMNS).where(Todo.id == todo_id).where(Todo.user_id == current_user.get_uuid())
+        )).first()
+        if row is None:
+            logging.warning("Todo %s not found for user %s", todo_id, current_user.get_uuid())
+            raise TodoNotFoundError(todo_id)
+        return row._asdict()
+    return load
+
+def _null_field_error(todo_data: dict) -> str | None:
+    """The error for a patch setting a NOT NULL column to null, which would fail the whole UPDATE."""
+    for field in ("description", "status", "is_important", "is_urgent"):
+        if field in todo_data and todo_data[field] is None:
+            return f"{field} cannot be null"
+    return None
+
+def _checked_changes(todo_data: dict) -> dict:
+    """
+    Reject patches the database would, with a 400 instead of a failed UPDATE.
+    Required before buffering, since an async-mode write can't fail its request later.
+    """
+    if error := _null_field_error(todo_data):
+        raise HTTPException(status_code=400, detail=error)
+    if "status" in todo_data:
+        if todo_data["status"] not in Status.__members__:
+            raise HTTPException(status_code=400, detail=f"Invalid status: {todo_data['status']}")
+        todo_data["status"] = Status[todo_data["status"]]
+    return todo_data
+
+async def _publish(user_id: UUID, event_type: str, todos: list[Todo] = (), deleted_ids: list[UUID] = (), **fields) -> None:
+    """
+    Notify the user's other tabs and devices; never fails the request.
+    `fields` go into the event as is, for events that summarize instead of listing todos.
+    """
+    bus = get_event_bus()
+    if not (todos or deleted_ids or fields) or not bus.has_subscribers(user_id):
+        return
+    event = {"type": event_type, **fields}
+    if todos:
+        event["todos"] = [models.TodoResponse.model_validate(todo).model_dump(mode="json") for todo in todos]
+    if deleted_ids:
+        event["deleted"] = [str(todo_id) for todo_id in deleted_ids]
+    try:
+        await bus.publish(user_id, event)
+    except Exception as e:
+        logging.warning("Failed to publish %s event for user %s: %s", event_type, user_id, e)
+
+def _top_rank(user_id: UUID, status: Status):
+    """
+    Rank just above the top card of a column, as a subquery the writing
+    statement evaluates itself. Aliased so an UPDATE of todos can't correlate it.
+    """
+    column = aliased(Todo)
+    return (
+        select(func.coalesce(func.min(column.rank), 1) - 1)
+        .where(column.user_id == user_id)
+        .where(column.status == status)
+        .scalar_subquery()
+    )
+
+async def _lock_board(db: AsyncSession, user_id: UUID) -> None:
+    """
+    Lock the user's row until commit before a write that ranks a card against
+    its column's other cards. Two such writes would otherwise read the same
+    top or neighbours and tie; the second now waits and sees the first card.
+    FOR NO KEY UPDATE leaves foreign key checks against users unblocked.
+    """
+    await db.execute(select(User.id).where(User.id == user_id).with_for_update(key_share=True))
+
+def _status_rank(user_id: UUID, status: Status):
+    """UPDATE value for rank when setting `status`: unchanged within a column, on top of a new one."""
+    return case((Todo.status == status, Todo.rank), else_=_top_rank(user_id, status))
+
+def _completion(status: Status) -> dict:
+    """UPDATE values keeping is_completed and completed_at in step with `status`; a completed todo keeps its completed_at."""
+    if status == Status.completed:
+        return {"is_completed": True, "completed_at": func.coalesce(Todo.completed_at, literal(datetime.now(timezone.utc), UTCDateTime()))}
+    return {"is_completed": False, "completed_at": None}
+
+async def _column_tops(db: AsyncSession, user_id: UUID, statuses: set[Status]) -> dict[Status, Decimal | int]:
+    """Top rank of each column, for stacking several cards above it in one statement."""
+    return {status: 1 for status in statuses} | dict((await db.execute(
+        select(Todo.status, func.min(Todo.rank))
+        .where(Todo.user_id == user_id)
+        .where(Todo.status.in_(statuses))
+        .group_by(Todo.status)
+    )).all())
+
+async def create_todo(current_user: TokenData, todo:models.TodoCreate, db: AsyncSession) -> Todo:
+    try:
         new_todo = Todo(**todo.model_dump())
         new_todo.user_id = current_user.get_uuid()
+        # New cards go on top of their column; the rank comes back through RETURNING
+        new_todo.rank = _top_rank(new_todo.user_id, new_todo.status)
+        await _lock_board(db, new_todo.user_id)
         db.add(new_todo)
-        db.commit()
-        db.refresh(new_todo)
-        logging.info(f"Created new Todo for user: {current_user.get_uuid()}")
-        return new_todo
+        # Every default is client-side and expire_on_commit is off, so no refresh SELECT is needed
+        await db.commit()
+        logging.info("Created new Todo for user: %s", current_user.get_uuid())
     except Exception as e:
-        logging.error(f"Failed to create todo for user {current_user.get_uuid()}. Error: {str(e)}")
+        logging.error("Failed to create todo for user %s. Error: %s", current_user.get_uuid(), e)
         raise TodoCreationError(str(e))
-    
-def get_todos(current_user: TokenData, db: Session) -> list[models.TodoResponse]:
-    
-    todos = (
-        db.query(Todo)
-        .filter(Todo.user_id == current_user.get_uuid())
-        .order_by(Todo.created_at.desc())
-        .all()
-    )
-    logging.info(f"Retrieved {len(todos)} todos for user: {current_user.get_uuid()}")
-    return todos
-
-def get_todo_by_id(current_user: TokenData, todo_id: UUID, db: Session) -> Todo:
-    todo = db.query(Todo).filter(Todo.id == todo_id).filter(Todo.user_id == current_user.get_uuid()).first()
+    await _invalidate_todos(current_user.get_uuid())
+    await _publish(current_user.get_uuid(), "todo.created", [new_todo])
+    return new_todo
+
+def _apply_filters(stmt: Select, filters: models.TodoFilters | None) -> Select:
+    if filters is None:
+        return stmt
+    if filters.status is not None:
+        stmt = stmt.where(Todo.status == filters.status)
+    if filters.is_completed is not None:
+        stmt = stmt.where(Todo.is_completed == filters.is_completed)
+    if filters.is_important is not None:
+        stmt = stmt.where(Todo.is_important == filters.is_important)
+    if filters.is_urgent is not None:
+        stmt = stmt.where(Todo.is_urgent == filters.is_urgent)
+    if filters.due_after is not None:
+        stmt = stmt.where(Todo.due_date >= filters.due_after)
+    if filters.due_before is not None:
+        stmt = stmt.where(Todo.due_date < filters.due_before)
+    return stmt
+
+def _encode_cursor(at: datetime, todo_id: UUID) -> str:
+    raw = f"{at.isoformat()}|{todo_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        created_at, todo_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(todo_id)
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursorError()
+
+def _owned_todos(current_user: TokenData, filters: models.TodoFilters | None, *columns) -> Select:
+    stmt = select(*(columns or (Todo,))).where(Todo.user_id == current_user.get_uuid())
+    return _apply_filters(stmt, filters)
+
+def _user_todos_query(current_user: TokenData, filters: models.TodoFilters | None, *columns) -> Select:
+    return _owned_todos(current_user, filters, *columns).order_by(Todo.created_at.desc(), Todo.id.desc())
+
+async def get_todos(current_user: TokenData, db: AsyncSession, filters: models.TodoFilters | None = None) -> list[models.TodoResponse]:
+    """The board: columns in status order, cards by rank, read along the (user_id, status, rank) index."""
+    await write_buffer.flush_user(current_user.get_uuid())
+    stmt = _owned_todos(current_user, filters, *TODO_RESPONSE_COLUMNS).order_by(
+        Todo.status, Todo.rank, Todo.created_at.desc(), Todo.id.desc()
+    )
+    rows = (await db.execute(stmt)).all()
+    logging.info("Retrieved %s todos for user: %s", len(rows), current_user.get_uuid())
+    return models.TodoResponseList.validate_python([row._asdict() for row in rows])
+
+async def get_todos_json(current_user: TokenData, db: AsyncSession, filters: models.TodoFilters, variant: str = "") -> bytes:
+    """The serialized board, read through the cache; `variant` keys each filtered list."""
+    await write_buffer.flush_user(current_user.get_uuid())
+    async def load() -> bytes:
+        return models.TodoResponseList.dump_json(await get_todos(current_user, db, filters))
+    return await cached(_todos_cache_key(current_user.get_uuid()), load, field=f"list:{variant}")
+
+async def get_todo_page(current_user: TokenData, db: AsyncSession, filters: models.TodoFilters, limit: int, cursor: str | None = None) -> models.TodoPage:
+    """
+    Keyset pagination on (created_at, id) so each page is an index range scan
+    instead of an OFFSET over every todo the user owns.
+    """
+    await write_buffer.flush_user(current_user.get_uuid())
+    stmt = _user_todos_query(current_user, filters, *TODO_RESPONSE_COLUMNS, Todo.created_at)
+    if cursor:
+        stmt = stmt.where(tuple_(Todo.created_at, Todo.id) < _decode_cursor(cursor))
+    # Fetch one extra row to know whether another page exists
+    rows = (await db.execute(stmt.limit(limit + 1))).all()
+    next_cursor = _encode_cursor(rows[limit - 1].created_at, rows[limit - 1].id) if len(rows) > limit else None
+    logging.info("Retrieved page of %s todos for user: %s", min(len(rows), limit), current_user.get_uuid())
+    items = models.TodoResponseList.validate_python([row._asdict() for row in rows[:limit]])
+    return models.TodoPage(items=items, next_cursor=next_cursor)
+
+async def get_archived_todos(current_user: TokenData, db: AsyncSession, limit: int, cursor: str | None = None) -> models.TodoPage:
+    """
+    The user's archived todos, most recently completed first, keyset
+    paginated on (completed_at, id) along the archive's per-partition index.
+    """
+    stmt = (
+        select(*ARCHIVE_RESPONSE_COLUMNS)
+        .where(ArchivedTodo.user_id == current_user.get_uuid())
+        .order_by(ArchivedTodo.completed_at.desc(), ArchivedTodo.id.desc())
+    )
+    if cursor:
+        stmt = stmt.where(tuple_(ArchivedTodo.completed_at, ArchivedTodo.id) < _decode_cursor(cursor))
+    rows = (await db.execute(stmt.limit(limit + 1))).all()
+    next_cursor = _encode_cursor(rows[limit - 1].completed_at, rows[limit - 1].id) if len(rows) > limit else None
+    logging.info("Retrieved page of %s archived todos for user: %s", min(len(rows), limit), current_user.get_uuid())
+    items = models.TodoResponseList.validate_python([row._asdict() for row in rows[:limit]])
+    return models.TodoPage(items=items, next_cursor=next_cursor)
+
+def _search_query(q: str):
+    """
+    Prefix tsquery over the words of `q` ("buy gro" matches "buying groceries"),
+    built from letters and digits only so user input can't break the syntax.
+    """
+    terms = re.findall(r"[^\W_]+", q.lower())[:SEARCH_MAX_TERMS]
+    if not terms:
+        return None
+    return func.to_tsquery("english", " & ".join(f"{term}:*" for term in terms))
+
+def _encode_search_cursor(score: float, todo_id: UUID) -> str:
+    return base64.urlsafe_b64encode(f"{score!r}|{todo_id}".encode()).decode()
+
+def _decode_search_cursor(cursor: str) -> tuple[float, UUID]:
+    try:
+        score, todo_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return float(score), UUID(todo_id)
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursorError()
+
+async def search_todos(current_user: TokenData, db: AsyncSession, q: str, filters: models.TodoFilters, limit: int, cursor: str | None = None) -> models.TodoPage:
+    """
+    Todos whose description matches every word of `q`, best match first,
+    answered from the GIN index on search_vector. Pages are keyset on
+    (score, id) like get_todo_page.
+    """
+    await write_buffer.flush_user(current_user.get_uuid())
+    query = _search_query(q)
+    if query is None:
+        return models.TodoPage(items=[])
+    score = func.ts_rank(Todo.search_vector, query)
+    stmt = (
+        _owned_todos(current_user, filters, *TODO_RESPONSE_COLUMNS, score.label("score"))
+        .where(Todo.search_vector.bool_op("@@")(query))
+        .order_by(score.desc(), Todo.id.desc())
+    )
+    if cursor:
+        stmt = stmt.where(tuple_(score, Todo.id) < _decode_search_cursor(cursor))
+    # Fetch one extra row to know whether another page exists
+    rows = (await db.execute(stmt.limit(limit + 1))).all()
+    next_cursor = _encode_search_cursor(rows[limit - 1].score, rows[limit - 1].id) if len(rows) > limit else None
+    logging.info("Search returned %s todos for user: %s", min(len(rows), limit), current_user.get_uuid())
+    items = models.TodoResponseList.validate_python([row._asdict() for row in rows[:limit]])
+    return models.TodoPage(items=items, next_cursor=next_cursor)
+
+async def stream_todos(current_user: TokenData, filters: models.TodoFilters, format: Literal["ndjson", "csv"] = "ndjson") -> AsyncIterator[str]:
+    """
+    Yield the user's todos as NDJSON lines or CSV rows (with a header) using
+    a server-side cursor, in chunks of about EXPORT_CHUNK_BYTES, so memory
+    stays flat however large the board is. The CSV re-imports through
+    import_todos. Owns its session because the generator outlives the
+    request dependency.
+    """
+    await write_buffer.flush_user(current_user.get_uuid())
+    out = io.StringIO()
+    writer = csv.writer(out)
+    if format == "csv":
+        writer.writerow(models.TodoResponse.model_fields)
+    async with AsyncSessionLocal() as db:
+        stmt = _user_todos_query(current_user, filters, *TODO_RESPONSE_COLUMNS).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        async for row in await db.stream(stmt):
+            todo = models.TodoResponse.model_validate(row._asdict())
+            if format == "csv":
+                writer.writerow(todo.model_dump(mode="json").values())
+            else:
+                out.write(todo.model_dump_json() + "\n")
+            if out.tell() >= EXPORT_CHUNK_BYTES:
+                yield out.getvalue()
+                out.seek(0)
+                out.truncate()
+    if out.tell():
+        yield out.getvalue()
+
+def _weak_etag(*parts) -> str:
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+def get_todo_etag(todo: Todo) -> str:
+    return _weak_etag(todo.id, todo.updated_at)
+
+async def get_collection_etag(current_user: TokenData, db: AsyncSession, variant: str = "") -> str:
+    """
+    Weak ETag for the user's todo list: row count, newest update and newest
+    deletion, answered from the (user_id, updated_at) index in one query and
+    cached until the next write.
+    `variant` distinguishes representations, e.g. differently filtered lists.
+    """
+    user_id = current_user.get_uuid()
+    await write_buffer.flush_user(user_id)
+
+    async def load() -> bytes:
+        last_deleted = (
+            select(func.max(TodoTombstone.deleted_at))
+            .where(TodoTombstone.user_id == user_id)
+            .scalar_subquery()
+        )
+        count, last_updated, last_deleted = (await db.execute(
+            select(func.count(), func.max(Todo.updated_at), last_deleted).where(Todo.user_id == user_id)
+        )).one()
+        return _weak_etag(user_id, count, last_updated, last_deleted, variant).encode()
+
+    return (await cached(_todos_cache_key(user_id), load, field=f"etag:{variant}")).decode()
+
+def _encode_sync_cursor(at: datetime) -> str:
+    return base64.urlsafe_b64encode(at.isoformat().encode()).decode()
+
+def _decode_sync_cursor(cursor: str) -> datetime:
+    try:
+        at = datetime.fromisoformat(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursorError()
+    return at if at.tzinfo else at.replace(tzinfo=timezone.utc)
+
+async def get_changes(current_user: TokenData, db: AsyncSession, since: str | None = None) -> models.TodoChanges:
+    """
+    Todos changed and ids deleted since the cursor of a previous call; without
+    a cursor, the full list. Cursors older than the tombstone retention are
+    rejected because run_tombstone_sweeper has deleted the tombstones they need.
+    """
+    user_id = current_user.get_uuid()
+    await write_buffer.flush_user(user_id)
+    now = datetime.now(timezone.utc)
+    changed_stmt = select(Todo).where(Todo.user_id == user_id).order_by(Todo.updated_at)
+    deleted = []
+    if since:
+        since_at = _decode_sync_cursor(since)
+        if since_at < now - timedelta(days=TOMBSTONE_RETENTION_DAYS):
+            raise SyncCursorExpiredError()
+        window_start = since_at - SYNC_OVERLAP
+        changed_stmt = changed_stmt.where(Todo.updated_at > window_start)
+        deleted = (await db.scalars(
+            select(TodoTombstone.todo_id)
+            .where(TodoTombstone.user_id == user_id)
+            .where(TodoTombstone.deleted_at > window_start)
+        )).all()
+    changed = (await db.scalars(changed_stmt)).all()
+    logging.info("Retrieved %s changed and %s deleted todos for user %s", len(changed), len(deleted), user_id)
+    return models.TodoChanges(changed=changed, deleted=deleted, cursor=_encode_sync_cursor(now))
+
+async def get_todo_by_id(current_user: TokenData, todo_id: UUID, db: AsyncSession) -> Todo:
+    await write_buffer.flush_user(current_user.get_uuid())
+    todo = await db.scalar(select(Todo).where(Todo.id == todo_id).where(Todo.user_id == current_user.get_uuid()))
     if not todo:
-        logging.warning(f"Todo {todo_id} not found for user {current_user.get_uuid()}")
+        logging.warning("Todo %s not found for user %s", todo_id, current_user.get_uuid())
         raise TodoNotFoundError(todo_id)
-    logging.info(f"Retrieved todo {todo_id} for user {current_user.get_uuid()}")
+    logging.info("Retrieved todo %s for user %s", todo_id, current_user.get_uuid())
     return todo
 
-def update_todo(current_user: TokenData, db: Session, todo_id: UUID, todo_update: models.TodoCreate) -> Todo:
-    todo_data = todo_update.model_dump(exclude_unset=True)
-    db.query(Todo).filter(Todo.id == todo_id).filter(Todo.user_id == current_user.get_uuid()).update(todo_data)
-    db.commit()
-    logging.info(f"Successfully updated todo {todo_id} for user {current_user.get_uuid()}")
-    return get_todo_by_id(current_user, todo_id, db)
-
-def complete_todo(current_user: TokenData, db: Session, todo_id: UUID) -> Todo:
-    todo = get_todo_by_id(current_user, todo_id, db)
-    if todo.is_completed:
-        logging.debug(f"Todo {todo_id} is already completed")
+async def _update_returning(current_user: TokenData, db: AsyncSession, todo_id: UUID, todo_data: dict) -> Todo:
+    """
+    Apply `todo_data` with one UPDATE ... RETURNING and commit; an empty update
+    is a plain lookup. A card changing status goes on top of its new column
+    and is completed or reopened with it, as move_todo does.
+    """
+    if not todo_data:
+        return await get_todo_by_id(current_user, todo_id, db)
+    await write_buffer.flush_user(current_user.get_uuid())
+    if todo_data.get("status") is not None:
+        status = todo_data["status"]
+        todo_data = {**todo_data, "rank": _status_rank(current_user.get_uuid(), status), **_completion(status)}
+        await _lock_board(db, current_user.get_uuid())
+    todo = (await db.scalars(
+        update(Todo)
+        .where(Todo.id == todo_id)
+        .where(Todo.user_id == current_user.get_uuid())
+        .values(**todo_data)
+        .returning(Todo)
+        .execution_options(synchronize_session=False)
+    )).first()
+    if todo is None:
+        logging.warning("Todo %s not found for user %s", todo_id, current_user.get_uuid())
+        raise TodoNotFoundError(todo_id)
+    await db.commit()
+    return todo
+
+async def update_todo(current_user: TokenData, db: AsyncSession, todo_id: UUID, todo_update: models.TodoCreate) -> Todo:
+    todo = await _update_returning(current_user, db, todo_id, todo_update.model_dump(exclude_unset=True))
+    logging.info("Successfully updated todo %s for user %s", todo_id, current_user.get_uuid())
+    await _invalidate_todos(current_user.get_uuid())
+    await _publish(current_user.get_uuid(), "todo.updated", [todo])
+    return todo
+
+async def complete_todo(current_user: TokenData, db: AsyncSession, todo_id: UUID) -> Todo:
+    await write_buffer.flush_user(current_user.get_uuid())
+    await _lock_board(db, current_user.get_uuid())
+    todo = (await db.scalars(
+        update(Todo)
+        .where(Todo.id == todo_id)
+        .where(Todo.user_id == current_user.get_uuid())
+        .where(Todo.is_completed.is_(False))
+        .values(
+            is_completed=True,
+            status=Status.completed,
+            rank=_status_rank(current_user.get_uuid(), Status.completed),
+            completed_at=datetime.now(timezone.utc),
+        )
+        .returning(Todo)
+        .execution_options(synchronize_session=False)
+    )).first()
+    if todo is None:
+        # Either missing or already completed; the lookup raises for the former
+        todo = await get_todo_by_id(current_user, todo_id, db)
+        logging.debug("Todo %s is already completed", todo_id)
         return todo
-    todo.is_completed = True
-    todo.status = 'completed'
-    todo.completed_at = datetime.now(timezone.utc)
-    db.commit()
-    db.refresh(todo)
-    logging.info(f"Todo {todo_id} marked as completed by user {current_user.get_uuid()}")
+    await db.commit()
+    logging.info("Todo %s marked as completed by user %s", todo_id, current_user.get_uuid())
+    await _invalidate_todos(current_user.get_uuid())
+    await _publish(current_user.get_uuid(), "todo.completed", [todo])
+    return todo
+
+async def move_todo(current_user: TokenData, db: AsyncSession, todo_id: UUID, move: models.TodoMove) -> Todo:
+    """
+    Move a card to `move.status`, directly below `move.after_id` or on top of
+    the column. One UPDATE ... RETURNING computes the new rank in subqueries
+    (halfway to the next card, or one past the last/first), so no other card
+    is rewritten. Moving into or out of the completed column completes or
+    reopens the todo.
+    """
+    user_id = current_user.get_uuid()
+    await write_buffer.flush_user(user_id)
+    if move.after_id == todo_id:
+        raise InvalidMoveError("A todo cannot be moved below itself")
+    await _lock_board(db, user_id)
+    neighbour = aliased(Todo)
+    column = select(neighbour.rank).where(neighbour.user_id == user_id).where(neighbour.status == move.status)
+    others = column.with_only_columns(func.min(neighbour.rank)).where(neighbour.id != todo_id)
+    stmt = update(Todo).where(Todo.id == todo_id).where(Todo.user_id == user_id)
+    if move.after_id is None:
+        rank = func.coalesce(others.scalar_subquery(), 1) - 1
+    else:
+        above = column.where(neighbour.id == move.after_id).scalar_subquery()
+        below = others.where(neighbour.rank > above).scalar_subquery()
+        # NUMERIC multiplication adds a digit of scale; trimmed, only real halvings count toward a rebalance
+        rank = func.trim_scale((above + func.coalesce(below, above + 2)) * Decimal("0.5"))
+        stmt = stmt.where(above.is_not(None))
+    todo = (await db.scalars(
+        stmt.values(status=move.status, rank=rank, **_completion(move.status))
+        .returning(Todo)
+        .execution_options(synchronize_session=False)
+    )).first()
+    if todo is None:
+        # Either the todo or the card to drop it below is missing; the lookup raises for the former
+        await get_todo_by_id(current_user, todo_id, db)
+        raise InvalidMoveError(f"Todo {move.after_id} is not in the {move.status.value} column")
+    await db.commit()
+    if -todo.rank.as_tuple().exponent > RANK_REBALANCE_DIGITS:
+        _rebalance_pending.add((user_id, move.status))
+    logging.info("Todo %s moved to %s by user %s", todo_id, move.status.value, user_id)
+    await _invalidate_todos(user_id)
+    await _publish(user_id, "todo.updated", [todo])
     return todo
 
-def increment_pomodoro_count(current_user: TokenData, db: Session, todo_id: UUID) -> Todo:
-    todo = get_todo_by_id(current_user, todo_id, db)
-    if todo.is_completed:
-        logging.debug(f"Todo {todo_id} is already completed")
+async def rebalance_column(db: AsyncSession, user_id: UUID, status: Status) -> int:
+    """Renumber one board column 1..n in its current order; returns the number of cards rewritten."""
+    ranked = (
+        select(Todo.id, func.row_number().over(order_by=(Todo.rank, Todo.created_at.desc(), Todo.id.desc())).label("position"))
+        .where(Todo.user_id == user_id)
+        .where(Todo.status == status)
+        .subquery()
+    )
+    result = await db.execute(
+        update(Todo)
+        .where(Todo.id == ranked.c.id)
+        .where(Todo.rank != ranked.c.position)
+        .values(rank=ranked.c.position)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
+
+async def run_rank_rebalancer() -> None:
+    """Every RANK_REBALANCE_INTERVAL seconds, renumber the columns whose ranks grew past RANK_REBALANCE_DIGITS."""
+    while True:
+        await asyncio.sleep(RANK_REBALANCE_INTERVAL)
+        while _rebalance_pending:
+            user_id, status = _rebalance_pending.pop()
+            try:
+                async with AsyncSessionLocal() as db:
+                    renumbered = await rebalance_column(db, user_id, status)
+                logging.info("Rebalanced %s ranks in the %s column of user %s", renumbered, status.value, user_id)
+                await _invalidate_todos(user_id)
+            except Exception as e:
+                logging.error("Rank rebalancing failed for user %s: %s", user_id, e)
+
+def _month_start(at: datetime) -> datetime:
+    return at.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+async def _ensure_archive_partitions(db: AsyncSession, oldest: datetime, newest: datetime) -> None:
+    """Create the monthly todo_archive partitions covering oldest..newest; existing ones are kept."""
+    month = _month_start(oldest)
+    while month <= newest:
+        next_month = _month_start(month + timedelta(days=32))
+        await db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS todo_archive_{month:%Y_%m} PARTITION OF todo_archive "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{next_month:%Y-%m-%d}')"
+        ))
+        month = next_month
+
+def _archive_batch(cutoff: datetime):
+    """
+    One statement per batch: DELETE the oldest completed todos (skipping rows
+    a request holds locked), copy them into todo_archive and leave tombstones
+    so delta sync clients drop them. Pomodoro sessions keep their todo_id,
+    which now resolves in todo_archive. Returns one user_id per archived todo.
+    """
+    candidates = (
+        select(Todo.id)
+        .where(Todo.is_completed.is_(True))
+        .where(Todo.completed_at < cutoff)
+        .order_by(Todo.completed_at)
+        .limit(ARCHIVE_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    )
+    moved = (
+        delete(Todo)
+        .where(Todo.id.in_(candidates))
+        .returning(*(Todo.__table__.c[name] for name in ARCHIVE_COLUMNS))
+        .cte("moved")
+    )
+    now = literal(datetime.now(timezone.utc), UTCDateTime())
+    archived = (
+        insert(ArchivedTodo)
+        .from_select([*ARCHIVE_COLUMNS, "archived_at"], select(*(moved.c[name] for name in ARCHIVE_COLUMNS), now))
+        .cte("archived")
+    )
+    return (
+        insert(TodoTombstone)
+        .from_select(["todo_id", "user_id", "deleted_at"], select(moved.c.id, moved.c.user_id, now))
+        .add_cte(archived)
+        .returning(TodoTombstone.user_id)
+    )
+
+async def archive_completed_todos(db: AsyncSession) -> int:
+    """
+    Move todos completed more than ARCHIVE_AFTER_DAYS ago into todo_archive,
+    ARCHIVE_BATCH_SIZE per transaction so locks and WAL stay bounded.
+    Returns the number archived.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=ARCHIVE_AFTER_DAYS)
+    oldest = await db.scalar(
+        select(func.min(Todo.completed_at)).where(Todo.is_completed.is_(True)).where(Todo.completed_at < cutoff)
+    )
+    if oldest is None:
+        return 0
+    await _ensure_archive_partitions(db, oldest, cutoff)
+    await db.commit()
+    archived = 0
+    while True:
+        user_ids = (await db.scalars(_archive_batch(cutoff))).all()
+        await db.commit()
+        archived += len(user_ids)
+        for user_id in set(user_ids):
+            await _invalidate_todos(user_id)
+        if len(user_ids) < ARCHIVE_BATCH_SIZE:
+            return archived
+
+async def run_todo_archiver() -> None:
+    """Archive old completed todos every ARCHIVE_INTERVAL seconds until cancelled."""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                archived = await archive_completed_todos(db)
+            if archived:
+                logging.info("Archived %s completed todos", archived)
+        except Exception as e:
+            logging.error("Todo archiving failed: %s", e)
+        await asyncio.sleep(ARCHIVE_INTERVAL)
+
+async def sweep_expired_tombstones(db: AsyncSession) -> int:
+    """
+    Delete tombstones older than TOMBSTONE_RETENTION_DAYS (plus the sync
+    overlap, so any cursor get_changes still accepts finds its deletions) in
+    batches of TOMBSTONE_SWEEP_BATCH, committing each batch.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=TOMBSTONE_RETENTION_DAYS) - SYNC_OVERLAP
+    deleted = 0
+    while True:
+        expired = (
+            select(TodoTombstone.todo_id)
+            .where(TodoTombstone.deleted_at < cutoff)
+            .limit(TOMBSTONE_SWEEP_BATCH)
+        )
+        result = await db.execute(
+            delete(TodoTombstone)
+            .where(TodoTombstone.todo_id.in_(expired.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        deleted += result.rowcount
+        if result.rowcount < TOMBSTONE_SWEEP_BATCH:
+            return deleted
+
+async def run_tombstone_sweeper() -> None:
+    """Sweep expired tombstones every TOMBSTONE_SWEEP_INTERVAL seconds until cancelled."""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                deleted = await sweep_expired_tombstones(db)
+            if deleted:
+                logging.info("Swept %s expired todo tombstones", deleted)
+        except Exception as e:
+            logging.error("Tombstone sweep failed: %s", e)
+        await asyncio.sleep(TOMBSTONE_SWEEP_INTERVAL)
+
+def _is_connection_error(error: OperationalError) -> bool:
+    error_msg = str(error).lower()
+    return any(keyword in error_msg for keyword in ["ssl connection", "connection", "timeout", "server closed"])
+
+async def increment_pomodoro_count(current_user: TokenData, db: AsyncSession, todo_id: UUID) -> Todo | models.TodoResponse:
+    """
+    Increment in a single UPDATE ... RETURNING so concurrent timers never lose
+    a tick and the common path is one round trip. With the write buffer on,
+    the increment is coalesced with others and flushed in a batch instead.
+    """
+    if write_buffer.enabled:
+        state, buffered = await write_buffer.update(
+            current_user.get_uuid(), todo_id, _todo_state_loader(current_user, todo_id, db), increment=1
+        )
+        todo = models.TodoResponse.model_validate(state)
+        if buffered:
+            await _publish(current_user.get_uuid(), "todo.pomodoro_incremented", [todo])
         return todo
+    stmt = (
+        update(Todo)
+        .where(Todo.id == todo_id)
+        .where(Todo.user_id == current_user.get_uuid())
+        .where(Todo.is_completed.is_(False))
+        .values(pomodoro_count=Todo.pomodoro_count + 1)
+        .returning(Todo)
+        .execution_options(synchronize_session=False)
+    )
 
     max_retries = 3
     for attempt in range(max_retries):
         try:
-            todo.pomodoro_count += 1
-            db.commit()
-            db.refresh(todo)
-            logging.info(f"Todo {todo_id} incremented pomodoro count by user {current_user.get_uuid()}")
-            return todo
+            todo = (await db.scalars(stmt)).first()
+            await db.commit()
+            break
         except OperationalError as e:
-            db.rollback()
-            error_msg = str(e).lower()
-            if any(keyword in error_msg for keyword in ["ssl connection", "connection", "timeout", "server closed"]):
-                logging.warning(f"Database connection issue on attempt {attempt + 1}/{max_retries} for todo {todo_id}: {str(e)}")
-                if attempt < max_retries - 1:
-                    # Wait before retry, with exponential backoff
-                    import time
-                    time.sleep(2 ** attempt)  # 1s, 2s, 4s
-                    # Get fresh todo object for retry
-                    todo = get_todo_by_id(current_user, todo_id, db)
-                    continue
-                else:
-                    logging.error(f"Failed to increment pomodoro count for todo {todo_id} after {max_retries} attempts")
-                    raise HTTPException(status_code=503, detail="Database temporarily unavailable. Please try again.")
-            else:
+            await db.rollback()
+            if not _is_connection_error(e):
                 # Non-connection related error, don't retry
-                logging.error(f"Non-connection error incrementing pomodoro count for todo {todo_id}: {str(e)}")
+                logging.error("Non-connection error incrementing pomodoro count for todo %s: %s", todo_id, e)
                 raise HTTPException(status_code=500, detail="Internal server error")
+            logging.warning("Database connection issue on attempt %s/%s for todo %s: %s", attempt + 1, max_retries, todo_id, e)
+            if attempt == max_retries - 1:
+                logging.error("Failed to increment pomodoro count for todo %s after %s attempts", todo_id, max_retries)
+                raise HTTPException(status_code=503, detail="Database temporarily unavailable. Please try again.")
+            # Back off without blocking the event loop
+            await asyncio.sleep(0.1 * 2 ** attempt)  # 100ms, 200ms
         except Exception as e:
-            db.rollback()
-            logging.error(f"Unexpected error incrementing pomodoro count for todo {todo_id}: {str(e)}")
+            await db.rollback()
+            logging.error("Unexpected error incrementing pomodoro count for todo %s: %s", todo_id, e)
             raise HTTPException(status_code=500, detail="Internal server error")
 
-def delete_todo(current_user: TokenData, db: Session, todo_id: UUID) -> None:
-    todo = get_todo_by_id(current_user, todo_id, db)
-    db.delete(todo)
-    db.commit()
-    logging.info(f"Todo {todo_id} deleted by user {current_user.get_uuid()}")
+    if todo is None:
+        # Either missing or already completed; the lookup raises for the former
+        todo = await get_todo_by_id(current_user, todo_id, db)
+        logging.debug("Todo %s is already completed", todo_id)
+        return todo
+    logging.info("Todo %s incremented pomodoro count by user %s", todo_id, current_user.get_uuid())
+    await _invalidate_todos(current_user.get_uuid())
+    await _publish(current_user.get_uuid(), "todo.pomodoro_incremented", [todo])
+    return todo
 
-def batch_delete_todos(current_user: TokenData, db: Session, request: models.BatchDeleteRequest) -> None:
+async def batch_increment_pomodoro_counts(current_user: TokenData, db: AsyncSession, request: models.BatchIncrementRequest) -> models.BatchIncrementResponse:
+    """
+    Apply many increments (e.g. queued by an offline client) in one
+    UPDATE ... SET pomodoro_count = pomodoro_count + CASE id ... END RETURNING
+    statement.
+    """
+    await write_buffer.flush_user(current_user.get_uuid())
+    counts: dict[UUID, int] = {}
+    for item in request.increments:
+        counts[item.todo_id] = counts.get(item.todo_id, 0) + item.count
+
+    stmt = (
+        update(Todo)
+        .where(Todo.id.in_(list(counts)))
+        .where(Todo.user_id == current_user.get_uuid())
+        .where(Todo.is_completed.is_(False))
+        .values(pomodoro_count=Todo.pomodoro_count + case(counts, value=Todo.id, else_=0))
+        .returning(Todo)
+        .execution_options(synchronize_session=False)
+    )
     try:
-        deleted_count = (
-            db.query(Todo)
-            .filter(Todo.id.in_(request.todo_ids))
-            .filter(Todo.user_id == current_user.get_uuid())
-            .delete(synchronize_session=False)
-        )
-        db.commit()
-        logging.info(f"Batch deleted {deleted_count} todos for user {current_user.get_uuid()}")
+        todos = (await db.scalars(stmt)).all()
+        await db.commit()
     except Exception as e:
-        logging.error(f"Failed to batch delete todos for user {current_user.get_uuid()}. Error: {str(e)}")
+        await db.rollback()
+        logging.error("Failed to batch increment pomodoro counts for user %s. Error: %s", current_user.get_uuid(), e)
+        raise HTTPException(status_code=500, detail="Failed to increment pomodoro counts")
+
+    updated_ids = {todo.id for todo in todos}
+    failed = [
+        {"todo_id": str(todo_id), "error": "Todo not found or already completed"}
+        for todo_id in counts if todo_id not in updated_ids
+    ]
+    logging.info("Batch incremented pomodoro count on %s todos for user %s", len(todos), current_user.get_uuid())
+    await _invalidate_todos(current_user.get_uuid())
+    await _publish(current_user.get_uuid(), "todo.pomodoro_incremented", todos)
+    return models.BatchIncrementResponse(todos=todos, failed_increments=failed)
+
+def _delete_with_tombstones(user_id: UUID, todo_ids: list[UUID]):
+    """
+    DELETE ... RETURNING feeding the tombstone INSERT through a CTE, so the
+    rows and their tombstones go in one statement; returns the deleted ids.
+    Another CTE unlinks the todos' pomodoro sessions, which have no foreign
+    key to do it since they may point into todo_archive.
+    """
+    deleted = (
+        delete(Todo)
+        .where(Todo.id.in_(todo_ids))
+        .where(Todo.user_id == user_id)
+        .returning(Todo.id, Todo.user_id)
+        .cte("deleted")
+    )
+    unlinked = (
+        update(PomodoroSession)
+        .where(PomodoroSession.todo_id.in_(select(deleted.c.id)))
+        .values(todo_id=None)
+        .cte("unlinked")
+    )
+    deleted_at = literal(datetime.now(timezone.utc), UTCDateTime())
+    return (
+        insert(TodoTombstone)
+        .from_select(["todo_id", "user_id", "deleted_at"], select(deleted.c.id, deleted.c.user_id, deleted_at))
+        .add_cte(unlinked)
+        .returning(TodoTombstone.todo_id)
+    )
+
+async def delete_todo(current_user: TokenData, db: AsyncSession, todo_id: UUID) -> None:
+    await write_buffer.flush_user(current_user.get_uuid())
+    deleted_ids = (await db.scalars(_delete_with_tombstones(current_user.get_uuid(), [todo_id]))).all()
+    if not deleted_ids:
+        logging.warning("Todo %s not found for user %s", todo_id, current_user.get_uuid())
+        raise TodoNotFoundError(todo_id)
+    await db.commit()
+    logging.info("Todo %s deleted by user %s", todo_id, current_user.get_uuid())
+    await _invalidate_todos(current_user.get_uuid())
+    await _publish(current_user.get_uuid(), "todo.deleted", deleted_ids=[todo_id])
+
+async def batch_delete_todos(current_user: TokenData, db: AsyncSession, request: models.BatchDeleteRequest) -> None:
+    await write_buffer.flush_user(current_user.get_uuid())
+    try:
+        deleted_ids = (await db.scalars(_delete_with_tombstones(current_user.get_uuid(), request.todo_ids))).all()
+        await db.commit()
+        logging.info("Batch deleted %s todos for user %s", len(deleted_ids), current_user.get_uuid())
+    except Exception as e:
+        logging.error("Failed to batch delete todos for user %s. Error: %s", current_user.get_uuid(), e)
         raise HTTPException(status_code=500, detail="Failed to delete todos")
+    await _invalidate_todos(current_user.get_uuid())
+    await _publish(current_user.get_uuid(), "todo.deleted", deleted_ids=deleted_ids)
+
 
+async def patch_todo(current_user: TokenData, db: AsyncSession, todo_id: UUID, todo_update: models.TodoUpdate) -> Todo | models.TodoResponse:
+    todo_data = _checked_changes(todo_update.model_dump(exclude_unset=True))
+    # Status changes write through: the new rank depends on the column's other cards
+    if write_buffer.enabled and todo_data and "status" not in todo_data:
+        # Coalesced with other patches and increments; the flush invalidates the cache
+        state, _ = await write_buffer.update(
+            current_user.get_uuid(), todo_id, _todo_state_loader(current_user, todo_id, db), changes=todo_data
+        )
+        todo = models.TodoResponse.model_validate(state)
+    else:
+        todo = await _update_returning(current_user, db, todo_id, todo_data)
+        await _invalidate_todos(current_user.get_uuid())
+    logging.info("Successfully patched todo %s for user %s", todo_id, current_user.get_uuid())
+    await _publish(current_user.get_uuid(), "todo.updated", [todo])
+    return todo
+
+
+async def bulk_create_todos(current_user: TokenData, db: AsyncSession, request: models.BulkCreateRequest) -> models.BulkTodoResponse:
+    """Read the column tops, then insert all todos with one executemany INSERT ... RETURNING."""
+    user_id = current_user.get_uuid()
+    rows = [{**todo.model_dump(), "user_id": user_id} for todo in request.todos]
+    try:
+        # Stack the new cards on top of each column, the first of the request uppermost
+        await _lock_board(db, user_id)
+        tops = await _column_tops(db, user_id, {row["status"] for row in rows})
+        for row in reversed(rows):
+            tops[row["status"]] -= 1
+            row["rank"] = tops[row["status"]]
+        todos = (await db.scalars(insert(Todo).returning(Todo, sort_by_parameter_order=True), rows)).all()
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logging.error("Failed to bulk create todos for user %s. Error: %s", user_id, e)
+        raise TodoCreationError(str(e))
+    logging.info("Bulk created %s todos for user %s", len(todos), user_id)
+    await _invalidate_todos(user_id)
+    await _publish(user_id, "todo.created", todos)
+    return models.BulkTodoResponse(todos=todos)
+
+async def _import_records(chunks: AsyncIterator[bytes], format: str) -> AsyncIterator[str]:
+    """
+    Split an uploaded byte stream into records, holding at most one chunk and
+    one record at a time. An NDJSON record is a line; a CSV record runs to
+    the first line end outside quotes, so quoted descriptions may span lines.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""  # Text after the last line end
+    lines: list[str] = []  # Lines of a CSV record whose quotes are still open
+    quotes = 0
+    open_chars = 0  # Length of `lines`, which an unterminated quote would grow to the whole upload
+
+    def check(length: int) -> None:
+        if length > IMPORT_MAX_RECORD_CHARS:
+            raise InvalidImportError(f"Records are limited to {IMPORT_MAX_RECORD_CHARS} characters")
+
+    def split(text: str) -> list[str]:
+        nonlocal pending, quotes, open_chars
+        *complete, pending = (pending + text).split("\n")
+        check(open_chars + len(pending))
+        records = []
+        for line in complete:
+            line = line.removesuffix("\r")
+            if format == "ndjson":
+                records.append(line)
+                continue
+            lines.append(line)
+            quotes += line.count('"')
+            open_chars += len(line) + 1
+            if quotes % 2 == 0:
+                records.append("\n".join(lines))
+                lines.clear()
+                quotes = open_chars = 0
+            else:
+                check(open_chars + len(pending))
+        return records
+
+    try:
+        async for chunk in chunks:
+            for record in split(decoder.decode(chunk)):
+                yield record
+        for record in split(decoder.decode(b"", final=True) + "\n"):
+            yield record
+    except UnicodeDecodeError:
+        raise InvalidImportError("Imports must be UTF-8 encoded")
+    if lines:
+        raise InvalidImportError("Unterminated quoted field at the end of the file")
+
+def _import_row(record: str, format: str, header: list[str] | None) -> models.TodoCreate:
+    """Validate one record; columns TodoCreate doesn't know, such as an export's id or rank, are ignored."""
+    if format == "csv":
+        # Empty cells fall back to the model defaults
+        row = {name: value for name, value in zip(header, next(csv.reader([record]))) if value != ""}
+    else:
+        row = json.loads(record)
+        if not isinstance(row, dict):
+            raise ValueError("Expected a JSON object")
+    # A missing due date means none, as it does for a blank cell
+    return models.TodoCreate.model_validate({"due_date": None, **row})
+
+def _import_error(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(f"{'.'.join(map(str, err['loc'])) or 'row'}: {err['msg']}" for err in error.errors())
+    return str(error)
+
+async def _write_import_chunk(db: AsyncSession, rows: list[dict]) -> None:
+    """COPY the rows into todos on asyncpg, else one multi-row INSERT."""
+    conn = await db.connection()
+    if conn.dialect.driver != "asyncpg":
+        await db.execute(insert(Todo), rows)
+        return
+    # COPY skips SQLAlchemy's type processing: bind naive UTC datetimes and enum names as the column types do
+    to_utc = UTCDateTime().process_bind_param
+    for row in rows:
+        row.update(
+            due_date=to_utc(row["due_date"], conn.dialect),
+            created_at=to_utc(row["created_at"], conn.dialect),
+            updated_at=to_utc(row["updated_at"], conn.dialect),
+            completed_at=to_utc(row["completed_at"], conn.dialect),
+            status=row["status"].name,
+        )
+    # Same driver connection and open transaction as the session
+    driver = (await conn.get_raw_connection()).driver_connection
+    await driver.copy_records_to_table(
+        Todo.__tablename__,
+        records=[tuple(row[name] for name in IMPORT_COLUMNS) for row in rows],
+        columns=IMPORT_COLUMNS,
+    )
+
+async def import_todos(current_user: TokenData, db: AsyncSession, chunks: AsyncIterator[bytes], format: Literal["csv", "ndjson"]) -> models.ImportResult:
+    """
+    Stream a CSV (with a header row) or NDJSON upload into the user's board.
+    Rows are validated with TodoCreate and written IMPORT_CHUNK_SIZE at a
+    time, so memory stays flat however large the file is. Invalid rows are
+    skipped and reported; the valid ones are appended below each column's
+    bottom card in file order. Each chunk is its own short transaction,
+    stamped just before it commits, so the upload never holds a connection
+    while the client sends the rest and GET /todos/changes cursors issued
+    meanwhile still see every chunk. An upload failing partway keeps the
+    chunks already committed. Subscribers get one todo.imported event with
+    the count, to reload through GET /todos/changes, instead of every
+    imported todo.
+    """
+    user_id = current_user.get_uuid()
+    await write_buffer.flush_user(user_id)
+
+    async def write(rows: list[dict]) -> None:
+        await _lock_board(db, user_id)
+        bottoms = dict((await db.execute(
+            select(Todo.status, func.max(Todo.rank)).where(Todo.user_id == user_id).group_by(Todo.status)
+        )).all())
+        now = datetime.now(timezone.utc)
+        for row in rows:
+            row["rank"] = bottoms[row["status"]] = bottoms.get(row["status"], Decimal(0)) + 1
+            row.update(created_at=now, updated_at=now, completed_at=now if row["is_completed"] else None)
+        await _write_import_chunk(db, rows)
+        await db.commit()
+
+    header = None
+    rows: list[dict] = []
+    imported = failed = 0
+    errors = []
+    try:
+        number = 0
+        async for record in _import_records(chunks, format):
+            if not record.strip():
+                continue
+            if format == "csv" and header is None:
+                header = [name.strip() for name in next(csv.reader([record]))]
+                if "description" not in header:
+                    raise InvalidImportError("The CSV header must include a description column")
+                continue
+            number += 1
+            try:
+                todo = _import_row(record, format, header)
+            except (ValueError, csv.Error) as e:  # Covers JSONDecodeError and pydantic's ValidationError
+                failed += 1
+                if len(errors) < IMPORT_MAX_ERRORS:
+                    errors.append({"row": number, "error": _import_error(e)})
+                continue
+            if imported + len(rows) >= IMPORT_MAX_ROWS:
+                raise ImportTooLargeError(IMPORT_MAX_ROWS)
+            rows.append({
+                **todo.model_dump(), "id": uuid.uuid4(), "user_id": user_id,
+                "is_completed": todo.status == Status.completed, "pomodoro_count": 0,
+            })
+            if len(rows) >= IMPORT_CHUNK_SIZE:
+                await write(rows)
+                imported += len(rows)
+                rows = []
+        if rows:
+            await write(rows)
+            imported += len(rows)
+    except HTTPException:
+        await db.rollback()
+        raise
+    except Exception as e:
+        await db.rollback()
+        logging.error("Failed to import todos for user %s after %s rows. Error: %s", user_id, imported, e)
+        raise TodoCreationError(str(e))
+    finally:
+        # Also after a failure: the chunks committed before it are on the board
+        if imported:
+            await _invalidate_todos(user_id)
+            await _publish(user_id, "todo.imported", count=imported)
+    logging.info("Imported %s todos for user %s, rejected %s rows", imported, user_id, failed)
+    return models.ImportResult(imported=imported, failed_rows=failed, errors=errors)
+
+async def bulk_update_todos(current_user: TokenData, db: AsyncSession, request: models.BulkUpdateRequest) -> models.BulkTodoResponse:
+    """
+    Load the owned todos in one SELECT, apply each patch in memory and flush
+    them as batched UPDATEs in one commit; the response needs no re-read.
+    """
+    user_id = current_user.get_uuid()
+    await write_buffer.flush_user(user_id)
+    ids = [item.id for item in request.updates]
+    todos = {todo.id: todo for todo in await db.scalars(select(Todo).where(Todo.id.in_(ids)).where(Todo.user_id == user_id))}
+
+    updated = {}
+    moved = []  # Changed column; ranked on top of it below
+    failed = []
+    now = datetime.now(timezone.utc)
+    for item in request.updates:
+        todo = todos.get(item.id)
+        if todo is None:
+            failed.append({"todo_id": str(item.id), "error": "Todo not found"})
+            continue
+        todo_data = item.model_dump(exclude_unset=True, exclude={"id"})
+        if error := _null_field_error(todo_data):
+            failed.append({"todo_id": str(item.id), "error": error})
+            continue
+        if "status" in todo_data and todo_data["status"] not in Status.__members__:
+            failed.append({"todo_id": str(item.id), "error": f"Invalid status: {todo_data['status']}"})
+            continue
+        if "status" in todo_data:
+            todo_data["status"] = Status[todo_data["status"]]
+            if todo_data["status"] != todo.status and todo not in moved:
+                moved.append(todo)
+            # Completed or reopened with the column, as _completion does for single updates
+            completed = todo_data["status"] == Status.completed
+            todo_data["is_completed"] = completed
+            todo_data["completed_at"] = (todo.completed_at or now) if completed else None
+        for field, value in todo_data.items():
+            setattr(todo, field, value)
+        updated[todo.id] = todo
+
+    try:
+        if moved:
+            # On top of the new column, the first of the request uppermost, as bulk_create_todos does
+            with db.no_autoflush:
+                await _lock_board(db, user_id)
+                tops = await _column_tops(db, user_id, {todo.status for todo in moved})
+            for todo in reversed(moved):
+                tops[todo.status] -= 1
+                todo.rank = tops[todo.status]
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logging.error("Failed to bulk update todos for user %s. Error: %s", user_id, e)
+        raise HTTPException(status_code=500, detail="Failed to update todos")
+    logging.info("Bulk updated %s todos for user %s", len(updated), user_id)
+    await _invalidate_todos(user_id)
+    await _publish(user_id, "todo.updated", list(updated.values()))
+    return models.BulkTodoResponse(todos=list(updated.values()), failed_items=failed)
+
+async def bulk_complete_todos(current_user: TokenData, db: AsyncSession, request: models.BulkCompleteRequest) -> models.BulkTodoResponse:
+    """
+    Read the completed column's top, then complete every open todo in one
+    UPDATE ... RETURNING, stacking the cards that change column above it.
+    """
+    user_id = current_user.get_uuid()
+    await write_buffer.flush_user(user_id)
+    ids = list(dict.fromkeys(request.todo_ids))
+    try:
+        await _lock_board(db, user_id)
+        top = (await _column_tops(db, user_id, {Status.completed}))[Status.completed]
+        # Distinct ranks, the first of the request uppermost; a subquery per row would tie them
+        ranks = {todo_id: top - len(ids) + i for i, todo_id in enumerate(ids)}
+        stmt = (
+            update(Todo)
+            .where(Todo.id.in_(ids))
+            .where(Todo.user_id == user_id)
+            .where(Todo.is_completed.is_(False))
+            .values(
+                is_completed=True,
+                status=Status.completed,
+                rank=case((Todo.status == Status.completed, Todo.rank), else_=case(ranks, value=Todo.id)),
+                completed_at=datetime.now(timezone.utc),
+            )
+            .returning(Todo)
+            .execution_options(synchronize_session=False)
+        )
+        todos = list((await db.scalars(stmt)).all())
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logging.error("Failed to bulk complete todos for user %s. Error: %s", user_id, e)
+        raise HTTPException(status_code=500, detail="Failed to complete todos")
 
-def patch_todo(current_user: TokenData, db: Session, todo_id: UUID, todo_update: models.TodoUpdate) -> Todo:
-    todo_data = todo_update.model_dump(exclude_unset=True)
-    db.query(Todo).filter(Todo.id == todo_id).filter(Todo.user_id == current_user.get_uuid()).update(todo_data)
-    db.commit()
-    logging.info(f"Successfully patched todo {todo_id} for user {current_user.get_uuid()}")
-    return get_todo_by_id(current_user, todo_id, db)
+    completed_count = len(todos)
+    await _invalidate_todos(user_id)
+    await _publish(user_id, "todo.completed", todos)
+    completed_ids = {todo.id for todo in todos}
+    remaining = [todo_id for todo_id in ids if todo_id not in completed_ids]
+    failed = []
+    if remaining:
+        # Already-completed todos are returned as-is, like complete_todo does
+        todos.extend(await db.scalars(select(Todo).where(Todo.id.in_(remaining)).where(Todo.user_id == user_id)))
+        found = {todo.id for todo in todos}
+        failed = [{"todo_id": str(todo_id), "error": "Todo not found"} for todo_id in remaining if todo_id not in found]
+    logging.info("Bulk completed %s todos for user %s", completed_count, user_id)
+    return models.BulkTodoResponse(todos=todos, failed_items=failed)
@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+from uuid import UUID
+from src.config import settings
+
+WRITE_BEHIND_MODE = settings.write_behind_mode
+WRITE_BEHIND_INTERVAL_MS = settings.write_behind_interval_ms
+WRITE_BEHIND_MAX_PENDING = settings.write_behind_max_pending
+WRITE_BEHIND_STATE_TTL = settings.write_behind_state_ttl
+MAX_FLUSH_ATTEMPTS = 3  # async mode: writes failing this many flushes in a row are dropped
+
+
+@dataclass
+class BufferedTodo:
+    user_id: UUID
+    state: dict  # Last known row (TodoResponse fields) with the buffered writes applied
+    loaded_at: float
+    increments: int = 0
+    changes: dict = field(default_factory=dict)
+    failed_flushes: int = 0
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self.increments or self.changes)
+
+
+@dataclass(frozen=True)
+class PendingWrite:
+    todo_id: UUID
+    user_id: UUID
+    increments: int
+    changes: dict
+
+
+class WriteBuffer:
+    """
+    Coalesces pomodoro increments and patches per todo in memory and hands
+    them to `flush_batch` together, every WRITE_BEHIND_INTERVAL_MS or once
+    WRITE_BEHIND_MAX_PENDING todos are waiting. Modes:
+
+    - off: no buffering, every request writes through.
+    - group: a request returns once the batch holding its write has
+      committed, so it is as durable as write-through, in fewer transactions.
+    - async: a request returns as soon as its write is buffered; a crash
+      loses at most the last interval of writes.
+
+    Services call flush_user before any other read or write of a user's
+    todos, so a user always reads their own writes. The buffer is per
+    process: with several workers, use group mode or keep a user on one worker.
+    """
+
+    def __init__(
+        self,
+        flush_batch: Callable[[list[PendingWrite]], Awaitable[None]],
+        mode: str = WRITE_BEHIND_MODE,
+        interval_ms: int = WRITE_BEHIND_INTERVAL_MS,
+        max_pending: int = WRITE_BEHIND_MAX_PENDING,
+        state_ttl: float = WRITE_BEHIND_STATE_TTL,
+    ):
+        if mode not in ("off", "group", "async"):
+            raise ValueError(f"Unknown write-behind mode: {mode!r}")
+        self.mode = mode
+        self.interval_ms = interval_ms
+        self.max_pending = max_pending
+        self.state_ttl = state_ttl
+        self._flush_batch = flush_batch
+        self._todos: dict[UUID, dict[UUID, BufferedTodo]] = {}  # user_id -> todo_id -> entry
+        self._dirty: dict[UUID, BufferedTodo] = {}
+        self._waiters: dict[UUID, asyncio.Future] = {}  # group mode: user_id -> their next flush
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    async def update(
+        self,
+        user_id: UUID,
+        todo_id: UUID,
+        load: Callable[[], Awaitable[dict]],
+        increment: int = 0,
+        changes: dict | None = None,
+    ) -> tuple[dict, bool]:
+        """
+        Buffer an increment (skipped for completed todos) and/or field changes.
+        `load` reads the row when it isn't buffered yet and raises if the user
+        doesn't own it. Returns the todo as the user will see it and whether
+        anything was buffered.
+        """
+        todos = self._todos.setdefault(user_id, {})
+        entry = todos.get(todo_id)
+        if entry is None or (not entry.dirty and time.monotonic() - entry.loaded_at > self.state_ttl):
+            state = await load()
+            # Another request may have buffered this todo while the row loaded
+            todos = self._todos.setdefault(user_id, {})
+            entry = todos.get(todo_id)
+            if entry is None or not entry.dirty:
+                entry = todos[todo_id] = BufferedTodo(user_id, state, time.monotonic())
+
+        if increment and not entry.state["is_completed"]:
+            entry.state["pomodoro_count"] += increment
+            entry.increments += increment
+        elif not changes:
+            return dict(entry.state), False
+        if changes:
+            entry.state.update(changes)
+            entry.changes.update(changes)
+        # The flush stamps the row itself, at commit time, so a retried flush isn't older than the sync cursors
+        entry.state["updated_at"] = datetime.now(timezone.utc)
+        self._dirty[todo_id] = entry
+        state = dict(entry.state)
+        if len(self._dirty) >= self.max_pending:
+            self._wake.set()
+
+        if self.mode == "group":
+            waiter = self._waiters.get(user_id)
+            if waiter is None:
+                waiter = self._waiters[user_id] = asyncio.get_running_loop().create_future()
+            # Shielded: a cancelled request must not cancel the flush others wait on
+            await asyncio.shield(waiter)
+        return state, True
+
+    async def flush(self, user_id: UUID | None = None) -> None:
+        """Write out everything buffered, or only `user_id`'s todos, as one batch."""
+        async with self._lock:
+            batch = {
+                todo_id: entry for todo_id, entry in self._dirty.items()
+                if user_id is None or entry.user_id == user_id
+            }
+            users = {entry.user_id for entry in batch.values()} if user_id is None else {user_id}
+            waiters = [self._waiters.pop(uid) for uid in users if uid in self._waiters]
+            writes = []
+            for todo_id, entry in batch.items():
+                writes.append(PendingWrite(todo_id, entry.user_id, entry.increments, entry.changes))
+                entry.increments, entry.changes = 0, {}
+                del self._dirty[todo_id]
+
+            try:
+                if writes:
+                    await self._flush_batch(writes)
+            except Exception as e:
+                logging.error("Write-behind flush of %s todos failed: %s", len(writes), e)
+                self._requeue(batch, writes)
+                for waiter in waiters:
+                    waiter.set_exception(e)
+                raise
+            for waiter in waiters:
+                waiter.set_result(None)
+            for entry in batch.values():
+                entry.failed_flushes = 0
+            self._evict()
+
+    def _requeue(self, batch: dict[UUID, BufferedTodo], writes: list[PendingWrite]) -> None:
+        for write in writes:
+            entry = batch[write.todo_id]
+            entry.failed_flushes += 1
+            if self.mode == "group" or entry.failed_flushes >= MAX_FLUSH_ATTEMPTS:
+                # Group mode callers are told their write failed; re-read the row next time
+                if self.mode == "async":
+                    logging.error("Dropping buffered writes to todo %s after %s failed flushes", write.todo_id, entry.failed_flushes)
+                if not entry.dirty:
+                    self._todos.get(write.user_id, {}).pop(write.todo_id, None)
+                continue
+            # Older writes go under anything buffered while the flush ran
+            entry.increments += write.increments
+            entry.changes = {**write.changes, **entry.changes}
+            self._dirty[write.todo_id] = entry
+
+    def _evict(self) -> None:
+        """Forget clean todos whose row is older than state_ttl."""
+        expired_before = time.monotonic() - self.state_ttl
+        for user_id in list(self._todos):
+            todos = self._todos[user_id]
+            for todo_id in [t for t, entry in todos.items() if not entry.dirty and entry.loaded_at < expired_before]:
+                del todos[todo_id]
+            if not todos:
+                del self._todos[user_id]
+
+    async def flush_user(self, user_id: UUID) -> None:
+        """Flush the user's buffered writes and forget their rows, which the caller is about to read or change."""
+        todos = self._todos.get(user_id)
+        if not todos:
+            return
+        await self.flush(user_id)
+        for todo_id in [t for t, entry in todos.items() if not entry.dirty]:
+            del todos[todo_id]
+
+    async def run(self) -> None:
+        """Flush every interval_ms, or sooner when max_pending todos are waiting, until cancelled."""
+        while True:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), self.interval_ms / 1000)
+            self._wake.clear()
+            with suppress(Exception):  # Logged by flush; the writes stay buffered for the next round
+                await self.flush()
+
+    async def close(self) -> None:
+        """Final flush on shutdown."""
+        with suppress(Exception):
+            await self.flush()
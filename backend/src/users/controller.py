@@ -1,10 +1,11 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Response, status
 from uuid import UUID
 
-from ..database.core import DbSession
+from ..database.core import AsyncDbSession
 from . import models
 from . import service
 from ..auth.service import CurrentUser
+from ..rate_limiter import limiter, CHANGE_PASSWORD_USER_LIMIT
 
 router = APIRouter(
     prefix="/users",
@@ -12,13 +13,15 @@ router = APIRouter(
 )
 
 @router.get("/me", response_model=models.UserResponse)
-def get_current_user(current_user: CurrentUser, db: DbSession):
-    return service.get_user_by_id(db, current_user.get_uuid())
+async def get_current_user(current_user: CurrentUser, db: AsyncDbSession):
+    body = await service.get_user_profile_json(db, current_user.get_uuid())
+    return Response(content=body, media_type="application/json")
 
 @router.put("/change-password", status_code=status.HTTP_200_OK)
-def change_password(
+async def change_password(
     password_change: models.PasswordChange,
-    db: DbSession,
+    db: AsyncDbSession,
     current_user: CurrentUser
 ):
-    service.change_password(db, current_user.get_uuid(), password_change)
+    await limiter.hit("users.change_password", str(current_user.get_uuid()), CHANGE_PASSWORD_USER_LIMIT)
+    await service.change_password(db, current_user.get_uuid(), password_change)
@@ -1,30 +1,43 @@
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from . import models
 from src.entities.user import User
 from src.exceptions import UserNotFoundError, InvalidPasswordError, PasswordMismatchError
 from src.auth.service import verify_password, get_password_hash
+from src.cache import cached, invalidate
 import logging
 
-def get_user_by_id(db:Session, user_id: UUID) -> models.UserResponse:
-    user = db.query(User).filter(User.id == user_id).first()
+async def get_user_by_id(db:AsyncSession, user_id: UUID) -> models.UserResponse:
+    user = await db.get(User, user_id)
     if not user:
-        logging.warning(f"No User found with ID: {user_id}")
+        logging.warning("No User found with ID: %s", user_id)
         raise UserNotFoundError(user_id)
-    logging.info(f"Successfully retrieved User with ID: {user_id}")
+    logging.info("Successfully retrieved User with ID: %s", user_id)
     return user
 
-def change_password(db:Session, user_id: UUID, password_change: models.PasswordChange):
-    user = get_user_by_id(db, user_id)
+def _user_cache_key(user_id: UUID) -> str:
+    return f"user:{user_id}"
 
-    if not verify_password(password_change.current_password, user.password_hash):
-        logging.warning(f"Invalid current password provided by user ID: {user_id}")
-        raise InvalidPasswordError()
-    
+async def get_user_profile_json(db: AsyncSession, user_id: UUID) -> bytes:
+    """The serialized profile for /users/me, read through the cache."""
+    async def load() -> bytes:
+        user = await get_user_by_id(db, user_id)
+        return models.UserResponse.model_validate(user, from_attributes=True).model_dump_json().encode()
+    return await cached(_user_cache_key(user_id), load)
+
+async def change_password(db:AsyncSession, user_id: UUID, password_change: models.PasswordChange):
+    # Cheap check first so a mismatch costs neither a query nor a bcrypt round
     if password_change.new_password != password_change.new_password_confirm:
-        logging.warning(f"Password mismatched during change attempt for user ID: {user_id}")
+        logging.warning("Password mismatched during change attempt for user ID: %s", user_id)
         raise PasswordMismatchError()
+
+    user = await get_user_by_id(db, user_id)
+
+    if not await verify_password(password_change.current_password, user.password_hash):
+        logging.warning("Invalid current password provided by user ID: %s", user_id)
+        raise InvalidPasswordError()
     
-    user.password_hash = get_password_hash(password_change.new_password_confirm)
-    db.commit()
-    logging.info(f"Successfully changed password for user ID: {user_id}")
+    user.password_hash = await get_password_hash(password_change.new_password_confirm)
+    await db.commit()
+    await invalidate(_user_cache_key(user_id))
+    logging.info("Successfully changed password for user ID: %s", user_id)
@@ -0,0 +1,52 @@
+import pytest
+
+from src import cache
+
+
+@pytest.fixture
+def memory_cache(monkeypatch) -> cache.InMemoryCache:
+    backend = cache.InMemoryCache(max_entries=4)
+    monkeypatch.setattr(cache, "_cache", backend)
+    return backend
+
+
+async def test_cached_fills_on_miss_and_serves_hits(memory_cache):
+    loads = []
+
+    async def load() -> bytes:
+        loads.append(1)
+        return b"board"
+
+    assert await cache.cached("todos:1", load) == b"board"
+    assert await cache.cached("todos:1", load) == b"board"
+    assert len(loads) == 1
+
+
+async def test_load_overlapping_an_invalidation_is_not_cached(memory_cache):
+    async def load_then_commit_elsewhere() -> bytes:
+        # Another request commits and invalidates while this load holds the old rows
+        await cache.invalidate("todos:1")
+        return b"stale"
+
+    assert await cache.cached("todos:1", load_then_commit_elsewhere) == b"stale"
+    assert await memory_cache.get("todos:1") is None
+
+
+async def test_set_with_a_generation_from_before_a_delete_is_dropped(memory_cache):
+    generation = await memory_cache.generation("users:1")
+    await memory_cache.delete("users:1")
+    await memory_cache.set("users:1", b"old", generation=generation)
+    assert await memory_cache.get("users:1") is None
+
+    await memory_cache.set("users:1", b"new", generation=await memory_cache.generation("users:1"))
+    assert await memory_cache.get("users:1") == b"new"
+
+
+async def test_forgotten_generation_never_matches_an_in_flight_load(memory_cache):
+    await memory_cache.delete("users:0")
+    generation = await memory_cache.generation("users:0")
+    # Enough other invalidations to push users:0 out of the capped generation map, then one more of it
+    await memory_cache.delete(*(f"users:{i}" for i in range(1, 6)))
+    await memory_cache.delete("users:0")
+    await memory_cache.set("users:0", b"stale", generation=generation)
+    assert await memory_cache.get("users:0") is None
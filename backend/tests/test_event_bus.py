@@ -0,0 +1,58 @@
+import asyncio
+import json
+import uuid
+
+from src.realtime.bus import RESYNC_EVENT, RedisEventBus
+
+
+class ScriptedPubSub:
+    """Yields its messages, then fails like a dropped connection or, for the last one, stays open."""
+
+    def __init__(self, messages: list[dict], drop: bool):
+        self.messages = messages
+        self.drop = drop
+
+    async def psubscribe(self, pattern: str) -> None:
+        pass
+
+    async def listen(self):
+        for message in self.messages:
+            yield message
+        if self.drop:
+            raise ConnectionError("Connection closed by server.")
+        await asyncio.Event().wait()
+
+    async def aclose(self) -> None:
+        pass
+
+
+class ScriptedClient:
+    def __init__(self, *pubsubs: ScriptedPubSub):
+        self.pubsubs = list(pubsubs)
+
+    def pubsub(self) -> ScriptedPubSub:
+        return self.pubsubs.pop(0)
+
+    async def aclose(self) -> None:
+        pass
+
+
+def pmessage(channel: str, event: dict) -> dict:
+    return {"type": "pmessage", "channel": channel.encode(), "data": json.dumps(event)}
+
+
+async def test_listener_skips_malformed_channels_and_resyncs_after_reconnect(monkeypatch):
+    monkeypatch.setattr(RedisEventBus, "RECONNECT_DELAY", 0)
+    user_id = uuid.uuid4()
+    channel = f"{RedisEventBus.CHANNEL_PREFIX}{user_id}"
+    bus = RedisEventBus(ScriptedClient(
+        ScriptedPubSub([
+            pmessage(f"{RedisEventBus.CHANNEL_PREFIX}not-a-uuid", {"type": "todo.created"}),
+            pmessage(channel, {"type": "todo.created"}),
+        ], drop=True),
+        ScriptedPubSub([pmessage(channel, {"type": "todo.updated"})], drop=False),
+    ))
+    async with bus.subscribe(user_id) as queue:
+        received = [await asyncio.wait_for(queue.get(), 1) for _ in range(3)]
+    await bus.close()
+    assert received == [{"type": "todo.created"}, RESYNC_EVENT, {"type": "todo.updated"}]
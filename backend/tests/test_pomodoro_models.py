@@ -0,0 +1,22 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pydantic import ValidationError
+
+from src.pomodoro.models import PomodoroSessionCreate
+
+
+def test_naive_and_aware_times_compare_as_utc():
+    started_at = datetime(2026, 1, 1, 9, 0)
+    ended_at = datetime(2026, 1, 1, 10, 25, tzinfo=timezone(timedelta(hours=1)))
+    session = PomodoroSessionCreate(todo_id=uuid.uuid4(), started_at=started_at, ended_at=ended_at)
+    assert session.started_at == datetime(2026, 1, 1, 9, 0, tzinfo=timezone.utc)
+    assert session.ended_at == datetime(2026, 1, 1, 9, 25, tzinfo=timezone.utc)
+
+
+def test_end_before_start_across_offsets_is_rejected():
+    # 09:30+02:00 is 07:30 UTC, before the naive (UTC) start
+    with pytest.raises(ValidationError, match="ended_at must be after started_at"):
+        PomodoroSessionCreate(todo_id=uuid.uuid4(), started_at="2026-01-01T08:00:00",
+                              ended_at="2026-01-01T09:30:00+02:00")
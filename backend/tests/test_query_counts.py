@@ -0,0 +1,130 @@
+"""
+SQL statements per endpoint, held to a budget. Requests run in-process
+against the cold path: the read-through cache keeps nothing and the rate
+limiter is off. A change that adds a round trip to an endpoint fails here;
+if the extra statement is intended, raise the budget in the same change.
+"""
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+from sqlalchemy import event, insert
+
+from src import cache, rate_limiter
+from src.auth.service import bcrypt_context
+from src.database.core import get_async_engine
+from src.entities.todo import Status, Todo
+from src.entities.user import User
+from src.main import app
+
+PASSWORD = "query-count-password"
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+@pytest.fixture
+def statements(async_engine_per_test, monkeypatch):
+    monkeypatch.setattr(cache, "_cache", cache.InMemoryCache(max_entries=0))
+    monkeypatch.setattr(rate_limiter.limiter, "enabled", False)
+    counter = StatementCounter()
+    engine = get_async_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(engine, "before_cursor_execute", counter)
+
+
+@pytest.fixture
+def user(database) -> str:
+    """A fresh user with a 20-card board; returns the email."""
+    user_id = uuid.uuid4()
+    email = f"counts-{user_id}@example.com"
+    now = datetime.now(timezone.utc)
+    with database.begin() as conn:
+        conn.execute(insert(User), [{"id": user_id, "email": email, "first_name": "Query", "last_name": "Counts",
+                                     "password_hash": bcrypt_context.hash(PASSWORD)}])
+        conn.execute(insert(Todo), [
+            {"id": uuid.uuid4(), "user_id": user_id, "description": f"card {i}", "is_completed": False,
+             "is_important": True, "is_urgent": False, "status": list(Status)[i % 3], "pomodoro_count": 0,
+             "rank": i, "created_at": now, "updated_at": now}
+            for i in range(20)
+        ])
+    return email
+
+
+@pytest.fixture
+async def client(statements, user):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://counts") as client:
+        client.tokens = (await client.post("/auth/token", data={"username": user, "password": PASSWORD})).json()
+        client.headers["Authorization"] = f"Bearer {client.tokens['access_token']}"
+        yield client
+
+
+async def within_budget(statements: StatementCounter, budget: int, request, expected_status: int) -> httpx.Response:
+    statements.count = 0
+    response = await request
+    assert response.status_code == expected_status, response.text
+    assert statements.count <= budget, f"{statements.count} statements, budget {budget}"
+    return response
+
+
+async def create_todo(client: httpx.AsyncClient) -> str:
+    return (await client.post("/todos/", json={"description": "query count", "due_date": None})).json()["id"]
+
+
+async def test_login(statements, user):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://counts") as client:
+        await within_budget(statements, 2, client.post("/auth/token", data={"username": user, "password": PASSWORD}), 200)
+
+
+async def test_refresh(client, statements):
+    await within_budget(statements, 1, client.post("/auth/refresh", json={"refresh_token": client.tokens["refresh_token"]}), 200)
+
+
+async def test_users_me(client, statements):
+    await within_budget(statements, 1, client.get("/users/me"), 200)
+
+
+async def test_change_password_mismatch_never_reaches_the_database(client, statements):
+    await within_budget(statements, 0, client.put("/users/change-password", json={
+        "current_password": PASSWORD, "new_password": "a", "new_password_confirm": "b",
+    }), 400)
+
+
+@pytest.mark.parametrize("url, budget", [("/todos/", 2), ("/todos/page", 1)])
+async def test_todo_lists(client, statements, url, budget):
+    await within_budget(statements, budget, client.get(url), 200)
+
+
+async def test_create_todo(client, statements):
+    await within_budget(statements, 2, client.post("/todos/", json={"description": "query count", "due_date": None}), 201)
+
+
+@pytest.mark.parametrize("method, path, body, budget, expected_status", [
+    ("GET", "", None, 1, 200),
+    ("PUT", "", {"description": "query count, edited", "due_date": None}, 1, 200),
+    ("PATCH", "", {"is_urgent": True}, 1, 200),
+    ("PATCH", "", {"status": "in_progress"}, 2, 200),
+    ("PUT", "/move", {"status": "in_progress"}, 2, 200),
+    ("PUT", "/increment-pomodoro", None, 1, 200),
+    ("PUT", "/complete", None, 2, 200),
+    ("DELETE", "", None, 1, 204),
+])
+async def test_single_todo_endpoints(client, statements, method, path, body, budget, expected_status):
+    todo_id = await create_todo(client)
+    await within_budget(statements, budget, client.request(method, f"/todos/{todo_id}{path}", json=body), expected_status)
+
+
+async def test_bulk_endpoints(client, statements):
+    bulk = await within_budget(statements, 3, client.post("/todos/bulk", json={"todos": [
+        {"description": "query count 1", "due_date": None}, {"description": "query count 2", "due_date": None},
+    ]}), 201)
+    ids = [todo["id"] for todo in bulk.json()["todos"]]
+    await within_budget(statements, 3, client.put("/todos/bulk/complete", json={"todo_ids": ids}), 200)
+    await within_budget(statements, 1, client.request("DELETE", "/todos/delete-batch", json={"todo_ids": ids}), 204)
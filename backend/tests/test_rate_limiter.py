@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src import rate_limiter
+from src.auth import controller as auth_controller, service as auth_service
+from src.database.core import get_async_db
+from src.exceptions import RateLimitExceededError
+from src.rate_limiter import InMemoryCounterStore, RateLimit, RateLimiter
+
+LIMIT = RateLimit(requests=10, window=60)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Pins time.time() for the limiter; set `clock.now` to move it."""
+    clock = SimpleNamespace(now=6000.0)  # The start of a 60s window
+    monkeypatch.setattr(rate_limiter.time, "time", lambda: clock.now)
+    return clock
+
+
+async def allowed(limiter: RateLimiter, attempts: int, key: str = "client") -> int:
+    count = 0
+    for _ in range(attempts):
+        try:
+            await limiter.hit("test", key, LIMIT)
+        except RateLimitExceededError:
+            continue
+        count += 1
+    return count
+
+
+def test_parse_named_and_numeric_windows():
+    assert RateLimit.parse("10/minute") == RateLimit(10, 60)
+    assert RateLimit.parse("100/hour") == RateLimit(100, 3600)
+    assert RateLimit.parse("5/30") == RateLimit(5, 30)
+
+
+async def test_limit_applies_within_a_window(clock):
+    limiter = RateLimiter(InMemoryCounterStore())
+    assert await allowed(limiter, 15) == 10
+    # Keys are limited independently
+    assert await allowed(limiter, 1, key="other") == 1
+
+
+async def test_previous_window_is_weighted_by_its_remaining_overlap(clock):
+    limiter = RateLimiter(InMemoryCounterStore())
+    assert await allowed(limiter, 10) == 10
+    # 15s into the next window, 45/60 of the previous 10 still count: 7.5 + 2 fits, a third doesn't
+    clock.now += 75
+    assert await allowed(limiter, 5) == 2
+    # Halfway through the window after that, the first no longer counts and the second's
+    # 5 attempts (rejected ones included) weigh half: 2.5 + 7 fits
+    clock.now += 75
+    assert await allowed(limiter, 10) == 7
+
+
+async def test_retry_after_is_the_rest_of_the_window(clock):
+    limiter = RateLimiter(InMemoryCounterStore())
+    clock.now += 20.5
+    await allowed(limiter, 10)
+    with pytest.raises(RateLimitExceededError) as exceeded:
+        await limiter.hit("test", "client", LIMIT)
+    assert exceeded.value.status_code == 429
+    assert exceeded.value.headers["Retry-After"] == "40"
+
+
+async def test_disabled_limiter_never_counts(clock):
+    limiter = RateLimiter(InMemoryCounterStore(), enabled=False)
+    assert await allowed(limiter, 50) == 50
+
+
+async def test_login_email_limit_rejects_before_verifying_the_password(clock, monkeypatch):
+    monkeypatch.setattr(rate_limiter.limiter, "store", InMemoryCounterStore())
+    monkeypatch.setattr(rate_limiter.limiter, "enabled", True)
+    verified = []
+
+    async def verify_and_update_password(password: str, hashed_password: str):
+        verified.append(password)
+        return False, None
+
+    monkeypatch.setattr(auth_service, "verify_and_update_password", verify_and_update_password)
+    user = SimpleNamespace(id=uuid4(), email="victim@example.com", password_hash="hash")
+
+    class Session:
+        async def scalar(self, statement):
+            return user
+
+    app = FastAPI()
+    app.include_router(auth_controller.router)
+    app.dependency_overrides[get_async_db] = lambda: Session()
+    limit = rate_limiter.LOGIN_EMAIL_LIMIT
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        statuses = []
+        for i in range(limit.requests + 2):
+            # Different case and padding still count against the same email
+            username = " Victim@Example.com" if i % 2 else "victim@example.com"
+            response = await client.post("/auth/token", data={"username": username, "password": f"guess{i}"})
+            statuses.append(response.status_code)
+
+    assert statuses == [401] * limit.requests + [429, 429]
+    assert response.headers["Retry-After"] == str(limit.window)
+    assert len(verified) == limit.requests
@@ -0,0 +1,68 @@
+"""Todo endpoint behaviour against Postgres, with the cache and rate limiter out of the way."""
+import uuid
+from datetime import timedelta
+
+import httpx
+import pytest
+from sqlalchemy import insert
+
+from src import cache, rate_limiter
+from src.auth.service import create_access_token
+from src.entities.user import User
+from src.main import app
+
+
+@pytest.fixture
+async def client(async_engine_per_test, database, monkeypatch):
+    monkeypatch.setattr(cache, "_cache", cache.InMemoryCache(max_entries=0))
+    monkeypatch.setattr(rate_limiter.limiter, "enabled", False)
+    user_id = uuid.uuid4()
+    email = f"todos-{user_id}@example.com"
+    with database.begin() as conn:
+        conn.execute(insert(User), [{"id": user_id, "email": email, "first_name": "Todo", "last_name": "Tests",
+                                     "password_hash": "x"}])
+    token = create_access_token(email, user_id, timedelta(minutes=5))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://todos",
+                                 headers={"Authorization": f"Bearer {token}"}) as client:
+        yield client
+
+
+async def create_todo(client: httpx.AsyncClient, **fields) -> dict:
+    response = await client.post("/todos/", json={"description": "card", "due_date": None, **fields})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+async def test_patching_status_completes_and_reopens(client):
+    todo = await create_todo(client)
+    completed = (await client.patch(f"/todos/{todo['id']}", json={"status": "completed"})).json()
+    assert completed["is_completed"] and completed["completed_at"] is not None
+
+    reopened = (await client.patch(f"/todos/{todo['id']}", json={"status": "in_progress"})).json()
+    assert not reopened["is_completed"] and reopened["completed_at"] is None
+
+
+async def test_put_with_completed_status_completes(client):
+    todo = await create_todo(client)
+    response = await client.put(f"/todos/{todo['id']}", json={"description": "done", "due_date": None, "status": "completed"})
+    assert response.json()["is_completed"] is True
+
+
+async def test_patching_an_unknown_status_is_a_400(client):
+    todo = await create_todo(client)
+    response = await client.patch(f"/todos/{todo['id']}", json={"status": "bogus"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid status: bogus"
+
+
+async def test_timestamps_are_utc_aware_on_every_endpoint(client):
+    created = await create_todo(client)
+    responses = [
+        created,
+        (await client.patch(f"/todos/{created['id']}", json={"status": "in_progress"})).json(),
+        (await client.put(f"/todos/{created['id']}/complete")).json(),
+        (await client.get(f"/todos/{created['id']}")).json(),
+    ]
+    for todo in responses:
+        assert todo["updated_at"].endswith("Z"), todo
+    assert responses[2]["completed_at"].endswith("Z")